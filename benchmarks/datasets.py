@@ -0,0 +1,131 @@
+"""Bases de datos sintéticas para los benchmarks
+
+Cada conjunto se genera con el esquema actual (DatabaseManager.init_db) y
+siempre con los mismos datos para un tamaño dado, así los resultados de
+distintas versiones son comparables. Los horarios no tienen conflictos:
+cada profesor dicta hasta CLASES_POR_PROFESOR clases en bloques de una
+hora, los profesores pares usan los bloques pares de la semana y los
+impares los impares, y cada aula y cada sección se reparten entre un
+profesor par y uno impar.
+"""
+import csv
+import os
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+from database import queries
+from database.db_manager import DatabaseManager
+from utils.time_utils import minutos_a_hora
+
+TAMANOS = [100, 10_000, 100_000]
+
+CLASES_POR_PROFESOR = 30
+BLOQUES_POR_DIA = 12     # De 7:00 AM a 7:00 PM
+DIAS = 5
+ASIGNATURAS = 60
+
+def _bloque(profesor, clase):
+    """Retorna (id_dia, hora_inicio, hora_fin) de la clase del profesor"""
+    bloque = 2 * clase + profesor % 2
+    inicio = 7 * 60 + (bloque % BLOQUES_POR_DIA) * 60
+    return bloque // BLOQUES_POR_DIA + 1, inicio, inicio + 60
+
+def filas_horarios(tamano):
+    """Retorna los horarios del conjunto como (profesor, asignatura, sección, aula, día, inicio, fin)
+
+    Los recursos son índices desde 0; el id en la base de datos es el índice + 1.
+    """
+    filas = []
+    for n in range(tamano):
+        profesor, clase = divmod(n, CLASES_POR_PROFESOR)
+        id_dia, inicio, fin = _bloque(profesor, clase)
+        asignatura = (profesor * 7 + clase // 2) % ASIGNATURAS
+        filas.append((profesor, asignatura, (profesor + 1) // 2, profesor // 2, id_dia, inicio, fin))
+    return filas
+
+def cantidades(tamano):
+    """Retorna cuántos profesores, secciones y aulas tiene el conjunto"""
+    profesores = max(1, -(-tamano // CLASES_POR_PROFESOR))
+    return profesores, profesores // 2 + 1, profesores // 2 + 1
+
+def _insertar(db, sql, columnas):
+    query = QSqlQuery(db)
+    query.prepare(sql)
+    for columna in columnas:
+        query.addBindValue(columna)
+    if not query.execBatch():
+        raise RuntimeError(query.lastError().text())
+
+def _catalogos(db, tamano):
+    profesores, grupos, aulas = cantidades(tamano)
+    _insertar(db, queries.INSERTAR_PROFESOR,
+              [[f"Nombre{i}" for i in range(profesores)], [f"Apellido{i:05d}" for i in range(profesores)]])
+    _insertar(db, queries.INSERTAR_ASIGNATURA,
+              [[f"Asignatura {i:03d}" for i in range(ASIGNATURAS)], [""] * ASIGNATURAS])
+    _insertar(db, queries.INSERTAR_GRUPO,
+              [[f"Sección {i:05d}" for i in range(grupos)], [""] * grupos, [30] * grupos])
+    _insertar(db, queries.INSERTAR_AULA,
+              [[f"Aula {i:05d}" for i in range(aulas)], [40] * aulas])
+
+def _crear(ruta, tamano, con_horarios):
+    for archivo in (ruta, ruta + "-wal", ruta + "-shm"):
+        if os.path.exists(archivo):
+            os.remove(archivo)
+
+    db_manager = DatabaseManager(ruta)
+    if not db_manager.init_db():
+        raise RuntimeError(f"No se pudo crear {ruta}")
+    _llenar(db_manager.get_connection(), tamano, con_horarios)
+    cerrar(db_manager)
+
+def _llenar(db, tamano, con_horarios):
+    db.transaction()
+    try:
+        _catalogos(db, tamano)
+        if con_horarios:
+            filas = filas_horarios(tamano)
+            columnas = [list(columna) for columna in zip(*filas)]
+            for i in range(4):   # De índice a id
+                columnas[i] = [indice + 1 for indice in columnas[i]]
+            _insertar(db, queries.INSERTAR_HORARIO, columnas)
+    except RuntimeError:
+        db.rollback()
+        raise
+    db.commit()
+
+def _escribir_csv(ruta, tamano):
+    """Escribe los horarios en el formato de importación, referenciados por nombre"""
+    dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["profesor", "asignatura", "seccion", "aula", "dia", "hora_inicio", "hora_fin"])
+        for profesor, asignatura, grupo, aula, id_dia, inicio, fin in filas_horarios(tamano):
+            escritor.writerow([f"Nombre{profesor} Apellido{profesor:05d}", f"Asignatura {asignatura:03d}",
+                               f"Sección {grupo:05d}", f"Aula {aula:05d}", dias[id_dia - 1],
+                               minutos_a_hora(inicio), minutos_a_hora(fin)])
+
+def cerrar(db_manager):
+    """Cierra la conexión principal para poder abrir otro conjunto con el mismo nombre de conexión"""
+    nombre = db_manager.get_connection().connectionName()
+    db_manager.close()
+    db_manager.db = db_manager.pool = None
+    QSqlDatabase.removeDatabase(nombre)
+
+def preparar(directorio, tamano, regenerar=False):
+    """Genera (si no existen) los archivos del conjunto y retorna sus rutas
+
+    - completo: base de datos con catálogos y horarios
+    - catalogos: la misma base de datos sin horarios, destino de la importación
+    - csv: los mismos horarios en el formato que acepta el importador
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {
+        "completo": os.path.join(directorio, f"horarios_{tamano}.db"),
+        "catalogos": os.path.join(directorio, f"catalogos_{tamano}.db"),
+        "csv": os.path.join(directorio, f"horarios_{tamano}.csv"),
+    }
+    if regenerar or not os.path.exists(rutas["completo"]):
+        _crear(rutas["completo"], tamano, con_horarios=True)
+    if regenerar or not os.path.exists(rutas["catalogos"]):
+        _crear(rutas["catalogos"], tamano, con_horarios=False)
+    if regenerar or not os.path.exists(rutas["csv"]):
+        _escribir_csv(rutas["csv"], tamano)
+    return rutas
@@ -0,0 +1,327 @@
+"""Mide los caminos críticos de la aplicación sobre bases de datos sintéticas
+
+Genera (una sola vez, en benchmarks/datos) bases de datos de 100, 10.000 y
+100.000 horarios y mide la búsqueda de solapamientos, la verificación de
+conflictos por lotes, la auditoría, la importación, la carga y el orden
+del modelo de horarios y los reportes PDF. El resultado se escribe en
+JSON para compararlo entre versiones:
+
+    python -m benchmarks.run --salida base.json
+    python -m benchmarks.run --tamanos 100 10000 --salida nueva.json --comparar base.json
+    python -m benchmarks.run --omitir reporte_completo reporte_grupo
+
+Con --comparar se muestran los casos cuya mediana empeoró más que la
+tolerancia y el programa termina con código 1 si hay alguno.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from PyQt5.QtCore import QCoreApplication, Qt, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+from benchmarks import datasets
+from database.connection_pool import configurar_conexion
+from database.db_manager import DatabaseManager
+from database.importer import importar_archivo
+from models.change_bus import ChangeBus
+from models.conflict_engine import ConflictEngine, Propuesta, auditar
+from models.conflict_index import ConflictIndex
+from models.horario_model import HorarioModel
+from models.model_manager import CatalogoModel
+from models.reference_cache import ReferenceCache
+
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos")
+
+CONSULTAS_SOLAPAMIENTO = 1000
+CONEXION_IMPORTAR = "benchmark_importar"
+
+def _sin_avance(actual, total):
+    pass
+
+def medir(funcion, preparar=None, repeticiones=5, presupuesto=10.0):
+    """Ejecuta funcion varias veces y retorna las estadísticas en segundos
+
+    preparar, si se indica, se ejecuta antes de cada repetición sin medirse.
+    Las repeticiones se detienen al agotar el presupuesto de segundos, pero
+    siempre se hace al menos una.
+    """
+    tiempos = []
+    inicio_total = time.perf_counter()
+    while len(tiempos) < repeticiones:
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        if time.perf_counter() - inicio_total > presupuesto:
+            break
+    return {
+        "min": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "media": statistics.fmean(tiempos),
+        "max": max(tiempos),
+        "repeticiones": len(tiempos),
+    }
+
+# Casos de prueba. Cada uno recibe el contexto del conjunto y retorna sus estadísticas
+
+def caso_indice_conflictos(ctx):
+    """Carga del índice de conflictos desde la tabla Horarios"""
+    return medir(lambda: ConflictIndex().cargar(ctx["db"]), **ctx["opciones"])
+
+def _consultas(tamano):
+    """CONSULTAS_SOLAPAMIENTO horarios al azar (siempre los mismos) como (día, inicio, fin, profesor, aula, sección)"""
+    profesores, grupos, aulas = datasets.cantidades(tamano)
+    azar = random.Random(tamano)
+    consultas = []
+    for _ in range(CONSULTAS_SOLAPAMIENTO):
+        inicio = azar.randrange(7 * 60, 19 * 60, 15)
+        consultas.append((azar.randint(1, datasets.DIAS), inicio, inicio + azar.choice((45, 60, 90)),
+                          azar.randint(1, profesores), azar.randint(1, aulas), azar.randint(1, grupos)))
+    return consultas
+
+def caso_solapamiento(ctx):
+    """CONSULTAS_SOLAPAMIENTO llamadas a hay_conflicto, como la edición de horas en la tabla"""
+    indice = ConflictIndex()
+    indice.cargar(ctx["db"])
+    consultas = _consultas(ctx["tamano"])
+
+    def consultar():
+        for id_dia, inicio, fin, id_profesor, id_aula, id_grupo in consultas:
+            indice.hay_conflicto(id_dia, inicio, fin, id_profesor, id_aula, id_grupo)
+
+    return medir(consultar, **ctx["opciones"])
+
+def caso_verificar_lote(ctx):
+    """Verificación de CONSULTAS_SOLAPAMIENTO horarios propuestos en un solo lote, con capacidad de las aulas"""
+    motor = ConflictEngine(ConflictIndex())
+    motor.indice.cargar(ctx["db"])
+    motor.cargar_capacidades(ctx["db"])
+    propuestas = [Propuesta(n, id_profesor, id_aula, id_grupo, id_dia, inicio, fin)
+                  for n, (id_dia, inicio, fin, id_profesor, id_aula, id_grupo) in enumerate(_consultas(ctx["tamano"]))]
+    return medir(lambda: motor.verificar(propuestas), **ctx["opciones"])
+
+def caso_auditoria(ctx):
+    """Auditoría de conflictos de toda la tabla Horarios"""
+    return medir(lambda: auditar(ctx["db"]), **ctx["opciones"])
+
+def caso_importar_horarios(ctx):
+    """Importación del CSV de horarios (validación e inserción por lotes) en la base sin horarios"""
+    ruta = os.path.join(ctx["temporal"], "importar.db")
+
+    def preparar():
+        # Cada repetición importa sobre una copia limpia de la base de datos
+        shutil.copyfile(ctx["rutas"]["catalogos"], ruta)
+        db = QSqlDatabase.addDatabase("QSQLITE", CONEXION_IMPORTAR)
+        db.setDatabaseName(ruta)
+        if not db.open():
+            raise RuntimeError(f"No se pudo abrir {ruta}")
+        QSqlQuery(db).exec_("PRAGMA journal_mode = WAL")
+        configurar_conexion(db)
+
+    def importar():
+        db = QSqlDatabase.database(CONEXION_IMPORTAR, False)
+        try:
+            insertadas, errores = importar_archivo(db, "horarios", ctx["rutas"]["csv"])
+        finally:
+            db.close()
+            del db
+            QSqlDatabase.removeDatabase(CONEXION_IMPORTAR)
+        if errores or insertadas != ctx["tamano"]:
+            raise RuntimeError(f"Importación incompleta: {insertadas} filas, {len(errores)} errores")
+
+    return medir(importar, preparar, **ctx["opciones"])
+
+def _modelo_horarios(ctx):
+    bus = ChangeBus()
+    return HorarioModel(ctx["db"], ConflictIndex(), bus, ReferenceCache(ctx["db"], bus))
+
+def caso_modelo_horarios(ctx):
+    """Creación y primera consulta del modelo de la tabla de horarios, con la primera página"""
+    def cargar():
+        modelo = _modelo_horarios(ctx)
+        modelo.cargar()
+        if modelo.rowCount():
+            modelo.data(modelo.index(0, 1))
+
+    return medir(cargar, **ctx["opciones"])
+
+def caso_ordenar_horarios(ctx):
+    """Orden de la tabla de horarios por profesor, con la última página"""
+    modelo = _modelo_horarios(ctx)
+
+    def ordenar():
+        modelo.sort(1, Qt.AscendingOrder)
+        if modelo.rowCount():
+            modelo.data(modelo.index(modelo.rowCount() - 1, 1))
+
+    return medir(ordenar, **ctx["opciones"])
+
+def caso_modelo_profesores(ctx):
+    """select() del modelo del catálogo de profesores"""
+    modelo = CatalogoModel(ctx["db"], ChangeBus())
+    modelo.setTable("Profesores")
+
+    def consultar():
+        modelo.select()
+        while modelo.canFetchMore():
+            modelo.fetchMore()
+
+    return medir(consultar, **ctx["opciones"])
+
+def caso_reporte_completo(ctx):
+    """Reporte PDF completo de horarios"""
+    from reports.full_report import generar_reporte_completo
+
+    ruta = os.path.join(ctx["temporal"], "completo.pdf")
+    return medir(lambda: generar_reporte_completo(ctx["db"], ruta, _sin_avance), **ctx["opciones"])
+
+def caso_reporte_grupo(ctx):
+    """Calendario PDF de la sección con más clases"""
+    from reports.calendar_report import generar_reporte_calendario
+
+    query = QSqlQuery(ctx["db"])
+    query.exec_("SELECT id_grupo FROM Horarios GROUP BY id_grupo ORDER BY COUNT(*) DESC, id_grupo LIMIT 1")
+    if not query.next():
+        return None
+    id_grupo = query.value(0)
+    ruta = os.path.join(ctx["temporal"], "grupo.pdf")
+    return medir(lambda: generar_reporte_calendario(ctx["db"], "grupo", id_grupo, f"Sección {id_grupo}",
+                                                    ruta, _sin_avance), **ctx["opciones"])
+
+CASOS = {
+    "indice_conflictos": caso_indice_conflictos,
+    "solapamiento": caso_solapamiento,
+    "verificar_lote": caso_verificar_lote,
+    "auditoria": caso_auditoria,
+    "importar_horarios": caso_importar_horarios,
+    "modelo_horarios": caso_modelo_horarios,
+    "ordenar_horarios": caso_ordenar_horarios,
+    "modelo_profesores": caso_modelo_profesores,
+    "reporte_completo": caso_reporte_completo,
+    "reporte_grupo": caso_reporte_grupo,
+}
+
+def _version_reportlab():
+    try:
+        import reportlab
+        return reportlab.Version
+    except ImportError:
+        return None
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(DIRECTORIO_DATOS), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _version_sqlite(db):
+    query = QSqlQuery(db)
+    if query.exec_("SELECT sqlite_version()") and query.next():
+        return query.value(0)
+    return None
+
+def ejecutar(tamanos, casos, repeticiones, presupuesto, regenerar=False):
+    """Ejecuta los casos sobre cada tamaño y retorna el resultado como diccionario"""
+    resultado = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit(),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "reportlab": _version_reportlab(),
+            "sqlite": None,
+        },
+        "resultados": {},
+    }
+    for tamano in tamanos:
+        print(f"Preparando {tamano} horarios...", file=sys.stderr)
+        rutas = datasets.preparar(DIRECTORIO_DATOS, tamano, regenerar)
+        with tempfile.TemporaryDirectory() as temporal:
+            db_manager = DatabaseManager(rutas["completo"])
+            if not db_manager.init_db():
+                raise RuntimeError(f"No se pudo abrir {rutas['completo']}")
+            ctx = {
+                "tamano": tamano,
+                "rutas": rutas,
+                "temporal": temporal,
+                "db_manager": db_manager,
+                "db": db_manager.get_connection(),
+                "opciones": {"repeticiones": repeticiones, "presupuesto": presupuesto},
+            }
+            resultado["entorno"]["sqlite"] = _version_sqlite(ctx["db"])
+            medidos = {}
+            for nombre in casos:
+                print(f"  {nombre}", file=sys.stderr)
+                estadisticas = CASOS[nombre](ctx)
+                if estadisticas is not None:
+                    medidos[nombre] = estadisticas
+            ctx["db"] = None
+            datasets.cerrar(db_manager)
+        resultado["resultados"][str(tamano)] = medidos
+    return resultado
+
+def comparar(base, nuevo, tolerancia):
+    """Retorna (caso, tamaño, mediana base, mediana nueva) de los casos más lentos que en base"""
+    regresiones = []
+    for tamano, medidos in nuevo["resultados"].items():
+        for caso, estadisticas in medidos.items():
+            anterior = base["resultados"].get(tamano, {}).get(caso)
+            if anterior and estadisticas["mediana"] > anterior["mediana"] * (1 + tolerancia):
+                regresiones.append((caso, tamano, anterior["mediana"], estadisticas["mediana"]))
+    return regresiones
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Benchmarks de los caminos críticos del gestor de horarios")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=datasets.TAMANOS,
+                        help="cantidades de horarios de cada conjunto")
+    parser.add_argument("--omitir", nargs="+", default=[], choices=sorted(CASOS), metavar="CASO",
+                        help=f"casos que no se ejecutan: {', '.join(CASOS)}")
+    parser.add_argument("--repeticiones", type=int, default=5, help="repeticiones máximas por caso")
+    parser.add_argument("--presupuesto", type=float, default=10.0,
+                        help="segundos tras los que se dejan de repetir un caso")
+    parser.add_argument("--regenerar", action="store_true", help="vuelve a generar los conjuntos de datos")
+    parser.add_argument("--salida", help="archivo JSON de resultados (por defecto se muestra en pantalla)")
+    parser.add_argument("--comparar", metavar="BASE", help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento relativo de la mediana que se considera regresión")
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    casos = [nombre for nombre in CASOS if nombre not in args.omitir]
+    resultado = ejecutar(args.tamanos, casos, args.repeticiones, args.presupuesto, args.regenerar)
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, resultado, args.tolerancia)
+        for caso, tamano, antes, despues in regresiones:
+            print(f"Regresión en {caso} ({tamano}): {antes * 1000:.1f} ms -> {despues * 1000:.1f} ms",
+                  file=sys.stderr)
+        if regresiones:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Línea de comandos del gestor de horarios, sin interfaz gráfica
+
+Usa la misma base de datos que la aplicación y sólo crea un
+QCoreApplication, por lo que funciona en servidores sin pantalla:
+
+    python cli.py importar profesores profesores.csv
+    python cli.py importar horarios horarios.xlsx --parcial
+    python cli.py conflictos --csv conflictos.csv
+    python cli.py generar --tiempo 30 --procesos 4
+    python cli.py reporte completo Reporte_Horarios.pdf
+    python cli.py reporte profesor --todos reportes/ --combinado
+    python cli.py version guardar "Período 2026-2" --periodo
+    python cli.py version comparar "Período 2026-2" actual
+
+El código de salida es 0 si todo salió bien, 1 si hubo filas rechazadas,
+conflictos, horas sin asignar o diferencias entre versiones y 2 ante errores, por lo que la auditoría de
+conflictos puede programarse (p. ej. cada noche con cron) y avisar sólo
+cuando falla.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+from PyQt5.QtCore import QCoreApplication
+from database.db_manager import DatabaseManager
+from database.importer import COLUMNAS, importar_archivo
+from models.conflict_engine import auditar, exportar_auditoria, filas_auditoria
+from models.reference_cache import Catalogo
+from models.versions import (PERIODO, BORRADOR, CATALOGOS_FILA, ErrorVersion, ScheduleVersions,
+                             describir_fila)
+from reports.jobs import ReporteVacio
+
+def _avance(titulo):
+    """Muestra el progreso en una sola línea de la terminal"""
+    def avance(actual, total):
+        print(f"\r{titulo}: {actual}/{total}", end="", file=sys.stderr, flush=True)
+        if actual >= total:
+            print(file=sys.stderr)
+    return avance
+
+def cmd_importar(db, args):
+    insertadas, errores = importar_archivo(db, args.tabla, args.archivo, args.parcial)
+    for linea, mensaje in errores:
+        print(f"{args.archivo}:{linea}: {mensaje}", file=sys.stderr)
+    if errores and not args.parcial:
+        print(f"No se importó ninguna fila: {len(errores)} con errores (use --parcial para importar las válidas)")
+    else:
+        print(f"{insertadas} filas importadas, {len(errores)} con errores")
+    return 1 if errores else 0
+
+def cmd_conflictos(db, args):
+    try:
+        conflictos = auditar(db)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    filas = filas_auditoria(db, conflictos)
+    for titulo, horario, otro in filas:
+        print(f"{titulo}:")
+        print(f"  {horario}")
+        if otro:
+            print(f"  {otro}")
+    print(f"{len(conflictos)} conflictos encontrados")
+    if args.csv:
+        exportar_auditoria(args.csv, filas)
+    return 1 if conflictos else 0
+
+def cmd_generar(db, args):
+    from scheduler.parallel import resolver_en_paralelo
+    from scheduler.repository import cargar_problema, guardar_solucion
+
+    problema = cargar_problema(db)
+    if not problema.requisitos:
+        print("No hay horas pendientes por asignar en la carga académica")
+        return 0
+
+    solucion = resolver_en_paralelo(problema, trabajadores=args.procesos, semilla=args.semilla,
+                                    tiempo_limite=args.tiempo)
+    print(f"Se asignaron {len(solucion.asignaciones)} horas en {solucion.segundos:.1f} s.")
+    if not solucion.completa:
+        print(f"Quedaron {sum(solucion.sin_asignar.values())} horas sin asignar.")
+    if args.simular:
+        return 0
+
+    ok, error = guardar_solucion(db, solucion)
+    if not ok:
+        print(f"Error al guardar los horarios: {error}", file=sys.stderr)
+        return 2
+    return 0 if solucion.completa else 1
+
+def _buscar_recurso(db, vista, nombre):
+    """Retorna el id del recurso con ese nombre (o "nombre apellido" para profesores)"""
+    tabla = {"grupo": "Grupos", "profesor": "Profesores", "aula": "Aulas"}[vista]
+    return Catalogo.leer(db, tabla).ids.get(nombre.casefold())
+
+def cmd_reporte(db, args):
+    from reports.batch import exportar_calendarios
+    from reports.calendar_report import generar_reporte_calendario
+    from reports.full_report import generar_reporte_completo
+
+    if args.tipo == "completo":
+        if not args.destino:
+            print("Indique el archivo PDF de destino", file=sys.stderr)
+            return 2
+        generar_reporte_completo(db, args.destino, _avance("Reporte completo"))
+        print(f"Reporte guardado en: {args.destino}")
+        return 0
+
+    if args.todos:
+        os.makedirs(args.todos, exist_ok=True)
+        archivos = exportar_calendarios(db, args.tipo, args.todos, _avance("Calendarios"),
+                                        combinado=args.combinado, trabajadores=args.procesos,
+                                        granularidad=args.granularidad)
+        print(f"{len(archivos)} archivos guardados en: {args.todos}")
+        return 0
+
+    if not args.nombre or not args.destino:
+        print("Indique el nombre y el archivo PDF de destino, o use --todos DIRECTORIO", file=sys.stderr)
+        return 2
+    id_recurso = _buscar_recurso(db, args.tipo, args.nombre)
+    if id_recurso is None:
+        print(f"No existe: {args.nombre}", file=sys.stderr)
+        return 2
+    generar_reporte_calendario(db, args.tipo, id_recurso, args.nombre, args.destino,
+                               _avance("Calendario"), args.granularidad)
+    print(f"Reporte guardado en: {args.destino}")
+    return 0
+
+def _buscar_version(versiones, nombre):
+    """Retorna el id de la versión, None para los horarios actuales; ValueError si no existe"""
+    if nombre == "actual":
+        return None
+    id_version = versiones.buscar(nombre)
+    if id_version is None:
+        raise ValueError(f"No existe la versión: {nombre}")
+    return id_version
+
+def cmd_version(db, args):
+    versiones = ScheduleVersions(db)
+    try:
+        if args.accion == "listar":
+            for version in versiones.versiones():
+                abierta = " (abierta)" if version.abierta else ""
+                print(f"{version.nombre}\t{version.tipo}\t{version.clases} clases{abierta}")
+            return 0
+
+        if args.accion == "guardar":
+            error = versiones.guardar(args.nombre, PERIODO if args.periodo else BORRADOR)
+            if error:
+                print(f"Error al guardar la versión: {error}", file=sys.stderr)
+                return 2
+            print(f"Versión guardada: {args.nombre}")
+            return 0
+
+        diferencias = versiones.diferencias(_buscar_version(versiones, args.antes),
+                                            _buscar_version(versiones, args.despues))
+    except ErrorVersion as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    nombres = {tabla: Catalogo.leer(db, tabla).nombres for tabla in CATALOGOS_FILA}
+    for _, fila in diferencias.agregadas:
+        print(f"+ {describir_fila(fila, nombres)}")
+    for _, fila in diferencias.eliminadas:
+        print(f"- {describir_fila(fila, nombres)}")
+    for _, antes, despues in diferencias.movidas:
+        print(f"~ {describir_fila(antes, nombres)}")
+        print(f"  -> {describir_fila(despues, nombres)}")
+    print(f"{len(diferencias.agregadas)} agregadas, {len(diferencias.eliminadas)} eliminadas, "
+          f"{len(diferencias.movidas)} movidas")
+    return 1 if any(diferencias) else 0
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Gestor de horarios sin interfaz gráfica")
+    parser.add_argument("--db", default="horarios.db", help="archivo de la base de datos (por defecto horarios.db)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("importar", help="importa un archivo CSV o XLSX a una tabla")
+    p.add_argument("tabla", choices=sorted(COLUMNAS))
+    p.add_argument("archivo")
+    p.add_argument("--parcial", action="store_true", help="importa las filas válidas aunque otras tengan errores")
+    p.set_defaults(funcion=cmd_importar)
+
+    p = sub.add_parser("conflictos", help="audita todos los horarios: solapamientos y capacidad de las aulas")
+    p.add_argument("--csv", metavar="ARCHIVO", help="guarda además los conflictos en un archivo CSV")
+    p.set_defaults(funcion=cmd_conflictos)
+
+    p = sub.add_parser("generar", help="asigna automáticamente la carga académica pendiente")
+    p.add_argument("--tiempo", type=float, default=10.0, help="segundos por reinicio")
+    p.add_argument("--procesos", type=int, default=None)
+    p.add_argument("--semilla", type=int, default=0)
+    p.add_argument("--simular", action="store_true", help="muestra el resultado sin guardarlo")
+    p.set_defaults(funcion=cmd_generar)
+
+    p = sub.add_parser("reporte", help="genera reportes PDF")
+    p.add_argument("tipo", choices=["completo", "grupo", "profesor", "aula"])
+    p.add_argument("nombre", nargs="?", help="sección, profesor (nombre apellido) o aula")
+    p.add_argument("destino", nargs="?", help="archivo PDF de destino")
+    p.add_argument("--todos", metavar="DIRECTORIO", help="genera el calendario de todos en el directorio")
+    p.add_argument("--combinado", action="store_true", help="con --todos, un solo PDF")
+    p.add_argument("--procesos", type=int, default=None)
+    p.add_argument("--granularidad", type=int, choices=[15, 30, 60], default=30,
+                   help="minutos por fila del calendario")
+    p.set_defaults(funcion=cmd_reporte)
+
+    p = sub.add_parser("version", help="guarda y compara versiones de los horarios (períodos y borradores)")
+    acciones = p.add_subparsers(dest="accion", required=True)
+    acciones.add_parser("listar", help="lista las versiones guardadas")
+    v = acciones.add_parser("guardar", help="guarda los horarios actuales como una versión")
+    v.add_argument("nombre")
+    v.add_argument("--periodo", action="store_true", help="es el horario publicado de un período, no un borrador")
+    v = acciones.add_parser("comparar", help="lista las clases agregadas, eliminadas y movidas entre dos versiones")
+    v.add_argument("antes", help='versión anterior, o "actual" para los horarios actuales')
+    v.add_argument("despues", nargs="?", default="actual", help='versión nueva (por defecto "actual")')
+    p.set_defaults(funcion=cmd_version)
+    return parser
+
+def main(argv=None):
+    multiprocessing.freeze_support()
+    args = crear_parser().parse_args(argv)
+    # En el reporte completo el único argumento posicional es el destino
+    if getattr(args, "tipo", None) == "completo" and args.destino is None:
+        args.destino = args.nombre
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager = DatabaseManager(args.db)
+    if not db_manager.init_db():
+        return 2
+    try:
+        return args.funcion(db_manager.get_connection(), args)
+    except (ReporteVacio, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
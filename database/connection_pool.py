@@ -0,0 +1,123 @@
+import threading
+from contextlib import contextmanager
+from itertools import count
+from PyQt5.QtSql import QSqlDatabase, QSqlQuery
+
+# Ajustes aplicados a todas las conexiones
+PRAGMAS = [
+    "PRAGMA synchronous = NORMAL",     # Seguro con WAL, evita un fsync por transacción
+    "PRAGMA cache_size = -20000",      # ~20 MB de caché de páginas
+    "PRAGMA mmap_size = 268435456",    # Lecturas mapeadas en memoria, hasta 256 MB
+    "PRAGMA temp_store = MEMORY",
+]
+
+BUSY_TIMEOUT_MS = 5000
+
+# ConnectionPool de cada conexión principal, por nombre de la conexión
+_pools = {}
+
+# Candado de escritura de las conexiones que no abrió DatabaseManager, por nombre
+_candados = {}
+
+def pool_de(db):
+    """Retorna el ConnectionPool de la conexión
+
+    Los modelos, la importación y el generador reciben la conexión; sus
+    escrituras pasan por pool_de(db).transaccion() para quedar serializadas.
+    Una conexión que no abrió DatabaseManager (p. ej. la de un benchmark)
+    recibe un pool de paso con un candado por nombre de conexión; no se
+    registra, para no retener la conexión después de que se cierre.
+    """
+    pool = _pools.get(db.connectionName())
+    if pool is None:
+        pool = ConnectionPool(db.databaseName(), db, registrar=False)
+        pool.candado_escritura = _candados.setdefault(db.connectionName(), threading.RLock())
+    return pool
+
+def configurar_conexion(db):
+    """Aplica los pragmas de rendimiento a una conexión abierta"""
+    query = QSqlQuery(db)
+    for pragma in PRAGMAS:
+        query.exec_(pragma)
+
+class ConnectionPool:
+    """Conexiones SQLite por hilo: lecturas en paralelo y escrituras serializadas
+
+    Qt sólo permite usar una conexión desde el hilo que la creó, por eso cada
+    hilo de trabajo recibe su propia conexión de sólo lectura (y, si escribe,
+    su propia conexión de escritura). Las escrituras de todos los hilos pasan
+    por un mismo candado, de modo que nunca compiten por el bloqueo de SQLite.
+    """
+
+    def __init__(self, db_name, principal, registrar=True):
+        self.db_name = db_name
+        self.principal = principal          # Conexión del hilo de la interfaz
+        self.hilo_principal = threading.get_ident()
+        self.candado_escritura = threading.RLock()
+        self._contador = count(1)
+        self._locales = threading.local()
+        if registrar:
+            _pools[principal.connectionName()] = self
+
+    def _abrir(self, prefijo, solo_lectura):
+        nombre = f"{prefijo}_{next(self._contador)}"
+        db = QSqlDatabase.addDatabase("QSQLITE", nombre)
+        db.setDatabaseName(self.db_name)
+        opciones = f"QSQLITE_BUSY_TIMEOUT={BUSY_TIMEOUT_MS}"
+        if solo_lectura:
+            opciones += ";QSQLITE_OPEN_READONLY"
+        db.setConnectOptions(opciones)
+        if not db.open():
+            error = db.lastError().text()
+            QSqlDatabase.removeDatabase(nombre)
+            raise RuntimeError(f"No se puede conectar a la base de datos: {error}")
+        configurar_conexion(db)
+        return nombre
+
+    def lectura(self):
+        """Retorna la conexión de sólo lectura del hilo actual, creándola si hace falta"""
+        if threading.get_ident() == self.hilo_principal:
+            return self.principal
+        if getattr(self._locales, "lectura", None) is None:
+            self._locales.lectura = self._abrir("lectura", True)
+        return QSqlDatabase.database(self._locales.lectura, False)
+
+    @contextmanager
+    def escritura(self):
+        """Da acceso exclusivo a una conexión de escritura del hilo actual"""
+        with self.candado_escritura:
+            if threading.get_ident() == self.hilo_principal:
+                yield self.principal
+                return
+            if getattr(self._locales, "escritura", None) is None:
+                self._locales.escritura = self._abrir("escritura", False)
+            yield QSqlDatabase.database(self._locales.escritura, False)
+
+    @contextmanager
+    def transaccion(self):
+        """Ejecuta el bloque dentro de una transacción en la conexión de escritura"""
+        with self.escritura() as db:
+            db.transaction()
+            try:
+                yield db
+            except Exception:
+                db.rollback()
+                raise
+            if not db.commit():
+                db.rollback()
+                raise RuntimeError(db.lastError().text())
+
+    def cerrar(self):
+        """Quita el pool del registro de pool_de, al cerrar la conexión principal"""
+        if _pools.get(self.principal.connectionName()) is self:
+            del _pools[self.principal.connectionName()]
+
+    def liberar_hilo(self):
+        """Cierra las conexiones del hilo actual; los trabajos lo llaman al terminar"""
+        for atributo in ("lectura", "escritura"):
+            nombre = getattr(self._locales, atributo, None)
+            if nombre is None:
+                continue
+            QSqlDatabase.database(nombre, False).close()
+            QSqlDatabase.removeDatabase(nombre)
+            setattr(self._locales, atributo, None)
@@ -1,27 +1,185 @@
+import sys
+from PyQt5.QtCore import QCoreApplication
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
-from PyQt5.QtWidgets import QMessageBox
+from database.connection_pool import ConnectionPool, configurar_conexion, BUSY_TIMEOUT_MS
+
+def _mostrar_error(mensaje):
+    """Muestra el error en un diálogo con la interfaz gráfica, o en stderr desde la línea de comandos"""
+    app = QCoreApplication.instance()
+    if app is not None and app.inherits("QApplication"):
+        from PyQt5.QtWidgets import QMessageBox
+        QMessageBox.critical(None, "Error", mensaje)
+    else:
+        print(f"Error: {mensaje}", file=sys.stderr)
+
+# Convierte una hora 'HH:mm' almacenada como texto a minutos desde la medianoche
+def _sql_minutos(columna):
+    return (f"CASE typeof({columna}) WHEN 'text' THEN "
+            f"CAST(substr({columna}, 1, instr({columna}, ':') - 1) AS INTEGER) * 60 + "
+            f"CAST(substr({columna}, instr({columna}, ':') + 1) AS INTEGER) "
+            f"ELSE {columna} END")
+
+_HORARIOS_SQL = """CREATE TABLE IF NOT EXISTS {tabla} (
+                id_horario INTEGER PRIMARY KEY AUTOINCREMENT,
+                id_profesor INTEGER NOT NULL,
+                id_asignatura INTEGER NOT NULL,
+                id_grupo INTEGER NOT NULL,
+                id_aula INTEGER NOT NULL,
+                id_dia INTEGER NOT NULL,
+                hora_inicio INTEGER NOT NULL,  -- minutos desde la medianoche
+                hora_fin INTEGER NOT NULL,     -- minutos desde la medianoche
+                FOREIGN KEY (id_profesor) REFERENCES Profesores(id_profesor),
+                FOREIGN KEY (id_asignatura) REFERENCES Asignaturas(id_asignatura),
+                FOREIGN KEY (id_grupo) REFERENCES Grupos(id_grupo),
+                FOREIGN KEY (id_aula) REFERENCES Aulas(id_aula),
+                FOREIGN KEY (id_dia) REFERENCES DiasSemana(id_dia),
+                CONSTRAINT unique_horario_profesor UNIQUE (id_profesor, id_dia, hora_inicio, hora_fin),
+                CONSTRAINT unique_horario_aula UNIQUE (id_aula, id_dia, hora_inicio, hora_fin))"""
+
+_INDICE_DIA_SQL = "CREATE INDEX IF NOT EXISTS idx_horarios_dia_inicio ON Horarios (id_dia, hora_inicio, hora_fin)"
+
+# Índices por recurso y día, ordenados por hora de inicio. Incluyen las demás
+# claves foráneas para que los reportes y la búsqueda de solapamientos se
+# resuelvan sólo con el índice
+_INDICES_RECURSO_SQL = [
+    """CREATE INDEX IF NOT EXISTS idx_horarios_grupo_dia
+       ON Horarios (id_grupo, id_dia, hora_inicio, hora_fin, id_profesor, id_asignatura, id_aula)""",
+    """CREATE INDEX IF NOT EXISTS idx_horarios_profesor_dia
+       ON Horarios (id_profesor, id_dia, hora_inicio, hora_fin, id_grupo, id_asignatura, id_aula)""",
+    """CREATE INDEX IF NOT EXISTS idx_horarios_aula_dia
+       ON Horarios (id_aula, id_dia, hora_inicio, hora_fin, id_profesor, id_grupo, id_asignatura)""",
+    "CREATE INDEX IF NOT EXISTS idx_profesores_apellido ON Profesores (apellido, nombre)",
+]
+
+# Ordena la tabla de horarios por asignatura sin recorrer Horarios una vez por cada una
+_INDICE_ASIGNATURA_SQL = """CREATE INDEX IF NOT EXISTS idx_horarios_asignatura_dia
+       ON Horarios (id_asignatura, id_dia, hora_inicio, hora_fin)"""
+
+# Diario de cambios de los horarios para deshacer y rehacer (models/journal.py).
+# Cada acción del usuario agrupa las filas que cambió, con su valor antes y
+# después como lista JSON (NULL si la fila no existía o se eliminó)
+_DIARIO_SQL = [
+    """CREATE TABLE IF NOT EXISTS DiarioAcciones (
+        id_accion INTEGER PRIMARY KEY AUTOINCREMENT,
+        descripcion TEXT NOT NULL,
+        momento REAL NOT NULL,
+        deshecha INTEGER NOT NULL DEFAULT 0)""",
+    """CREATE TABLE IF NOT EXISTS DiarioCambios (
+        id_cambio INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_accion INTEGER NOT NULL,
+        id_horario INTEGER NOT NULL,
+        antes TEXT,
+        despues TEXT,
+        FOREIGN KEY (id_accion) REFERENCES DiarioAcciones(id_accion))""",
+    "CREATE INDEX IF NOT EXISTS idx_diario_cambios_accion ON DiarioCambios (id_accion, id_cambio)",
+    "CREATE INDEX IF NOT EXISTS idx_diario_acciones_deshecha ON DiarioAcciones (deshecha, id_accion)",
+    """CREATE TABLE IF NOT EXISTS PuntosControl (
+        id_punto INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        momento REAL NOT NULL,
+        id_accion INTEGER NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS idx_puntos_control_accion ON PuntosControl (id_accion)",
+]
+
+# Versiones de los horarios (models/versions.py): períodos y borradores con
+# nombre. Una versión con base guarda sólo las clases que difieren de ella
+# (copia al escribir); las demás se leen de la base. abierta marca la versión
+# de la que salen los horarios actuales
+_VERSIONES_SQL = [
+    """CREATE TABLE IF NOT EXISTS Versiones (
+        id_version INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL UNIQUE,
+        tipo TEXT NOT NULL,
+        id_base INTEGER,
+        momento REAL NOT NULL,
+        clases INTEGER NOT NULL,
+        abierta INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (id_base) REFERENCES Versiones(id_version))""",
+    """CREATE TABLE IF NOT EXISTS VersionHorarios (
+        id_version INTEGER NOT NULL,
+        id_horario INTEGER NOT NULL,
+        id_profesor INTEGER,           -- NULL: la clase no está en esta versión
+        id_asignatura INTEGER,
+        id_grupo INTEGER,
+        id_aula INTEGER,
+        id_dia INTEGER,
+        hora_inicio INTEGER,
+        hora_fin INTEGER,
+        PRIMARY KEY (id_version, id_horario),
+        FOREIGN KEY (id_version) REFERENCES Versiones(id_version))""",
+    "CREATE INDEX IF NOT EXISTS idx_versiones_base ON Versiones (id_base)",
+]
+
+# Cargas académicas de un profesor o una asignatura, para no dejarlas sin su
+# catálogo al eliminarlo; las de una sección ya usan el índice de UNIQUE
+_INDICES_CARGA_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_carga_profesor ON CargaAcademica (id_profesor)",
+    "CREATE INDEX IF NOT EXISTS idx_carga_asignatura ON CargaAcademica (id_asignatura)",
+]
+
+# Índices del esquema más reciente, para las bases de datos nuevas
+_INDICES_SQL = [_INDICE_DIA_SQL] + _INDICES_RECURSO_SQL + [_INDICE_ASIGNATURA_SQL] + _INDICES_CARGA_SQL
+
+# Migraciones del esquema, la posición en la lista (empezando en 1) es la
+# versión que queda registrada en PRAGMA user_version al aplicarla
+MIGRACIONES = [
+    # 1: tamaño de las secciones
+    [
+        "ALTER TABLE Grupos ADD COLUMN estudiantes INTEGER",
+    ],
+    # 2: horas como minutos enteros
+    [
+        _HORARIOS_SQL.format(tabla="Horarios_nueva"),
+        f"""INSERT INTO Horarios_nueva (id_horario, id_profesor, id_asignatura, id_grupo,
+                                        id_aula, id_dia, hora_inicio, hora_fin)
+            SELECT id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia,
+                   {_sql_minutos('hora_inicio')}, {_sql_minutos('hora_fin')}
+            FROM Horarios""",
+        "DROP TABLE Horarios",
+        "ALTER TABLE Horarios_nueva RENAME TO Horarios",
+        _INDICE_DIA_SQL,
+    ],
+    # 3: índices por recurso y día
+    _INDICES_RECURSO_SQL,
+    # 4: orden por asignatura en la pestaña de horarios
+    [_INDICE_ASIGNATURA_SQL],
+    # 5: diario de cambios para deshacer y rehacer
+    _DIARIO_SQL,
+    # 6: versiones de los horarios
+    _VERSIONES_SQL,
+    # 7: cargas académicas por profesor y asignatura
+    _INDICES_CARGA_SQL,
+]
 
 class DatabaseManager:
     def __init__(self, db_name='horarios.db'):
         self.db_name = db_name
         self.db = None
+        self.pool = None
 
     def init_db(self):
         """Inicializa y configura la base de datos SQLite"""
         self.db = QSqlDatabase.addDatabase('QSQLITE')
         self.db.setDatabaseName(self.db_name)
+        self.db.setConnectOptions(f"QSQLITE_BUSY_TIMEOUT={BUSY_TIMEOUT_MS}")
         
         if not self.db.open():
-            QMessageBox.critical(None, "Error", "No se puede conectar a la base de datos")
+            _mostrar_error("No se puede conectar a la base de datos")
             return False
 
+        # WAL permite que los hilos de trabajo lean mientras la interfaz escribe
+        QSqlQuery(self.db).exec_("PRAGMA journal_mode = WAL")
+        configurar_conexion(self.db)
+        self.pool = ConnectionPool(self.db_name, self.db)
+
         self._create_tables()
         self._init_dias_semana()
         return True
 
     def _create_tables(self):
-        """Crea las tablas necesarias si no existen"""
+        """Crea las tablas necesarias si no existen y migra las bases de datos anteriores"""
         query = QSqlQuery(self.db)
+        nueva = not self.db.tables()
         
         tablas = [
             """CREATE TABLE IF NOT EXISTS Profesores (
@@ -38,7 +196,8 @@ class DatabaseManager:
             """CREATE TABLE IF NOT EXISTS Grupos (
                 id_grupo INTEGER PRIMARY KEY AUTOINCREMENT,
                 nombre TEXT NOT NULL UNIQUE,
-                descripcion TEXT)""",
+                descripcion TEXT,
+                estudiantes INTEGER)""",
                 
             """CREATE TABLE IF NOT EXISTS Aulas (
                 id_aula INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,27 +208,59 @@ class DatabaseManager:
                 id_dia INTEGER PRIMARY KEY AUTOINCREMENT,
                 nombre TEXT NOT NULL UNIQUE)""",
                 
-            """CREATE TABLE IF NOT EXISTS Horarios (
-                id_horario INTEGER PRIMARY KEY AUTOINCREMENT,
-                id_profesor INTEGER NOT NULL,
-                id_asignatura INTEGER NOT NULL,
+            _HORARIOS_SQL.format(tabla="Horarios"),
+
+            """CREATE TABLE IF NOT EXISTS CargaAcademica (
+                id_carga INTEGER PRIMARY KEY AUTOINCREMENT,
                 id_grupo INTEGER NOT NULL,
-                id_aula INTEGER NOT NULL,
-                id_dia INTEGER NOT NULL,
-                hora_inicio TEXT NOT NULL,
-                hora_fin TEXT NOT NULL,
-                FOREIGN KEY (id_profesor) REFERENCES Profesores(id_profesor),
-                FOREIGN KEY (id_asignatura) REFERENCES Asignaturas(id_asignatura),
+                id_asignatura INTEGER NOT NULL,
+                id_profesor INTEGER NOT NULL,
+                horas_semanales INTEGER NOT NULL,
                 FOREIGN KEY (id_grupo) REFERENCES Grupos(id_grupo),
-                FOREIGN KEY (id_aula) REFERENCES Aulas(id_aula),
-                FOREIGN KEY (id_dia) REFERENCES DiasSemana(id_dia),
-                CONSTRAINT unique_horario_profesor UNIQUE (id_profesor, id_dia, hora_inicio, hora_fin),
-                CONSTRAINT unique_horario_aula UNIQUE (id_aula, id_dia, hora_inicio, hora_fin))"""
-        ]
+                FOREIGN KEY (id_asignatura) REFERENCES Asignaturas(id_asignatura),
+                FOREIGN KEY (id_profesor) REFERENCES Profesores(id_profesor),
+                UNIQUE (id_grupo, id_asignatura))"""
+        ] + _DIARIO_SQL + _VERSIONES_SQL
 
         for tabla in tablas:
             if not query.exec_(tabla):
-                QMessageBox.critical(None, "Error", f"Error al crear tabla: {query.lastError().text()}")
+                _mostrar_error(f"Error al crear tabla: {query.lastError().text()}")
+
+        if nueva:
+            # Una base de datos nueva ya nace con el esquema más reciente
+            for indice in _INDICES_SQL:
+                query.exec_(indice)
+            self._set_user_version(len(MIGRACIONES))
+        else:
+            self._migrate()
+
+    def _user_version(self):
+        query = QSqlQuery(self.db)
+        if query.exec_("PRAGMA user_version") and query.next():
+            return query.value(0)
+        return 0
+
+    def _set_user_version(self, version):
+        QSqlQuery(self.db).exec_(f"PRAGMA user_version = {int(version)}")
+
+    def _migrate(self):
+        """Aplica en orden las migraciones pendientes, cada una en su propia transacción"""
+        query = QSqlQuery(self.db)
+        for version in range(self._user_version() + 1, len(MIGRACIONES) + 1):
+            self.db.transaction()
+            for sentencia in MIGRACIONES[version - 1]:
+                if not query.exec_(sentencia) and not self._ya_aplicada(sentencia, query):
+                    error = query.lastError().text()
+                    self.db.rollback()
+                    _mostrar_error(f"Error al migrar la base de datos a la versión {version}: {error}")
+                    return False
+            self._set_user_version(version)
+            self.db.commit()
+        return True
+
+    def _ya_aplicada(self, sentencia, query):
+        """Tolera columnas agregadas antes de existir el control de versiones"""
+        return sentencia.startswith("ALTER TABLE") and "duplicate column" in query.lastError().text()
 
     def _init_dias_semana(self):
         """Inicializa los días de la semana si no existen"""
@@ -84,7 +275,13 @@ class DatabaseManager:
         """Retorna la conexión a la base de datos"""
         return self.db
 
+    def get_pool(self):
+        """Retorna el administrador de conexiones para hilos de trabajo"""
+        return self.pool
+
     def close(self):
         """Cierra la conexión a la base de datos"""
+        if self.pool:
+            self.pool.cerrar()
         if self.db:
             self.db.close() 
\ No newline at end of file
@@ -0,0 +1,272 @@
+import csv
+import os
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from models.conflict_engine import ConflictEngine, Propuesta, RECURSOS, CAPACIDAD, SUJETOS, describir
+from models.conflict_index import ConflictIndex
+from models.reference_cache import Catalogo
+from utils.time_utils import hora_a_minutos, minutos_a_hora
+
+# Columnas obligatorias en el encabezado del archivo de cada tabla; las
+# columnas descripcion, estudiantes y capacidad son opcionales. Los
+# profesores se referencian por "nombre apellido" y las horas van en HH:mm
+COLUMNAS = {
+    "profesores": ["nombre", "apellido"],
+    "asignaturas": ["nombre"],
+    "secciones": ["nombre"],
+    "aulas": ["nombre"],
+    "carga": ["seccion", "asignatura", "profesor", "horas"],
+    "horarios": ["profesor", "asignatura", "seccion", "aula", "dia", "hora_inicio", "hora_fin"],
+}
+
+INSERCIONES = {
+    "profesores": queries.INSERTAR_PROFESOR,
+    "asignaturas": queries.INSERTAR_ASIGNATURA,
+    "secciones": queries.INSERTAR_GRUPO,
+    "aulas": queries.INSERTAR_AULA,
+    "carga": queries.INSERTAR_CARGA,
+    "horarios": queries.INSERTAR_HORARIO,
+}
+
+class ErrorImportacion(Exception):
+    """Una fila del archivo no se puede importar"""
+
+def _texto(fila, campo):
+    return (fila.get(campo) or "").strip()
+
+def _entero(fila, campo):
+    valor = _texto(fila, campo)
+    if not valor:
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ErrorImportacion(f"{campo} debe ser un número entero: '{valor}'")
+
+def _hora(fila, campo):
+    valor = _texto(fila, campo)
+    try:
+        return hora_a_minutos(valor)
+    except ValueError:
+        raise ErrorImportacion(f"{campo} debe tener el formato HH:mm: '{valor}'")
+
+def _pares(db, sql):
+    """Retorna el conjunto de (columna 0, columna 1) de una consulta"""
+    pares = set()
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    if query.exec_(sql):
+        while query.next():
+            pares.add((query.value(0), query.value(1)))
+    return pares
+
+def _buscar(mapa, fila, campo, descripcion):
+    valor = _texto(fila, campo)
+    id_ = mapa.get(valor.casefold())
+    if id_ is None:
+        raise ErrorImportacion(f"{descripcion} no existe: '{valor}'")
+    return id_
+
+class Importador:
+    """Convierte las filas de un archivo en los valores a insertar en una tabla
+
+    Además de resolver los nombres, detecta antes de insertar todo lo que
+    haría fallar la inserción: nombres repetidos, carga académica duplicada
+    y horarios que se solapan con los existentes o con otras filas del
+    archivo, o cuya sección no cabe en el aula. Así la inserción por lotes no se interrumpe a la mitad.
+    """
+
+    def __init__(self, db, tabla):
+        self.tabla = tabla
+        # Los nombres se resuelven una sola vez, no con una consulta por fila
+        self.profesores = Catalogo.leer(db, "Profesores").ids
+        self.asignaturas = Catalogo.leer(db, "Asignaturas").ids
+        self.grupos = Catalogo.leer(db, "Grupos").ids
+        self.aulas = Catalogo.leer(db, "Aulas").ids
+        self.dias = Catalogo.leer(db, "DiasSemana").ids
+        self.cargas = set()
+        self.conflictos = None
+        if tabla == "carga":
+            self.cargas = _pares(db, queries.CARGA_ACADEMICA)
+        elif tabla == "horarios":
+            indice = ConflictIndex()
+            indice.cargar(db)
+            self.conflictos = ConflictEngine(indice)
+            self.conflictos.cargar_capacidades(db)
+
+    def valores(self, fila):
+        """Retorna la lista de valores a enlazar en la inserción, o lanza ErrorImportacion"""
+        valores = self._convertir(fila)
+        self._registrar(valores)
+        return valores
+
+    def _registrar(self, valores):
+        """Verifica que la fila no choque con lo existente y la agrega a lo ya visto"""
+        if self.tabla == "profesores":
+            clave = f"{valores[0]} {valores[1]}".casefold()
+            if clave in self.profesores:
+                raise ErrorImportacion(f"El profesor ya existe: '{valores[0]} {valores[1]}'")
+            self.profesores[clave] = None
+        elif self.tabla in ("asignaturas", "secciones", "aulas"):
+            mapa = {"asignaturas": self.asignaturas, "secciones": self.grupos, "aulas": self.aulas}[self.tabla]
+            if valores[0].casefold() in mapa:
+                raise ErrorImportacion(f"Ya existe: '{valores[0]}'")
+            mapa[valores[0].casefold()] = None
+        elif self.tabla == "carga":
+            if (valores[0], valores[1]) in self.cargas:
+                raise ErrorImportacion("La asignatura ya está cargada para la sección")
+            self.cargas.add((valores[0], valores[1]))
+        # Los horarios se verifican todos juntos en verificar_horarios
+
+    def verificar_horarios(self, validas):
+        """Rechaza las filas de horarios que chocan con los existentes o con una fila anterior del archivo
+
+        Recibe [(línea, valores)] de las filas sin otros errores y retorna
+        (filas aceptadas, errores). Todo el archivo se verifica en una sola
+        pasada; una fila que sólo choca con otra ya rechazada se acepta,
+        igual que si se hubieran insertado de una en una.
+        """
+        orden = {tipo: n for n, tipo in enumerate(RECURSOS + (CAPACIDAD,))}
+        propuestas = [Propuesta(linea, v[0], v[3], v[2], v[4], v[5], v[6]) for linea, v in validas]
+        horas = {linea: (v[5], v[6]) for linea, v in validas}
+        rechazadas = {}
+        for conflicto in sorted(self.conflictos.verificar(propuestas), key=lambda c: (c.clave, orden[c.tipo])):
+            linea = conflicto.clave
+            if linea in rechazadas or (conflicto.otra is not None and
+                                       (conflicto.otra > linea or conflicto.otra in rechazadas)):
+                continue
+            if conflicto.tipo == CAPACIDAD:
+                rechazadas[linea] = describir(conflicto)
+            else:
+                inicio, fin = horas[linea]
+                rechazadas[linea] = (f"{SUJETOS[conflicto.tipo]} ya tiene clase de "
+                                     f"{minutos_a_hora(inicio)} a {minutos_a_hora(fin)}")
+        return ([(linea, valores) for linea, valores in validas if linea not in rechazadas],
+                sorted(rechazadas.items()))
+
+    def _convertir(self, fila):
+        if self.tabla == "profesores":
+            if not _texto(fila, "nombre") or not _texto(fila, "apellido"):
+                raise ErrorImportacion("El nombre y el apellido son obligatorios")
+            return [_texto(fila, "nombre"), _texto(fila, "apellido")]
+
+        if self.tabla == "asignaturas":
+            return [self._nombre(fila), _texto(fila, "descripcion")]
+
+        if self.tabla == "secciones":
+            return [self._nombre(fila), _texto(fila, "descripcion"), _entero(fila, "estudiantes")]
+
+        if self.tabla == "aulas":
+            return [self._nombre(fila), _entero(fila, "capacidad")]
+
+        if self.tabla == "carga":
+            horas = _entero(fila, "horas")
+            if not horas or horas < 1:
+                raise ErrorImportacion("Las horas semanales deben ser mayores que cero")
+            return [_buscar(self.grupos, fila, "seccion", "La sección"),
+                    _buscar(self.asignaturas, fila, "asignatura", "La asignatura"),
+                    _buscar(self.profesores, fila, "profesor", "El profesor"),
+                    horas]
+
+        # horarios
+        inicio = _hora(fila, "hora_inicio")
+        fin = _hora(fila, "hora_fin")
+        if inicio >= fin:
+            raise ErrorImportacion("La hora de inicio debe ser anterior a la hora de fin")
+        return [_buscar(self.profesores, fila, "profesor", "El profesor"),
+                _buscar(self.asignaturas, fila, "asignatura", "La asignatura"),
+                _buscar(self.grupos, fila, "seccion", "La sección"),
+                _buscar(self.aulas, fila, "aula", "El aula"),
+                _buscar(self.dias, fila, "dia", "El día"),
+                inicio, fin]
+
+    def _nombre(self, fila):
+        nombre = _texto(fila, "nombre")
+        if not nombre:
+            raise ErrorImportacion("El nombre es obligatorio")
+        return nombre
+
+def leer_csv(ruta):
+    """Retorna las filas del archivo como diccionarios con el encabezado en minúsculas"""
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        lector = csv.DictReader(archivo)
+        lector.fieldnames = [c.strip().lower() for c in lector.fieldnames or []]
+        return list(lector)
+
+def _celda_texto(valor):
+    if valor is None:
+        return ""
+    if hasattr(valor, "hour") and hasattr(valor, "minute"):
+        return f"{valor.hour:02d}:{valor.minute:02d}"
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+def leer_xlsx(ruta):
+    """Retorna las filas de la primera hoja como diccionarios, igual que leer_csv"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Para importar archivos XLSX instale el paquete openpyxl")
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezado = [str(c or "").strip().lower() for c in next(filas, ())]
+        # Las celdas se pasan a texto como en un CSV; las horas pueden venir como time
+        return [{campo: _celda_texto(valor) for campo, valor in zip(encabezado, fila)}
+                for fila in filas if any(v is not None for v in fila)]
+    finally:
+        libro.close()
+
+def leer_archivo(ruta):
+    """Lee un archivo CSV o XLSX según su extensión"""
+    if os.path.splitext(ruta)[1].lower() in (".xlsx", ".xlsm"):
+        return leer_xlsx(ruta)
+    return leer_csv(ruta)
+
+def importar_archivo(db, tabla, ruta, parcial=False):
+    """Importa un archivo CSV o XLSX a la tabla indicada en una sola transacción
+
+    Primero se validan todas las filas en memoria: nombres, formatos,
+    duplicados y, para los horarios, solapamientos y capacidad de las aulas. Si alguna fila tiene errores no
+    se inserta nada, salvo con parcial=True, que inserta las filas válidas.
+    Las filas se insertan por lotes con execBatch.
+
+    Retorna (insertadas, errores), donde errores es una lista de
+    (línea, mensaje) con la línea del archivo de cada fila rechazada.
+    """
+    if tabla not in COLUMNAS:
+        raise ValueError(f"Tabla desconocida: {tabla}")
+
+    filas = leer_archivo(ruta)
+    faltantes = [c for c in COLUMNAS[tabla] if filas and c not in filas[0]]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+
+    importador = Importador(db, tabla)
+    validas = []
+    errores = []
+    for linea, fila in enumerate(filas, start=2):  # La línea 1 es el encabezado
+        try:
+            validas.append((linea, importador.valores(fila)))
+        except ErrorImportacion as e:
+            errores.append((linea, str(e)))
+    if tabla == "horarios":
+        validas, solapadas = importador.verificar_horarios(validas)
+        errores = sorted(errores + solapadas)
+
+    if not validas or (errores and not parcial):
+        return 0, errores
+    columnas = [list(columna) for columna in zip(*(valores for _, valores in validas))]
+
+    query = QSqlQuery(db)
+    query.prepare(INSERCIONES[tabla])
+    for columna in columnas:
+        query.addBindValue(columna)
+
+    with pool_de(db).transaccion():
+        if not query.execBatch():
+            raise RuntimeError(query.lastError().text())
+    return len(columnas[0]), errores
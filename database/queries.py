@@ -0,0 +1,348 @@
+# Consultas SQL de la aplicación. Todas viven aquí para que
+# database/query_plans.py revise su plan de ejecución: una consulta nueva
+# queda verificada automáticamente al agregarla a este módulo.
+
+# Catálogos para los comboboxes
+PROFESORES_COMBO = "SELECT id_profesor, nombre, apellido FROM Profesores ORDER BY apellido, nombre"
+ASIGNATURAS_COMBO = "SELECT id_asignatura, nombre FROM Asignaturas ORDER BY nombre"
+GRUPOS_COMBO = "SELECT id_grupo, nombre FROM Grupos ORDER BY nombre"
+AULAS_COMBO = "SELECT id_aula, nombre FROM Aulas ORDER BY nombre"
+DIAS_COMBO = "SELECT id_dia, nombre FROM DiasSemana ORDER BY id_dia"
+
+# Consulta de cada catálogo, cuántas columnas forman el nombre mostrado
+# y qué columnas dan su orden (las del ORDER BY)
+COMBOS = {
+    "Profesores": (PROFESORES_COMBO, 2, (2, 1)),
+    "Asignaturas": (ASIGNATURAS_COMBO, 1, (1,)),
+    "Grupos": (GRUPOS_COMBO, 1, (1,)),
+    "Aulas": (AULAS_COMBO, 1, (1,)),
+    "DiasSemana": (DIAS_COMBO, 1, (0,)),
+}
+
+# Una fila de cada catálogo, con las columnas de su consulta de combo
+COMBO_POR_ID = {
+    "Profesores": "SELECT id_profesor, nombre, apellido FROM Profesores WHERE id_profesor = ?",
+    "Asignaturas": "SELECT id_asignatura, nombre FROM Asignaturas WHERE id_asignatura = ?",
+    "Grupos": "SELECT id_grupo, nombre FROM Grupos WHERE id_grupo = ?",
+    "Aulas": "SELECT id_aula, nombre FROM Aulas WHERE id_aula = ?",
+    "DiasSemana": "SELECT id_dia, nombre FROM DiasSemana WHERE id_dia = ?",
+}
+
+# Índice de conflictos
+HORARIOS_INTERVALOS = """
+    SELECT id_horario, id_profesor, id_aula, id_grupo, id_dia, hora_inicio, hora_fin
+    FROM Horarios
+"""
+
+HORARIO_INTERVALO = """
+    SELECT id_profesor, id_aula, id_grupo, id_dia, hora_inicio, hora_fin
+    FROM Horarios WHERE id_horario = ?
+"""
+
+# Tabla de la pestaña de horarios. Se consulta en dos pasos: primero los
+# id_horario en el orden pedido, en un solo valor de texto para no leer
+# fila por fila, y después las filas de cada página visible por su clave
+# primaria; los nombres de los catálogos se resuelven en memoria.
+_IDS_HORARIOS = """
+    SELECT group_concat(id_horario) FROM (
+        SELECT h.id_horario FROM Horarios h {join}
+        {filtro}
+        ORDER BY {orden}
+    )
+"""
+
+# Por columna de la tabla: catálogo a unir y orden; los nombres se ordenan
+# recorriendo el índice del catálogo y, por cada elemento, el de Horarios
+ORDEN_HORARIOS = [
+    ("", "h.id_horario"),
+    ("JOIN Profesores p ON p.id_profesor = h.id_profesor",
+     "p.apellido, p.nombre, p.id_profesor, h.id_dia, h.hora_inicio, h.hora_fin"),
+    ("JOIN Asignaturas a ON a.id_asignatura = h.id_asignatura",
+     "a.nombre, h.id_dia, h.hora_inicio, h.hora_fin"),
+    ("JOIN Grupos g ON g.id_grupo = h.id_grupo", "g.nombre, h.id_dia, h.hora_inicio, h.hora_fin"),
+    ("JOIN Aulas au ON au.id_aula = h.id_aula", "au.nombre, h.id_dia, h.hora_inicio, h.hora_fin"),
+    ("", "h.id_dia, h.hora_inicio, h.hora_fin"),
+    ("", "h.hora_inicio, h.hora_fin"),
+    ("", "h.hora_fin, h.hora_inicio"),
+]
+
+def ids_horarios(columna, descendente=False, filtros=()):
+    """Consulta de los id_horario ordenados por la columna, con un parámetro por filtro
+
+    filtros es una lista de columnas de Horarios (id_profesor, id_dia...)
+    que deben ser iguales al valor enlazado.
+    """
+    join, orden = ORDEN_HORARIOS[columna]
+    if descendente:
+        orden = ", ".join(f"{termino} DESC" for termino in orden.split(", "))
+    filtro = " AND ".join(f"h.{columna_filtro} = ?" for columna_filtro in filtros)
+    return _IDS_HORARIOS.format(join=join, filtro=f"WHERE {filtro}" if filtro else "", orden=orden)
+
+HORARIOS_IDS = {columna: ids_horarios(columna) for columna in range(len(ORDEN_HORARIOS))}
+
+# Columnas de Horarios por las que se puede filtrar la tabla
+FILTROS_HORARIOS = ("id_profesor", "id_grupo", "id_aula", "id_dia")
+
+# Un filtro por consulta en cada orden, para que query_plans verifique que
+# el filtro busca en un índice de Horarios en lugar de recorrerla
+HORARIOS_IDS_FILTRADOS = {f"{filtro}, {columna}": ids_horarios(columna, filtros=[filtro])
+                          for filtro in FILTROS_HORARIOS for columna in range(len(ORDEN_HORARIOS))}
+
+_HORARIOS_PAGINA = """
+    SELECT id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin
+    FROM Horarios WHERE id_horario IN ({marcas})
+"""
+
+def horarios_pagina(cantidad):
+    return _HORARIOS_PAGINA.format(marcas=", ".join("?" * cantidad))
+
+HORARIO_FILA = horarios_pagina(1)
+
+ELIMINAR_HORARIO = "DELETE FROM Horarios WHERE id_horario = ?"
+ACTUALIZAR_HORAS = "UPDATE Horarios SET hora_inicio = ?, hora_fin = ? WHERE id_horario = ?"
+
+# Diario de cambios de los horarios (models/journal.py). Las filas se
+# escriben completas, con los mismos valores y en el orden de INSERTAR_HORARIO
+REINSERTAR_HORARIO = """
+    INSERT INTO Horarios (id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+ACTUALIZAR_HORARIO = """
+    UPDATE Horarios SET id_profesor = ?, id_asignatura = ?, id_grupo = ?, id_aula = ?, id_dia = ?,
+                        hora_inicio = ?, hora_fin = ?
+    WHERE id_horario = ?
+"""
+DIARIO_INSERTAR_ACCION = "INSERT INTO DiarioAcciones (descripcion, momento) VALUES (?, ?)"
+DIARIO_INSERTAR_CAMBIO = "INSERT INTO DiarioCambios (id_accion, id_horario, antes, despues) VALUES (?, ?, ?, ?)"
+DIARIO_POSICION = "SELECT COALESCE(MAX(id_accion), 0) FROM DiarioAcciones WHERE deshecha = 0"
+DIARIO_ULTIMA = """
+    SELECT id_accion, descripcion FROM DiarioAcciones
+    WHERE deshecha = 0 ORDER BY id_accion DESC LIMIT 1
+"""
+DIARIO_ANTERIOR = "SELECT COALESCE(MAX(id_accion), 0) FROM DiarioAcciones WHERE id_accion < ?"
+DIARIO_SIGUIENTE = """
+    SELECT id_accion, descripcion FROM DiarioAcciones
+    WHERE id_accion > ? ORDER BY id_accion LIMIT 1
+"""
+DIARIO_CAMBIOS = """
+    SELECT id_horario, antes, despues FROM DiarioCambios
+    WHERE id_accion > ? AND id_accion <= ? ORDER BY id_accion, id_cambio
+"""
+DIARIO_MARCAR = "UPDATE DiarioAcciones SET deshecha = ? WHERE id_accion > ? AND id_accion <= ?"
+DIARIO_DESCARTAR_CAMBIOS = "DELETE FROM DiarioCambios WHERE id_accion > ?"
+DIARIO_DESCARTAR_ACCIONES = "DELETE FROM DiarioAcciones WHERE id_accion > ?"
+DIARIO_LIMITE_COMPACTAR = """
+    SELECT id_accion FROM DiarioAcciones
+    WHERE deshecha = 0 ORDER BY id_accion DESC LIMIT 1 OFFSET ?
+"""
+DIARIO_COMPACTAR_CAMBIOS = "DELETE FROM DiarioCambios WHERE id_accion <= ?"
+DIARIO_COMPACTAR_ACCIONES = "DELETE FROM DiarioAcciones WHERE id_accion <= ?"
+PUNTOS_CONTROL = "SELECT id_punto, nombre, momento, id_accion FROM PuntosControl ORDER BY id_punto DESC"
+PUNTO_CONTROL = "SELECT id_accion FROM PuntosControl WHERE id_punto = ?"
+PUNTO_MAS_ANTIGUO = "SELECT MIN(id_accion) FROM PuntosControl"
+INSERTAR_PUNTO = "INSERT INTO PuntosControl (nombre, momento, id_accion) VALUES (?, ?, ?)"
+ELIMINAR_PUNTO = "DELETE FROM PuntosControl WHERE id_punto = ?"
+DESCARTAR_PUNTOS = "DELETE FROM PuntosControl WHERE id_accion > ?"
+
+# Versiones de los horarios (models/versions.py). Cada versión guarda sólo
+# las clases que difieren de su base; una fila con id_profesor NULL indica
+# que la clase no está en la versión
+HORARIOS_VALORES = """
+    SELECT id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin
+    FROM Horarios
+"""
+VERSIONES = """
+    SELECT id_version, nombre, tipo, id_base, momento, clases, abierta
+    FROM Versiones ORDER BY momento DESC
+"""
+VERSION_POR_NOMBRE = "SELECT id_version FROM Versiones WHERE nombre = ?"
+VERSION_BASE = "SELECT id_base FROM Versiones WHERE id_version = ?"
+VERSION_ABIERTA = "SELECT id_version FROM Versiones WHERE abierta = 1"
+VERSION_HIJAS = "SELECT id_version FROM Versiones WHERE id_base = ?"
+INSERTAR_VERSION = """
+    INSERT INTO Versiones (nombre, tipo, id_base, momento, clases, abierta) VALUES (?, ?, ?, ?, ?, 1)
+"""
+CERRAR_VERSIONES = "UPDATE Versiones SET abierta = 0 WHERE abierta = 1"
+ABRIR_VERSION = "UPDATE Versiones SET abierta = 1 WHERE id_version = ?"
+PUBLICAR_VERSION = "UPDATE Versiones SET tipo = ? WHERE id_version = ?"
+CAMBIAR_BASE_VERSION = "UPDATE Versiones SET id_base = ? WHERE id_version = ?"
+ELIMINAR_VERSION = "DELETE FROM Versiones WHERE id_version = ?"
+VERSION_INSERTAR_FILA = """
+    INSERT INTO VersionHorarios (id_version, id_horario, id_profesor, id_asignatura, id_grupo, id_aula,
+                                 id_dia, hora_inicio, hora_fin)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+VERSION_IDS = "SELECT id_horario FROM VersionHorarios WHERE id_version = ?"
+
+_VERSION_FILAS = """
+    SELECT id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin
+    FROM VersionHorarios WHERE id_version = ? {filtro}
+"""
+
+def version_filas(cantidad=None):
+    """Filas guardadas en una versión; con cantidad, sólo las de esa cantidad de id_horario"""
+    filtro = f"AND id_horario IN ({', '.join('?' * cantidad)})" if cantidad else ""
+    return _VERSION_FILAS.format(filtro=filtro)
+
+VERSION_FILAS = version_filas()
+# Al eliminar una versión sus hijas heredan las filas que no reemplazan
+VERSION_HEREDAR_FILAS = """
+    INSERT OR IGNORE INTO VersionHorarios
+    SELECT ?, id_horario, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin
+    FROM VersionHorarios WHERE id_version = ?
+"""
+VERSION_QUITAR_AUSENTES = "DELETE FROM VersionHorarios WHERE id_version = ? AND id_profesor IS NULL"
+VERSION_ELIMINAR_FILAS = "DELETE FROM VersionHorarios WHERE id_version = ?"
+
+# Reportes
+CONTAR_HORARIOS = "SELECT COUNT(*) FROM Horarios"
+
+REPORTE_COMPLETO = """
+    SELECT
+        p.nombre || ' ' || p.apellido AS profesor,
+        a.nombre AS asignatura,
+        g.nombre AS seccion,
+        au.nombre AS aula,
+        d.nombre AS dia,
+        h.hora_inicio,
+        h.hora_fin
+    FROM Horarios h
+    JOIN Profesores p ON h.id_profesor = p.id_profesor
+    JOIN Asignaturas a ON h.id_asignatura = a.id_asignatura
+    JOIN Grupos g ON h.id_grupo = g.id_grupo
+    JOIN Aulas au ON h.id_aula = au.id_aula
+    JOIN DiasSemana d ON h.id_dia = d.id_dia
+    ORDER BY p.apellido, p.nombre, d.id_dia, h.hora_inicio
+"""
+
+# Descripción de los horarios de una auditoría de conflictos
+_HORARIOS_DESCRIPCION = """
+    SELECT
+        h.id_horario,
+        p.nombre || ' ' || p.apellido AS profesor,
+        a.nombre AS asignatura,
+        g.nombre AS seccion,
+        au.nombre AS aula,
+        d.nombre AS dia,
+        h.hora_inicio,
+        h.hora_fin
+    FROM Horarios h
+    JOIN Profesores p ON h.id_profesor = p.id_profesor
+    JOIN Asignaturas a ON h.id_asignatura = a.id_asignatura
+    JOIN Grupos g ON h.id_grupo = g.id_grupo
+    JOIN Aulas au ON h.id_aula = au.id_aula
+    JOIN DiasSemana d ON h.id_dia = d.id_dia
+    WHERE h.id_horario IN ({marcas})
+"""
+
+def horarios_descripcion(cantidad):
+    return _HORARIOS_DESCRIPCION.format(marcas=", ".join("?" * cantidad))
+
+HORARIO_DESCRIPCION = horarios_descripcion(1)
+
+# Generador automático
+AULAS_CAPACIDAD = "SELECT id_aula, capacidad FROM Aulas"
+DIAS_IDS = "SELECT id_dia FROM DiasSemana ORDER BY id_dia"
+GRUPOS_ESTUDIANTES = "SELECT id_grupo, estudiantes FROM Grupos"
+
+HORARIOS_OCUPADOS = """
+    SELECT id_profesor, id_aula, id_grupo, id_dia, hora_inicio, hora_fin, id_asignatura
+    FROM Horarios
+"""
+
+CARGA_ACADEMICA = """
+    SELECT id_grupo, id_asignatura, id_profesor, horas_semanales
+    FROM CargaAcademica
+    ORDER BY id_grupo, id_asignatura
+"""
+
+INSERTAR_HORARIO = """
+    INSERT INTO Horarios (id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Importación de datos
+INSERTAR_PROFESOR = "INSERT INTO Profesores (nombre, apellido) VALUES (?, ?)"
+INSERTAR_ASIGNATURA = "INSERT INTO Asignaturas (nombre, descripcion) VALUES (?, ?)"
+INSERTAR_GRUPO = "INSERT INTO Grupos (nombre, descripcion, estudiantes) VALUES (?, ?, ?)"
+INSERTAR_AULA = "INSERT INTO Aulas (nombre, capacidad) VALUES (?, ?)"
+INSERTAR_CARGA = """
+    INSERT INTO CargaAcademica (id_grupo, id_asignatura, id_profesor, horas_semanales)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Sesiones de edición de los catálogos (models/edit_session.py). La clave
+# primaria de cada catálogo es también la columna que lo referencia en Horarios
+CLAVES = {
+    "Profesores": "id_profesor",
+    "Asignaturas": "id_asignatura",
+    "Grupos": "id_grupo",
+    "Aulas": "id_aula",
+    "DiasSemana": "id_dia",
+}
+
+def insertar_catalogo(tabla, columnas):
+    return f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})"
+
+def actualizar_catalogo(tabla, columnas):
+    asignaciones = ", ".join(f"{columna} = ?" for columna in columnas)
+    return f"UPDATE {tabla} SET {asignaciones} WHERE {CLAVES[tabla]} = ?"
+
+def eliminar_catalogo(tabla):
+    return f"DELETE FROM {tabla} WHERE {CLAVES[tabla]} = ?"
+
+def horarios_de_catalogo(tabla, cantidad):
+    """Horarios que referencian alguno de los ids del catálogo, como (id del catálogo, id_horario)"""
+    columna = CLAVES[tabla]
+    return f"SELECT {columna}, id_horario FROM Horarios WHERE {columna} IN ({', '.join('?' * cantidad)})"
+
+# Con un solo id, para que query_plans verifique que cada columna usa su índice
+HORARIOS_DE_CATALOGO = {tabla: horarios_de_catalogo(tabla, 1) for tabla in CLAVES}
+
+# Catálogos referenciados por CargaAcademica, con la misma columna que en Horarios
+CATALOGOS_CARGA = ("Profesores", "Asignaturas", "Grupos")
+
+def cargas_de_catalogo(tabla, cantidad):
+    """Cargas académicas que referencian alguno de los ids del catálogo, como (id del catálogo, id_carga)"""
+    columna = CLAVES[tabla]
+    return f"SELECT {columna}, id_carga FROM CargaAcademica WHERE {columna} IN ({', '.join('?' * cantidad)})"
+
+CARGAS_DE_CATALOGO = {tabla: cargas_de_catalogo(tabla, 1) for tabla in CATALOGOS_CARGA}
+
+ELIMINAR_CARGA = "DELETE FROM CargaAcademica WHERE id_carga = ?"
+
+# Calendarios semanales por sección, profesor o aula. Todas retornan las
+# mismas columnas: id y nombre del recurso, profesor, asignatura, sección,
+# aula, id_dia, día, hora_inicio y hora_fin; las versiones "TODOS" recorren
+# el índice del recurso para entregar las filas ya agrupadas.
+_CALENDARIO = """
+    SELECT
+        {id_recurso},
+        {nombre_recurso},
+        p.nombre || ' ' || p.apellido AS profesor,
+        a.nombre AS asignatura,
+        g.nombre AS seccion,
+        au.nombre AS aula,
+        d.id_dia,
+        d.nombre AS dia,
+        h.hora_inicio,
+        h.hora_fin
+    FROM Horarios h
+    JOIN Grupos g ON h.id_grupo = g.id_grupo
+    JOIN Profesores p ON h.id_profesor = p.id_profesor
+    JOIN Asignaturas a ON h.id_asignatura = a.id_asignatura
+    JOIN Aulas au ON h.id_aula = au.id_aula
+    JOIN DiasSemana d ON h.id_dia = d.id_dia
+    {filtro}
+    ORDER BY {id_recurso}, h.id_dia, h.hora_inicio
+"""
+
+def _calendario(id_recurso, nombre_recurso, filtro=""):
+    return _CALENDARIO.format(id_recurso=id_recurso, nombre_recurso=nombre_recurso, filtro=filtro)
+
+HORARIO_GRUPO = _calendario("h.id_grupo", "g.nombre", "WHERE h.id_grupo = ?")
+HORARIO_PROFESOR = _calendario("h.id_profesor", "p.nombre || ' ' || p.apellido", "WHERE h.id_profesor = ?")
+HORARIO_AULA = _calendario("h.id_aula", "au.nombre", "WHERE h.id_aula = ?")
+HORARIOS_TODOS_GRUPOS = _calendario("h.id_grupo", "g.nombre")
+HORARIOS_TODOS_PROFESORES = _calendario("h.id_profesor", "p.nombre || ' ' || p.apellido")
+HORARIOS_TODAS_AULAS = _calendario("h.id_aula", "au.nombre")
@@ -0,0 +1,121 @@
+import sys
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.db_manager import DatabaseManager
+
+# Consultas que leen la tabla completa a propósito y pueden recorrerla
+RECORRIDOS_PERMITIDOS = {
+    "PROFESORES_COMBO",
+    "ASIGNATURAS_COMBO",
+    "GRUPOS_COMBO",
+    "AULAS_COMBO",
+    "DIAS_COMBO",
+    "HORARIOS_INTERVALOS",
+    "HORARIOS_IDS",
+    "REPORTE_COMPLETO",
+    "CONTAR_HORARIOS",
+    "AULAS_CAPACIDAD",
+    "DIAS_IDS",
+    "GRUPOS_ESTUDIANTES",
+    "HORARIOS_OCUPADOS",
+    "CARGA_ACADEMICA",
+    "HORARIOS_TODOS_GRUPOS",
+    "HORARIOS_TODOS_PROFESORES",
+    "HORARIOS_TODAS_AULAS",
+    "PUNTOS_CONTROL",
+    "HORARIOS_VALORES",
+    "VERSIONES",
+    "VERSION_ABIERTA",
+}
+
+# Consultas filtradas por una columna de Horarios: el resultado es pequeño y
+# pueden ordenarlo en memoria, pero deben buscar las filas en un índice
+FILTRADAS = {
+    "HORARIOS_IDS_FILTRADOS",
+}
+
+def _es_consulta(sql):
+    return isinstance(sql, str) and sql.lstrip().upper().startswith(("SELECT", "WITH"))
+
+def consultas_registradas():
+    """Retorna (nombre, sql) de cada consulta SELECT definida en database.queries
+
+    Las variantes de una consulta agrupadas en un diccionario se revisan
+    como NOMBRE[clave].
+    """
+    for nombre in sorted(vars(queries)):
+        valor = getattr(queries, nombre)
+        if not nombre.isupper() or nombre.startswith("_"):
+            continue
+        if _es_consulta(valor):
+            yield nombre, valor
+        elif isinstance(valor, dict):
+            for clave, sql in valor.items():
+                if _es_consulta(sql):
+                    yield f"{nombre}[{clave}]", sql
+
+def plan_de(db, sql):
+    """Retorna las líneas de EXPLAIN QUERY PLAN de una consulta"""
+    query = QSqlQuery(db)
+    if not query.prepare(f"EXPLAIN QUERY PLAN {sql}"):
+        raise RuntimeError(query.lastError().text())
+    for _ in range(sql.count("?")):
+        query.addBindValue(0)
+    if not query.exec_():
+        raise RuntimeError(query.lastError().text())
+
+    lineas = []
+    while query.next():
+        lineas.append(query.value(3))
+    return lineas
+
+def es_recorrido(detalle):
+    """Indica si la línea del plan recorre una tabla completa, aunque sea a través de un índice"""
+    return detalle.startswith("SCAN")
+
+def busca_horarios(plan):
+    """Indica si el plan busca las filas de Horarios en un índice y nunca la recorre"""
+    tabla = [detalle.split()[:2] for detalle in plan]
+    return (any(palabras in (["SEARCH", "h"], ["SEARCH", "Horarios"]) for palabras in tabla)
+            and not any(palabras in (["SCAN", "h"], ["SCAN", "Horarios"]) for palabras in tabla))
+
+def verificar_planes(db):
+    """Retorna (consulta, detalle) por cada consulta que recorre una tabla en lugar de buscar en un índice"""
+    problemas = []
+    for nombre, sql in consultas_registradas():
+        try:
+            plan = plan_de(db, sql)
+        except RuntimeError as e:
+            problemas.append((nombre, f"error al obtener el plan: {e}"))
+            continue
+
+        if nombre.split("[")[0] in RECORRIDOS_PERMITIDOS:
+            continue
+        if nombre.split("[")[0] in FILTRADAS:
+            if not busca_horarios(plan):
+                problemas.append((nombre, "; ".join(plan)))
+            continue
+        for detalle in plan:
+            if es_recorrido(detalle) or "TEMP B-TREE" in detalle:
+                problemas.append((nombre, detalle))
+    return problemas
+
+def main(argv):
+    """Verifica los planes sobre una base de datos nueva o la indicada como argumento"""
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager = DatabaseManager(argv[0] if argv else ":memory:")
+    if not db_manager.init_db():
+        return 2
+
+    problemas = verificar_planes(db_manager.get_connection())
+    for nombre, detalle in problemas:
+        print(f"{nombre}: {detalle}")
+    if not problemas:
+        print("Todas las consultas usan índices")
+
+    db_manager.close()
+    return 1 if problemas else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
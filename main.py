@@ -1,5 +1,15 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget
+
+from utils import startup_timing
+
+# Con --tiempos-inicio se mide el arranque desde antes de importar Qt
+if "--tiempos-inicio" in sys.argv:
+    startup_timing.iniciar()
+
+import multiprocessing
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QShortcut
 from database.db_manager import DatabaseManager
 from models.model_manager import ModelManager
 from ui.tabs.profesores_tab import ProfesoresTab
@@ -7,6 +17,11 @@ from ui.tabs.asignaturas_tab import AsignaturasTab
 from ui.tabs.grupos_tab import GruposTab
 from ui.tabs.aulas_tab import AulasTab
 from ui.tabs.horarios_tab import HorariosTab
+from ui.tabs.carga_tab import CargaTab
+from ui.lazy_tab import LazyTab
+from utils import metrics
+
+startup_timing.marcar("importaciones")
 
 class HorarioApp(QMainWindow):
     def __init__(self):
@@ -18,13 +33,14 @@ class HorarioApp(QMainWindow):
         self.db_manager = DatabaseManager()
         if not self.db_manager.init_db():
             sys.exit(1)
+        startup_timing.marcar("base de datos")
         
         # Inicializar los modelos
         self.model_manager = ModelManager(self.db_manager.get_connection())
-        self.model_manager.create_models()
         
         # Configurar la interfaz
         self.setup_ui()
+        startup_timing.marcar("ventana principal")
 
     def setup_ui(self):
         """Configura la interfaz gráfica"""
@@ -34,26 +50,72 @@ class HorarioApp(QMainWindow):
         # Crear las pestañas
         self.create_tabs()
 
+        # Panel de diagnóstico de rendimiento, sin entrada en la interfaz
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.mostrar_diagnostico)
+
     def create_tabs(self):
-        """Crea todas las pestañas de la aplicación"""
-        # Pestaña de Profesores
-        self.tabs.addTab(ProfesoresTab(self.model_manager, self.db_manager.get_connection()), "Profesores")
-        
-        # Agregar las demás pestañas
-        self.tabs.addTab(AsignaturasTab(self.model_manager, self.db_manager.get_connection()), "Asignaturas")
-        self.tabs.addTab(GruposTab(self.model_manager, self.db_manager.get_connection()), "Secciones")
-        self.tabs.addTab(AulasTab(self.model_manager, self.db_manager.get_connection()), "Aulas")
-        self.tabs.addTab(HorariosTab(self.model_manager, self.db_manager.get_connection()), "Horarios")
+        """Crea las pestañas de la aplicación; el contenido de cada una se construye al mostrarla"""
+        db = self.db_manager.get_connection()
+        pool = self.db_manager.get_pool()
+        self.horarios_tab = None
+
+        pestanas = [
+            ("Profesores", lambda: ProfesoresTab(self.model_manager, db, pool)),
+            ("Asignaturas", lambda: AsignaturasTab(self.model_manager, db)),
+            ("Secciones", lambda: GruposTab(self.model_manager, db, pool)),
+            ("Aulas", lambda: AulasTab(self.model_manager, db, pool)),
+            ("Horarios", self.crear_horarios_tab),
+            # Pestaña de carga académica y generación automática
+            ("Carga Académica", lambda: CargaTab(self.model_manager, db)),
+        ]
+        for titulo, fabrica in pestanas:
+            self.tabs.addTab(LazyTab(fabrica), titulo)
+
+        self.tabs.currentChanged.connect(self.mostrar_tab)
+        self.mostrar_tab(self.tabs.currentIndex())
+
+    def mostrar_tab(self, index):
+        """Construye el contenido de la pestaña la primera vez que se selecciona"""
+        tab = self.tabs.widget(index)
+        if tab is not None:
+            tab.crear()
+
+    def crear_horarios_tab(self):
+        self.horarios_tab = HorariosTab(self.model_manager, self.db_manager.get_connection(),
+                                        self.db_manager.get_pool())
+        return self.horarios_tab
+
+    def mostrar_diagnostico(self):
+        from ui.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self).exec_()
 
     def closeEvent(self, event):
         """Maneja el evento de cierre de la aplicación"""
         self.db_manager.close()
         event.accept()
 
+def _opcion(nombre):
+    """Retorna el valor de una opción "--nombre valor" de la línea de comandos, o None"""
+    if nombre in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(nombre) + 1]
+    return None
+
 def main():
+    # Necesario para el modo paralelo del generador en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
+    # Los tiempos de consultas, modelos y reportes se ven con Ctrl+Shift+D; con
+    # --metricas ARCHIVO también se escriben en el archivo a medida que ocurren
+    metrics.instrumentar_consultas()
+    ruta_metricas = _opcion("--metricas")
+    if ruta_metricas:
+        metrics.registrar_en_archivo(ruta_metricas)
     app = QApplication(sys.argv)
+    startup_timing.marcar("QApplication")
     window = HorarioApp()
     window.show()
+    if startup_timing.medidor is not None:
+        # Se informa cuando el ciclo de eventos procesa la primera pintura de la ventana
+        QTimer.singleShot(0, startup_timing.terminar)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -0,0 +1,23 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Operaciones que se publican en el bus
+INSERTAR = "insertar"
+ACTUALIZAR = "actualizar"
+ELIMINAR = "eliminar"
+RECARGAR = "recargar"   # Cambios masivos (importación, generador automático), sin detallar los ids
+
+# Tablas de catálogo que muestran otras pestañas en sus combos y tablas
+CATALOGOS = ("Profesores", "Asignaturas", "Grupos", "Aulas")
+
+class ChangeBus(QObject):
+    """Avisa a los modelos y pestañas de los cambios hechos en la base de datos
+
+    Quien escribe publica la tabla, la operación y los ids afectados, y cada
+    suscriptor aplica sólo esas filas en lugar de volver a consultar la tabla
+    completa. El origen permite ignorar los cambios que un modelo ya aplicó.
+    """
+
+    cambio = pyqtSignal(str, str, list, object)   # tabla, operación, ids, origen
+
+    def publicar(self, tabla, operacion=RECARGAR, ids=(), origen=None):
+        self.cambio.emit(tabla, operacion, list(ids), origen)
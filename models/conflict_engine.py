@@ -0,0 +1,194 @@
+import csv
+import heapq
+from collections import namedtuple
+from itertools import groupby
+from operator import itemgetter
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from utils.time_utils import minutos_a_texto
+
+# Recursos que no pueden estar en dos clases a la vez
+RECURSOS = ("profesor", "aula", "grupo")
+CAPACIDAD = "capacidad"
+
+# Sujeto de los mensajes de cada tipo de conflicto
+SUJETOS = {"profesor": "El profesor", "aula": "El aula", "grupo": "La sección"}
+
+# Encabezado de cada tipo de conflicto en la auditoría
+TITULOS = {
+    "profesor": "Profesor ocupado dos veces",
+    "aula": "Aula ocupada dos veces",
+    "grupo": "Sección ocupada dos veces",
+    CAPACIDAD: "Sección más grande que el aula",
+}
+
+DESCRIPCIONES_POR_CONSULTA = 500   # Horarios que se describen con cada consulta
+
+# Horario que se quiere agregar. La clave lo identifica en el resultado
+# (una línea del archivo, una sesión del generador, etc.)
+Propuesta = namedtuple("Propuesta", "clave id_profesor id_aula id_grupo id_dia inicio fin")
+
+# Un conflicto de la propuesta con clave: con el horario existente id_horario,
+# con la propuesta de clave otra, o (tipo CAPACIDAD) entre su aula y su sección
+Conflicto = namedtuple("Conflicto", "tipo clave id_horario otra")
+
+def describir(conflicto):
+    """Retorna el conflicto como texto para el usuario"""
+    if conflicto.tipo == CAPACIDAD:
+        return "La sección tiene más estudiantes que la capacidad del aula"
+    return f"{SUJETOS[conflicto.tipo]} ya tiene clase en ese horario"
+
+def solapamientos(intervalos):
+    """Retorna los pares (clave, otra) de intervalos que se solapan
+
+    Recibe (inicio, fin, clave) ordenados por inicio. Es un barrido: se
+    mantienen en un heap, por hora de fin, los intervalos que siguen
+    abiertos, y cada intervalo nuevo se solapa exactamente con ellos.
+    O(n log n + pares encontrados).
+    """
+    abiertos = []
+    pares = []
+    for n, (inicio, fin, clave) in enumerate(intervalos):
+        while abiertos and abiertos[0][0] <= inicio:
+            heapq.heappop(abiertos)
+        for _, _, otra in abiertos:
+            pares.append((otra, clave))
+        heapq.heappush(abiertos, (fin, n, clave))   # n desempata sin comparar claves
+    return pares
+
+class ConflictEngine:
+    """Verifica en una sola pasada un lote de horarios propuestos
+
+    Detecta los choques de profesor, aula y sección de cada propuesta con
+    los horarios del índice y con las demás propuestas, y las secciones con
+    más estudiantes que la capacidad del aula. Sólo se recorren los
+    recursos y días que aparecen en el lote.
+    """
+
+    def __init__(self, indice, capacidades=None, estudiantes=None):
+        self.indice = indice                    # ConflictIndex con los horarios existentes
+        self.capacidades = capacidades or {}    # id_aula -> capacidad
+        self.estudiantes = estudiantes or {}    # id_grupo -> estudiantes
+
+    def cargar_capacidades(self, db):
+        """Lee la capacidad de las aulas y el tamaño de las secciones"""
+        self.capacidades = self._leer(db, queries.AULAS_CAPACIDAD)
+        self.estudiantes = self._leer(db, queries.GRUPOS_ESTUDIANTES)
+
+    def _leer(self, db, sql):
+        valores = {}
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        if query.exec_(sql):
+            while query.next():
+                if isinstance(query.value(1), int):
+                    valores[query.value(0)] = query.value(1)
+        return valores
+
+    def excede_capacidad(self, id_aula, id_grupo):
+        capacidad = self.capacidades.get(id_aula)
+        estudiantes = self.estudiantes.get(id_grupo)
+        return capacidad is not None and estudiantes is not None and estudiantes > capacidad
+
+    def verificar(self, propuestas, excluir=()):
+        """Retorna la lista de Conflicto del lote
+
+        Los horarios existentes con id en excluir no cuentan, por ejemplo el
+        que se está modificando. Los choques entre horarios existentes no se
+        informan: son los de una auditoría de toda la base de datos.
+        """
+        excluir = set(excluir)
+        conflictos = []
+        grupos = {}
+        for propuesta in propuestas:
+            for recurso, id_recurso in zip(RECURSOS, (propuesta.id_profesor, propuesta.id_aula,
+                                                      propuesta.id_grupo)):
+                grupos.setdefault((recurso, id_recurso, propuesta.id_dia), []).append(propuesta)
+            if self.excede_capacidad(propuesta.id_aula, propuesta.id_grupo):
+                conflictos.append(Conflicto(CAPACIDAD, propuesta.clave, None, None))
+
+        for clave, lote in grupos.items():
+            # Las propuestas se marcan con True y los horarios existentes con False
+            intervalos = [(p.inicio, p.fin, (True, p.clave)) for p in lote]
+            intervalos += [(inicio, fin, (False, id_horario))
+                           for inicio, fin, id_horario in self.indice.intervalos.get(clave, ())
+                           if id_horario not in excluir]
+            intervalos.sort(key=lambda intervalo: intervalo[0])
+            for (nueva_a, a), (nueva_b, b) in solapamientos(intervalos):
+                if nueva_a and nueva_b:
+                    conflictos.append(Conflicto(clave[0], a, None, b))
+                    conflictos.append(Conflicto(clave[0], b, None, a))
+                elif nueva_a:
+                    conflictos.append(Conflicto(clave[0], a, b, None))
+                elif nueva_b:
+                    conflictos.append(Conflicto(clave[0], b, a, None))
+        return conflictos
+
+def auditar(db):
+    """Busca los conflictos entre todos los horarios guardados
+
+    Lee la tabla Horarios una sola vez, la ordena por profesor, aula y
+    sección (y día y hora de inicio) y barre cada grupo con solapamientos:
+    O(n log n) en total. Encuentra también los choques que no pasaron por
+    las verificaciones, p. ej. de bases de datos anteriores a ellas.
+
+    Retorna Conflicto(tipo, id_horario, id_otro, None) por cada par, con
+    id_horario < id_otro, y Conflicto(CAPACIDAD, id_horario, None, None)
+    por cada clase cuya sección no cabe en el aula.
+    """
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    if not query.exec_(queries.HORARIOS_INTERVALOS):
+        raise RuntimeError(f"Error al leer los horarios: {query.lastError().text()}")
+    # (id_horario, id_profesor, id_aula, id_grupo, id_dia, inicio, fin)
+    filas = []
+    while query.next():
+        filas.append(tuple(query.value(i) for i in range(7)))
+
+    motor = ConflictEngine(None)
+    motor.cargar_capacidades(db)
+    conflictos = [Conflicto(CAPACIDAD, fila[0], None, None) for fila in filas
+                  if motor.excede_capacidad(fila[2], fila[3])]
+
+    for posicion, recurso in enumerate(RECURSOS, start=1):
+        filas.sort(key=itemgetter(posicion, 4, 5))
+        for _, grupo in groupby(filas, key=itemgetter(posicion, 4)):
+            for a, b in solapamientos([(fila[5], fila[6], fila[0]) for fila in grupo]):
+                conflictos.append(Conflicto(recurso, min(a, b), max(a, b), None))
+    conflictos.sort(key=lambda c: (c.clave, c.id_horario or 0, c.tipo))
+    return conflictos
+
+def describir_horarios(db, ids):
+    """Retorna {id_horario: "día hora asignatura (sección, profesor, aula)"}"""
+    ids = list(dict.fromkeys(ids))
+    descripciones = {}
+    for desde in range(0, len(ids), DESCRIPCIONES_POR_CONSULTA):
+        lote = ids[desde:desde + DESCRIPCIONES_POR_CONSULTA]
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        query.prepare(queries.horarios_descripcion(len(lote)))
+        for id_horario in lote:
+            query.addBindValue(id_horario)
+        if not query.exec_():
+            continue
+        while query.next():
+            descripciones[query.value(0)] = (
+                f"{query.value(5)} {minutos_a_texto(query.value(6))}-{minutos_a_texto(query.value(7))} "
+                f"{query.value(2)} ({query.value(3)}, {query.value(1)}, {query.value(4)})")
+    return descripciones
+
+def filas_auditoria(db, conflictos):
+    """Retorna (tipo, horario, otro horario) como texto por cada conflicto de auditar"""
+    descripciones = describir_horarios(db, [c.clave for c in conflictos] +
+                                       [c.id_horario for c in conflictos if c.id_horario is not None])
+    return [(TITULOS[c.tipo],
+             descripciones.get(c.clave, f"horario {c.clave}"),
+             "" if c.id_horario is None else descripciones.get(c.id_horario, f"horario {c.id_horario}"))
+            for c in conflictos]
+
+def exportar_auditoria(ruta, filas):
+    """Guarda las filas de filas_auditoria en un archivo CSV"""
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["conflicto", "horario", "otro_horario"])
+        escritor.writerows(filas)
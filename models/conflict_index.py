@@ -0,0 +1,104 @@
+from bisect import bisect_left, insort
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+
+class ConflictIndex:
+    """Índice en memoria de los intervalos ocupados por profesor, aula y sección en cada día"""
+
+    def __init__(self):
+        # (recurso, id, id_dia) -> lista ordenada de (inicio, fin, id_horario)
+        self.intervalos = {}
+        # (recurso, id, id_dia) -> duración máxima registrada, acota la búsqueda hacia atrás
+        self.duracion_max = {}
+        # id_horario -> (id_profesor, id_aula, id_grupo, id_dia, inicio, fin)
+        self.horarios = {}
+        # (recurso, id, id_dia) -> número de cambios, para invalidar lo calculado a partir de la lista
+        self.versiones = {}
+        self.recargas = 0   # Veces que se leyó la tabla completa
+
+    def cargar(self, db):
+        """Construye el índice a partir de la tabla Horarios"""
+        self.intervalos.clear()
+        self.duracion_max.clear()
+        self.horarios.clear()
+        self.versiones.clear()
+        self.recargas += 1
+
+        query = QSqlQuery(db)
+        if not query.exec_(queries.HORARIOS_INTERVALOS):
+            return False
+
+        while query.next():
+            self.agregar(query.value(0), query.value(1), query.value(2), query.value(3),
+                         query.value(4), query.value(5), query.value(6))
+        return True
+
+    def recargar_horario(self, db, id_horario):
+        """Sincroniza un único horario con su estado actual en la base de datos"""
+        self.eliminar(id_horario)
+
+        query = QSqlQuery(db)
+        query.prepare(queries.HORARIO_INTERVALO)
+        query.addBindValue(id_horario)
+        if query.exec_() and query.next():
+            self.agregar(id_horario, query.value(0), query.value(1), query.value(2),
+                         query.value(3), query.value(4), query.value(5))
+
+    def _claves(self, id_profesor, id_aula, id_grupo, id_dia):
+        return (("profesor", id_profesor, id_dia),
+                ("aula", id_aula, id_dia),
+                ("grupo", id_grupo, id_dia))
+
+    def agregar(self, id_horario, id_profesor, id_aula, id_grupo, id_dia, inicio, fin):
+        """Registra un horario en el índice, con las horas en minutos desde la medianoche"""
+        if id_horario in self.horarios:
+            self.eliminar(id_horario)
+
+        self.horarios[id_horario] = (id_profesor, id_aula, id_grupo, id_dia, inicio, fin)
+
+        for clave in self._claves(id_profesor, id_aula, id_grupo, id_dia):
+            insort(self.intervalos.setdefault(clave, []), (inicio, fin, id_horario))
+            self.duracion_max[clave] = max(self.duracion_max.get(clave, 0), fin - inicio)
+            self.versiones[clave] = self.versiones.get(clave, 0) + 1
+
+    def eliminar(self, id_horario):
+        """Quita un horario del índice"""
+        datos = self.horarios.pop(id_horario, None)
+        if datos is None:
+            return
+
+        id_profesor, id_aula, id_grupo, id_dia, inicio, fin = datos
+        for clave in self._claves(id_profesor, id_aula, id_grupo, id_dia):
+            lista = self.intervalos.get(clave, [])
+            pos = bisect_left(lista, (inicio, fin, id_horario))
+            if pos < len(lista) and lista[pos] == (inicio, fin, id_horario):
+                del lista[pos]
+                self.versiones[clave] = self.versiones.get(clave, 0) + 1
+
+    def version(self, clave):
+        """Retorna un valor que cambia cada vez que cambian los intervalos de la clave"""
+        return (self.recargas, self.versiones.get(clave, 0))
+
+    def solapados(self, recurso, id_recurso, id_dia, inicio, fin, excluir=None):
+        """Retorna los id_horario del recurso que se solapan con el intervalo dado"""
+        clave = (recurso, id_recurso, id_dia)
+        lista = self.intervalos.get(clave)
+        if not lista:
+            return []
+
+        # Sólo pueden solaparse los intervalos que empiezan después de
+        # inicio - duracion_max y antes de fin
+        desde = bisect_left(lista, (inicio - self.duracion_max[clave] + 1,))
+        hasta = bisect_left(lista, (fin,))
+
+        return [id_horario for ini, fi, id_horario in lista[desde:hasta]
+                if fi > inicio and id_horario != excluir]
+
+    def hay_conflicto(self, id_dia, inicio, fin, id_profesor=None, id_aula=None,
+                      id_grupo=None, excluir=None):
+        """Indica si alguno de los recursos indicados está ocupado en el intervalo"""
+        for recurso, id_recurso in (("profesor", id_profesor), ("aula", id_aula), ("grupo", id_grupo)):
+            if id_recurso is not None and self.solapados(recurso, id_recurso, id_dia,
+                                                         inicio, fin, excluir):
+                return True
+        return False
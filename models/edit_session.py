@@ -0,0 +1,156 @@
+from collections import namedtuple
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from models.change_bus import INSERTAR, ACTUALIZAR, ELIMINAR
+from models.journal import ErrorDiario
+
+IDS_POR_CONSULTA = 500   # Ids de cada consulta de dependencias
+
+# {id a eliminar: [id_horario]} y {id a eliminar: [id_carga]} de las bajas que tienen filas asignadas
+Dependencias = namedtuple("Dependencias", "horarios cargas")
+
+class ErrorEdicion(Exception):
+    """La sesión no se puede guardar; se deshace la transacción"""
+
+class EditSession:
+    """Altas, cambios y bajas de un catálogo que se guardan juntos en una sola transacción
+
+    Se obtiene con ModelManager.sesion(tabla). Los cambios se acumulan en
+    memoria y confirmar() los escribe dentro de una transacción, con un solo
+    fsync aunque sean cientos de filas, y publica en el bus un aviso por
+    operación: los modelos y combos se actualizan una sola vez.
+
+    Antes de las bajas se buscan los horarios y las cargas académicas que
+    quedarían apuntando a las filas eliminadas.
+    """
+
+    def __init__(self, db, bus, tabla, diario=None):
+        self.db = db
+        self.bus = bus
+        self.tabla = tabla
+        self.diario = diario    # ChangeJournal, para registrar los horarios eliminados en cascada
+        self.altas = []      # {columna: valor} de cada fila nueva
+        self.cambios = {}    # id -> {columna: valor nuevo}
+        self.bajas = []      # ids a eliminar
+
+    def insertar(self, valores):
+        self.altas.append(dict(valores))
+
+    def actualizar(self, id_, valores):
+        self.cambios.setdefault(id_, {}).update(valores)
+
+    def eliminar(self, ids):
+        for id_ in ids:
+            if id_ not in self.bajas:
+                self.bajas.append(id_)
+            self.cambios.pop(id_, None)
+
+    def dependencias(self):
+        """Retorna las Dependencias de las bajas en Horarios y CargaAcademica"""
+        cargas = {}
+        if self.tabla in queries.CATALOGOS_CARGA:
+            cargas = self._buscar(queries.cargas_de_catalogo)
+        return Dependencias(self._buscar(queries.horarios_de_catalogo), cargas)
+
+    def _buscar(self, consulta):
+        """Retorna {id a eliminar: [id de la fila que lo referencia]} con consulta(tabla, cantidad)"""
+        dependencias = {}
+        for desde in range(0, len(self.bajas), IDS_POR_CONSULTA):
+            lote = self.bajas[desde:desde + IDS_POR_CONSULTA]
+            query = QSqlQuery(self.db)
+            query.setForwardOnly(True)
+            query.prepare(consulta(self.tabla, len(lote)))
+            for id_ in lote:
+                query.addBindValue(id_)
+            if not query.exec_():
+                raise ErrorEdicion(query.lastError().text())
+            while query.next():
+                dependencias.setdefault(query.value(0), []).append(query.value(1))
+        return dependencias
+
+    def confirmar(self, cascada=False):
+        """Guarda todos los cambios; retorna el error o None
+
+        Si alguna baja tiene horarios o cargas académicas asignados no se
+        guarda nada, salvo con cascada=True, que los elimina también en la
+        misma transacción. Así ninguna fila queda apuntando a una eliminada.
+        """
+        if not (self.altas or self.cambios or self.bajas):
+            return None
+
+        try:
+            with pool_de(self.db).transaccion():
+                insertados, horarios = self._escribir(cascada)
+        except (ErrorEdicion, ErrorDiario, RuntimeError) as e:
+            return str(e)
+
+        if horarios:
+            self.bus.publicar("Horarios", ELIMINAR, horarios)
+        for operacion, ids in ((INSERTAR, insertados), (ACTUALIZAR, list(self.cambios)),
+                               (ELIMINAR, self.bajas)):
+            if ids:
+                self.bus.publicar(self.tabla, operacion, ids)
+        self.altas, self.cambios, self.bajas = [], {}, []
+        return None
+
+    def _escribir(self, cascada):
+        """Ejecuta la sesión dentro de la transacción; retorna (ids insertados, id_horario eliminados)"""
+        horarios = []
+        if self.bajas:
+            dependencias = self.dependencias()
+            asignadas = set(dependencias.horarios) | set(dependencias.cargas)
+            if asignadas and not cascada:
+                raise ErrorEdicion(f"{len(asignadas)} de las filas a eliminar tienen horarios "
+                                   "o cargas académicas asignados")
+            horarios = [id_horario for ids in dependencias.horarios.values() for id_horario in ids]
+            cargas = [id_carga for ids in dependencias.cargas.values() for id_carga in ids]
+            self._registrar_horarios(horarios)
+            self._ejecutar_lote(queries.ELIMINAR_HORARIO, [horarios])
+            self._ejecutar_lote(queries.ELIMINAR_CARGA, [cargas])
+            self._ejecutar_lote(queries.eliminar_catalogo(self.tabla), [self.bajas])
+
+        for id_, valores in self.cambios.items():
+            self._ejecutar(queries.actualizar_catalogo(self.tabla, list(valores)), list(valores.values()) + [id_])
+
+        insertados = []
+        for valores in self.altas:
+            query = self._ejecutar(queries.insertar_catalogo(self.tabla, list(valores)), list(valores.values()))
+            insertados.append(query.lastInsertId())
+        return insertados, horarios
+
+    def _registrar_horarios(self, horarios):
+        """Registra en el diario, como una sola acción, los horarios que se eliminan en cascada
+
+        Así deshacer las acciones anteriores no los encuentra cambiados sin
+        explicación; deshacer esta avisa que sus catálogos ya no existen.
+        """
+        if self.diario is None or not horarios:
+            return
+        cambios = []
+        for desde in range(0, len(horarios), IDS_POR_CONSULTA):
+            lote = horarios[desde:desde + IDS_POR_CONSULTA]
+            query = self._ejecutar(queries.horarios_pagina(len(lote)), lote)
+            while query.next():
+                cambios.append((query.value(0), tuple(query.value(i) for i in range(1, 8)), None))
+        self.diario.registrar(f"Eliminar filas de {self.tabla} y sus {len(cambios)} horarios",
+                              cambios)
+
+    def _ejecutar(self, sql, valores):
+        query = QSqlQuery(self.db)
+        query.prepare(sql)
+        for valor in valores:
+            query.addBindValue(valor)
+        if not query.exec_():
+            raise ErrorEdicion(query.lastError().text())
+        return query
+
+    def _ejecutar_lote(self, sql, columnas):
+        if not columnas[0]:
+            return
+        query = QSqlQuery(self.db)
+        query.prepare(sql)
+        for columna in columnas:
+            query.addBindValue(list(columna))
+        if not query.execBatch():
+            raise ErrorEdicion(query.lastError().text())
@@ -0,0 +1,72 @@
+HORA_INICIO = 7 * 60    # 7:00 AM, igual que el calendario y el generador
+HORA_FIN = 18 * 60      # 6:00 PM
+
+def complemento(ocupados, inicio=HORA_INICIO, fin=HORA_FIN):
+    """Retorna los intervalos libres entre inicio y fin, dados los ocupados ordenados por inicio"""
+    libres = []
+    desde = inicio
+    for ini, fi, *_ in ocupados:
+        if ini >= fin:
+            break
+        if ini > desde:
+            libres.append((desde, ini))
+        desde = max(desde, fi)
+    if desde < fin:
+        libres.append((desde, fin))
+    return libres
+
+def interseccion(a, b):
+    """Intersección de dos listas ordenadas de intervalos disjuntos, en una sola pasada"""
+    resultado = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        inicio = max(a[i][0], b[j][0])
+        fin = min(a[i][1], b[j][1])
+        if inicio < fin:
+            resultado.append((inicio, fin))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return resultado
+
+class FreeSlotFinder:
+    """Busca los horarios libres comunes a un profesor, una sección y, opcionalmente, un aula
+
+    Los tiempos libres de cada recurso y día (el complemento de sus clases
+    dentro de la jornada) se guardan en caché y se reutilizan mientras sus
+    intervalos no cambien en el índice de conflictos, que el modelo de
+    horarios mantiene al día con los cambios publicados en el bus.
+    """
+
+    def __init__(self, indice, inicio=HORA_INICIO, fin=HORA_FIN):
+        self.indice = indice
+        self.inicio = inicio
+        self.fin = fin
+        self._libres = {}   # (recurso, id, id_dia) -> (versión del índice, intervalos libres)
+
+    def libres(self, recurso, id_recurso, id_dia):
+        """Retorna los intervalos libres del recurso en el día"""
+        clave = (recurso, id_recurso, id_dia)
+        version = self.indice.version(clave)
+        guardado = self._libres.get(clave)
+        if guardado is None or guardado[0] != version:
+            guardado = (version, complemento(self.indice.intervalos.get(clave, ()), self.inicio, self.fin))
+            self._libres[clave] = guardado
+        return guardado[1]
+
+    def buscar(self, dias, duracion, id_profesor, id_grupo, id_aula=None):
+        """Retorna {id_dia: [(inicio, fin)]} con los intervalos libres de al menos duracion minutos"""
+        recursos = [("profesor", id_profesor), ("grupo", id_grupo)]
+        if id_aula is not None:
+            recursos.append(("aula", id_aula))
+
+        resultado = {}
+        for id_dia in dias:
+            libres = [(self.inicio, self.fin)]
+            for recurso, id_recurso in recursos:
+                libres = interseccion(libres, self.libres(recurso, id_recurso, id_dia))
+                if not libres:
+                    break
+            resultado[id_dia] = [(inicio, fin) for inicio, fin in libres if fin - inicio >= duracion]
+        return resultado
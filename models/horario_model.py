@@ -0,0 +1,347 @@
+from bisect import bisect_left
+from PyQt5.QtCore import Qt, QTime, QAbstractTableModel, QModelIndex
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from models.change_bus import INSERTAR, ACTUALIZAR, ELIMINAR
+from models.journal import ErrorDiario
+from utils.metrics import medido, MODELO
+from utils.time_utils import minutos_a_texto
+
+ENCABEZADOS = ["ID", "Profesor", "Asignatura", "Sección", "Aula", "Día", "Hora Inicio", "Hora Fin"]
+COLUMNAS_HORA = (6, 7)
+
+# Catálogo que da el nombre mostrado en cada columna; las filas de una
+# página traen las claves foráneas en la misma posición que la columna
+CATALOGO_DE_COLUMNA = {1: "Profesores", 2: "Asignaturas", 3: "Grupos", 4: "Aulas", 5: "DiasSemana"}
+
+# Columnas de Horarios por las que se puede filtrar la tabla
+FILTROS = queries.FILTROS_HORARIOS
+POSICION_FILTRO = {"id_profesor": 1, "id_grupo": 3, "id_aula": 4, "id_dia": 5}
+
+FILAS_POR_PAGINA = 200
+FILAS_EN_CACHE = 5000
+FILAS_POR_CONSULTA = 500     # Filas que se leen con cada consulta por id_horario
+
+class HorarioModel(QAbstractTableModel):
+    """Modelo virtual de la tabla de horarios, leído por páginas
+
+    Sólo se mantiene en memoria la lista ordenada de id_horario que cumplen
+    los filtros; el filtro y el orden los resuelve SQLite con los índices
+    por recurso. Las filas se leen por su clave primaria, una página a la
+    vez, cuando la vista las pide, y los nombres de profesores, asignaturas,
+    etc. salen de los mapas id -> nombre de la ReferenceCache compartida.
+
+    Los cambios publicados en el bus se aplican sólo a las filas afectadas,
+    y el índice de conflictos se mantiene sincronizado con ellos. Con un
+    ChangeJournal, cada cambio se registra en la misma transacción para
+    poder deshacerlo.
+    """
+
+    def __init__(self, db, conflict_index, bus, referencias, diario=None):
+        super().__init__()
+        self.db = db
+        self.conflict_index = conflict_index
+        self.bus = bus
+        self.referencias = referencias
+        self.diario = diario
+        self.ids = []        # id_horario de cada fila, en el orden de la tabla
+        self.filas = {}      # id_horario -> valores de la página leída (ver HORARIO_FILA)
+        self.filtros = {}    # columna de Horarios -> id requerido
+        self.orden = (0, Qt.AscendingOrder)
+        self.bus.cambio.connect(self.aplicar_cambio)
+
+    def _leer_ids(self):
+        """Retorna los id_horario que cumplen los filtros, en el orden actual"""
+        columna, orden = self.orden
+        query = QSqlQuery(self.db)
+        query.prepare(queries.ids_horarios(columna, orden == Qt.DescendingOrder, list(self.filtros)))
+        for valor in self.filtros.values():
+            query.addBindValue(valor)
+        if not query.exec_() or not query.next() or not query.value(0):
+            return []
+        return [int(id_horario) for id_horario in query.value(0).split(",")]
+
+    @medido(MODELO, "Horarios: página")
+    def _leer_filas(self, ids):
+        """Retorna {id_horario: fila} de esos ids, en lotes para no exceder los parámetros de SQLite"""
+        ids = list(ids)
+        filas = {}
+        for desde in range(0, len(ids), FILAS_POR_CONSULTA):
+            lote = ids[desde:desde + FILAS_POR_CONSULTA]
+            query = QSqlQuery(self.db)
+            query.setForwardOnly(True)
+            query.prepare(queries.horarios_pagina(len(lote)))
+            for id_horario in lote:
+                query.addBindValue(id_horario)
+            if query.exec_():
+                while query.next():
+                    filas[query.value(0)] = tuple(query.value(i) for i in range(8))
+        return filas
+
+    @medido(MODELO, "Horarios: cargar")
+    def cargar(self):
+        """Vuelve a consultar qué filas se muestran; al crear el modelo, filtrar u ordenar"""
+        self.beginResetModel()
+        self.ids = self._leer_ids()
+        self.filas = {}
+        self.endResetModel()
+
+    def filtrar(self, filtros):
+        """Muestra sólo los horarios con los ids indicados, p. ej. {"id_profesor": 3}; None no filtra"""
+        filtros = {columna: valor for columna, valor in filtros.items()
+                   if columna in FILTROS and valor is not None}
+        if filtros == self.filtros:
+            # Los combos avisan también cuando su elemento sólo cambia de fila
+            return
+        self.filtros = filtros
+        self.cargar()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.orden = (column, order)
+        self.cargar()
+
+    def _fila(self, row):
+        """Retorna los valores de la fila, leyendo su página si no está en memoria"""
+        id_horario = self.ids[row]
+        fila = self.filas.get(id_horario)
+        if fila is None:
+            if len(self.filas) >= FILAS_EN_CACHE:
+                self.filas = {}
+            inicio = row - row % FILAS_POR_PAGINA
+            self.filas.update(self._leer_filas(self.ids[inicio:inicio + FILAS_POR_PAGINA]))
+            fila = self.filas.get(id_horario)
+        return fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ENCABEZADOS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        """Sólo las horas se editan en la tabla; lo demás se cambia eliminando y agregando"""
+        flags = super().flags(index)
+        if index.column() in COLUMNAS_HORA:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Muestra los nombres de cada catálogo y las horas, guardadas en minutos, en formato 12h"""
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        fila = self._fila(index.row())
+        if fila is None:
+            return None
+        valor = fila[index.column()]
+        if index.column() in CATALOGO_DE_COLUMNA:
+            return self.referencias.nombres(CATALOGO_DE_COLUMNA[index.column()]).get(valor, "")
+        if index.column() in COLUMNAS_HORA:
+            if role == Qt.DisplayRole:
+                return minutos_a_texto(valor)
+            return QTime(valor // 60, valor % 60)
+        return valor
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """Cambia la hora de inicio o de fin si el horario sigue sin conflictos"""
+        if role != Qt.EditRole or index.column() not in COLUMNAS_HORA or not isinstance(value, QTime):
+            return False
+
+        id_horario, id_profesor, _, id_grupo, id_aula, id_dia, inicio, fin = self._fila(index.row())
+        if index.column() == 6:
+            inicio = value.hour() * 60 + value.minute()
+        else:
+            fin = value.hour() * 60 + value.minute()
+        if inicio >= fin or self.conflict_index.hay_conflicto(id_dia, inicio, fin, id_profesor=id_profesor,
+                                                              id_aula=id_aula, id_grupo=id_grupo,
+                                                              excluir=id_horario):
+            return False
+
+        antes = self._fila(index.row())[1:]
+        despues = antes[:5] + (inicio, fin)
+        query = QSqlQuery(self.db)
+        query.prepare(queries.ACTUALIZAR_HORAS)
+        query.addBindValue(inicio)
+        query.addBindValue(fin)
+        query.addBindValue(id_horario)
+        try:
+            with pool_de(self.db).transaccion():
+                self._ejecutar(query)
+                self._registrar(f"Cambiar hora de {self._describir(despues)}", [(id_horario, antes, despues)])
+        except (RuntimeError, ErrorDiario):
+            return False
+        self.bus.publicar("Horarios", ACTUALIZAR, [id_horario], self)
+        return True
+
+    def id_horario(self, row):
+        return self.ids[row]
+
+    def _describir(self, valores):
+        """Describe una clase (valores de INSERTAR_HORARIO) para el diario de cambios"""
+        asignatura = self.referencias.nombres("Asignaturas").get(valores[1], "")
+        grupo = self.referencias.nombres("Grupos").get(valores[2], "")
+        dia = self.referencias.nombres("DiasSemana").get(valores[4], "")
+        return f"{asignatura} ({grupo}) el {dia} {minutos_a_texto(valores[5])}"
+
+    def _registrar(self, descripcion, cambios):
+        """Registra los cambios en el diario, si lo hay; lanza ErrorDiario si no se pudo"""
+        if self.diario is not None:
+            self.diario.registrar(descripcion, cambios)
+
+    def _ejecutar(self, query, lote=False):
+        if not (query.execBatch() if lote else query.exec_()):
+            raise RuntimeError(query.lastError().text())
+
+    def agregar(self, id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin):
+        """Inserta un horario; retorna el mensaje de error de la base de datos o None"""
+        valores = (id_profesor, id_asignatura, id_grupo, id_aula, id_dia, hora_inicio, hora_fin)
+        query = QSqlQuery(self.db)
+        query.prepare(queries.INSERTAR_HORARIO)
+        for valor in valores:
+            query.addBindValue(valor)
+        try:
+            with pool_de(self.db).transaccion():
+                self._ejecutar(query)
+                self._registrar(f"Agregar {self._describir(valores)}", [(query.lastInsertId(), None, valores)])
+        except (RuntimeError, ErrorDiario) as e:
+            return str(e)
+        self.bus.publicar("Horarios", INSERTAR, [query.lastInsertId()], self)
+        return None
+
+    def eliminar(self, ids):
+        """Elimina los horarios indicados en una sola transacción; retorna el error o None"""
+        query = QSqlQuery(self.db)
+        query.prepare(queries.ELIMINAR_HORARIO)
+        query.addBindValue(list(ids))
+        # Los valores eliminados se guardan en el diario para poder restaurarlos
+        filas = self._leer_filas(ids) if self.diario is not None else {}
+        cambios = [(id_horario, fila[1:], None) for id_horario, fila in filas.items()]
+        descripcion = (f"Eliminar {self._describir(cambios[0][1])}" if len(cambios) == 1
+                       else f"Eliminar {len(cambios)} horarios")
+        try:
+            with pool_de(self.db).transaccion():
+                self._ejecutar(query, lote=True)
+                self._registrar(descripcion, cambios)
+        except (RuntimeError, ErrorDiario) as e:
+            return str(e)
+        self.bus.publicar("Horarios", ELIMINAR, ids, self)
+        return None
+
+    def aplicar_cambio(self, tabla, operacion, ids, origen):
+        """Aplica a las filas y al índice de conflictos un cambio publicado en el bus"""
+        columnas = [c for c, catalogo in CATALOGO_DE_COLUMNA.items() if catalogo == tabla]
+        if columnas:
+            self._catalogo_cambiado(tabla, operacion, columnas[0])
+            return
+        if tabla != "Horarios":
+            return
+
+        if operacion not in (INSERTAR, ACTUALIZAR, ELIMINAR):
+            self.conflict_index.cargar(self.db)
+            self.cargar()
+            return
+
+        leidas = self._leer_filas(ids) if operacion != ELIMINAR else {}
+        for id_horario in ids:
+            fila = leidas.get(id_horario)
+            if fila is None:
+                self.conflict_index.eliminar(id_horario)
+            else:
+                self.conflict_index.agregar(id_horario, fila[1], fila[4], fila[3], fila[5], fila[6], fila[7])
+            self.filas.pop(id_horario, None)
+        self.filas.update(leidas)
+
+        visibles = {id_horario for id_horario, fila in leidas.items() if self._cumple_filtros(fila)}
+        for id_horario in ids:
+            if id_horario not in visibles:
+                self._quitar(id_horario)
+        if operacion == ACTUALIZAR:
+            self._actualizar(visibles)
+        self._insertar(visibles)
+
+    def _cumple_filtros(self, fila):
+        return all(fila[POSICION_FILTRO[columna]] == valor for columna, valor in self.filtros.items())
+
+    def _ordenado_por_id(self):
+        """Indica si la lista de ids está en orden ascendente y se puede buscar por bisección"""
+        return self.orden == (0, Qt.AscendingOrder)
+
+    def _posicion(self, id_horario):
+        """Retorna la fila que muestra el horario, o None"""
+        if self._ordenado_por_id():
+            row = bisect_left(self.ids, id_horario)
+            return row if row < len(self.ids) and self.ids[row] == id_horario else None
+        try:
+            return self.ids.index(id_horario)
+        except ValueError:
+            return None
+
+    def _quitar(self, id_horario):
+        row = self._posicion(id_horario)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.ids[row]
+            self.endRemoveRows()
+
+    def _insertar(self, ids):
+        """Agrega las filas nuevas en su lugar, sin mover las que ya se muestran"""
+        nuevos = sorted(id_horario for id_horario in ids if self._posicion(id_horario) is None)
+        if not nuevos:
+            return
+        if self._ordenado_por_id():
+            for id_horario in nuevos:
+                self._insertar_fila(bisect_left(self.ids, id_horario), id_horario)
+            return
+
+        # Con otro orden la posición la da la consulta; las filas existentes no cambian de orden
+        ids_nuevos = self._leer_ids()
+        posiciones = {id_horario: row for row, id_horario in enumerate(ids_nuevos)}
+        for id_horario in sorted(nuevos, key=lambda i: posiciones.get(i, -1)):
+            if id_horario in posiciones:
+                self._insertar_fila(posiciones[id_horario], id_horario)
+
+    def _insertar_fila(self, row, id_horario):
+        row = min(row, len(self.ids))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.ids.insert(row, id_horario)
+        self.endInsertRows()
+
+    def _actualizar(self, ids):
+        """Refresca las filas cambiadas y, si el cambio altera el orden, las reubica"""
+        for id_horario in ids:
+            row = self._posicion(id_horario)
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(ENCABEZADOS) - 1))
+        if ids and not self._ordenado_por_id():
+            self._reordenar()
+
+    def _reordenar(self):
+        """Aplica el orden actual de la consulta conservando la selección de la vista"""
+        ids_nuevos = self._leer_ids()
+        if sorted(ids_nuevos) != sorted(self.ids):
+            self.cargar()
+            return
+        if ids_nuevos == self.ids:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        posiciones = {id_horario: row for row, id_horario in enumerate(ids_nuevos)}
+        anteriores = self.persistentIndexList()
+        nuevos = [self.index(posiciones[self.ids[i.row()]], i.column()) for i in anteriores]
+        self.ids = ids_nuevos
+        self.changePersistentIndexList(anteriores, nuevos)
+        self.layoutChanged.emit()
+
+    def _catalogo_cambiado(self, tabla, operacion, columna):
+        """Muestra los nombres nuevos, que la ReferenceCache ya leyó; la tabla no se vuelve a consultar"""
+        if operacion == INSERTAR or not self.ids:
+            return
+        self.dataChanged.emit(self.index(0, columna), self.index(len(self.ids) - 1, columna))
+        if self.orden[0] == columna:
+            # Un nombre cambiado mueve sus filas; uno eliminado las saca del orden por nombre
+            self._reordenar()
@@ -0,0 +1,268 @@
+import json
+import time
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from models.change_bus import INSERTAR, ACTUALIZAR, ELIMINAR
+from models.conflict_engine import Propuesta, describir
+
+ACCIONES_CONSERVADAS = 500   # Acciones que se pueden deshacer; las anteriores se compactan
+COMPACTAR_CADA = 100         # Cada cuántas acciones registradas se compacta el diario
+FILAS_POR_CONSULTA = 500     # Horarios que se leen con cada consulta al verificar
+
+# Catálogo de cada valor de una fila del diario, en el orden de INSERTAR_HORARIO
+CATALOGOS_FILA = ("Profesores", "Asignaturas", "Grupos", "Aulas", "DiasSemana")
+
+class ErrorDiario(Exception):
+    """Los cambios no se pueden deshacer o rehacer; se deshace la transacción"""
+
+def _fila(query, columna):
+    return None if query.isNull(columna) else tuple(json.loads(query.value(columna)))
+
+def _texto(fila):
+    return None if fila is None else json.dumps(list(fila))
+
+class ChangeJournal:
+    """Diario de los cambios hechos a los horarios, para deshacerlos y rehacerlos
+
+    Cada acción del usuario (agregar, eliminar o cambiar la hora de clases)
+    se registra, en la misma transacción que la escribe, como los valores
+    de cada fila antes y después. Las filas del diario no se modifican: la
+    posición actual es la última acción no deshecha, y deshacer o rehacer
+    sólo mueve esa posición aplicando los cambios entre las dos, así que
+    cuesta lo que el tamaño de esos cambios y no lo que la tabla.
+
+    Un punto de control guarda sólo una posición del diario; volver a él
+    aplica de una vez el efecto neto de todas las acciones intermedias.
+
+    Las importaciones y el generador automático no pasan por el diario. Por
+    eso, antes de escribir, se verifica que cada horario siga como lo dejó
+    la acción y que el resultado no tenga conflictos ni apunte a catálogos
+    eliminados; si no, no se cambia nada.
+    """
+
+    def __init__(self, db, bus, referencias):
+        self.db = db
+        self.bus = bus
+        self.referencias = referencias    # ReferenceCache, para verificar los catálogos
+
+    def _consulta(self, sql, valores=()):
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        query.prepare(sql)
+        for valor in valores:
+            query.addBindValue(valor)
+        if not query.exec_():
+            raise ErrorDiario(query.lastError().text())
+        return query
+
+    def _valor(self, sql, valores=(), defecto=None):
+        query = self._consulta(sql, valores)
+        return query.value(0) if query.next() and not query.isNull(0) else defecto
+
+    def posicion(self):
+        """Retorna el id de la última acción vigente, 0 si no hay ninguna"""
+        return self._valor(queries.DIARIO_POSICION, defecto=0)
+
+    def registrar(self, descripcion, cambios):
+        """Registra una acción; se llama dentro de la transacción que la escribe
+
+        cambios es una lista de (id_horario, fila antes, fila después), con
+        las filas como los valores de INSERTAR_HORARIO o None. Las acciones
+        deshechas dejan de poder rehacerse, como en cualquier editor.
+        """
+        if not cambios:
+            return
+        posicion = self.posicion()
+        self._consulta(queries.DIARIO_DESCARTAR_CAMBIOS, [posicion])
+        self._consulta(queries.DIARIO_DESCARTAR_ACCIONES, [posicion])
+        self._consulta(queries.DESCARTAR_PUNTOS, [posicion])
+
+        id_accion = self._consulta(queries.DIARIO_INSERTAR_ACCION, [descripcion, time.time()]).lastInsertId()
+        query = QSqlQuery(self.db)
+        query.prepare(queries.DIARIO_INSERTAR_CAMBIO)
+        query.addBindValue([id_accion] * len(cambios))
+        query.addBindValue([id_horario for id_horario, _, _ in cambios])
+        query.addBindValue([_texto(antes) for _, antes, _ in cambios])
+        query.addBindValue([_texto(despues) for _, _, despues in cambios])
+        if not query.execBatch():
+            raise ErrorDiario(query.lastError().text())
+        if id_accion % COMPACTAR_CADA == 0:
+            self.compactar()
+
+    def ultima(self):
+        """Retorna (id_accion, descripción) de la acción que se desharía, o None"""
+        query = self._consulta(queries.DIARIO_ULTIMA)
+        return (query.value(0), query.value(1)) if query.next() else None
+
+    def siguiente(self):
+        """Retorna (id_accion, descripción) de la acción que se reharía, o None"""
+        query = self._consulta(queries.DIARIO_SIGUIENTE, [self.posicion()])
+        return (query.value(0), query.value(1)) if query.next() else None
+
+    def deshacer(self, motor):
+        """Deshace la última acción; retorna el error o None"""
+        ultima = self.ultima()
+        if ultima is None:
+            return "No hay cambios para deshacer"
+        return self._mover(lambda: self._valor(queries.DIARIO_ANTERIOR, [ultima[0]], 0), motor)
+
+    def rehacer(self, motor):
+        """Rehace la última acción deshecha; retorna el error o None"""
+        siguiente = self.siguiente()
+        if siguiente is None:
+            return "No hay cambios para rehacer"
+        return self._mover(lambda: siguiente[0], motor)
+
+    def volver_a_punto(self, id_punto, motor):
+        """Deja los horarios como estaban al crear el punto de control; retorna el error o None"""
+        return self._mover(lambda: self._valor(queries.PUNTO_CONTROL, [id_punto]), motor)
+
+    def crear_punto(self, nombre):
+        """Guarda la posición actual del diario como punto de control; retorna el error o None"""
+        try:
+            with pool_de(self.db).escritura():
+                self._consulta(queries.INSERTAR_PUNTO, [nombre, time.time(), self.posicion()])
+        except ErrorDiario as e:
+            return str(e)
+        return None
+
+    def eliminar_punto(self, id_punto):
+        try:
+            with pool_de(self.db).escritura():
+                self._consulta(queries.ELIMINAR_PUNTO, [id_punto])
+        except ErrorDiario as e:
+            return str(e)
+        return None
+
+    def puntos(self):
+        """Retorna (id_punto, nombre, momento, id_accion) de cada punto de control, el más nuevo primero"""
+        query = self._consulta(queries.PUNTOS_CONTROL)
+        puntos = []
+        while query.next():
+            puntos.append(tuple(query.value(i) for i in range(4)))
+        return puntos
+
+    def compactar(self, conservar=ACCIONES_CONSERVADAS):
+        """Elimina las acciones más antiguas que las últimas conservar
+
+        Nunca elimina las que se necesitan para volver a un punto de control.
+        """
+        limite = self._valor(queries.DIARIO_LIMITE_COMPACTAR, [conservar])
+        if limite is None:
+            return
+        punto = self._valor(queries.PUNTO_MAS_ANTIGUO)
+        if punto is not None:
+            limite = min(limite, punto)
+        self._consulta(queries.DIARIO_COMPACTAR_CAMBIOS, [limite])
+        self._consulta(queries.DIARIO_COMPACTAR_ACCIONES, [limite])
+
+    def reemplazar(self, descripcion, filas, motor):
+        """Deja los horarios con los valores dados, como una sola acción que se puede deshacer
+
+        filas es {id_horario: fila o None}, con None para eliminarlo; sólo
+        se escriben los que cambian. Retorna el error o None.
+        """
+        def escribir():
+            actuales = self._actuales(list(filas))
+            netos = {id_horario: (actuales.get(id_horario), fila) for id_horario, fila in filas.items()}
+            cambios = self._aplicar(netos, motor)
+            self.registrar(descripcion, [(id_horario, *netos[id_horario])
+                                         for ids in cambios for id_horario in ids])
+            return cambios
+        return self._en_transaccion(escribir)
+
+    def _mover(self, destino, motor):
+        """Lleva los horarios a la posición destino() del diario en una sola transacción"""
+        def mover():
+            posicion = self.posicion()
+            objetivo = destino()
+            if objetivo is None:
+                raise ErrorDiario("El punto de control ya no existe")
+            cambios = self._aplicar(self._netos(posicion, objetivo), motor)
+            self._consulta(queries.DIARIO_MARCAR, [1 if objetivo < posicion else 0,
+                                                   min(posicion, objetivo), max(posicion, objetivo)])
+            return cambios
+        return self._en_transaccion(mover)
+
+    def _en_transaccion(self, escribir):
+        """Ejecuta escribir() en una transacción y publica los (eliminados, actualizados, insertados)"""
+        try:
+            with pool_de(self.db).transaccion():
+                cambios = escribir()
+        except (ErrorDiario, RuntimeError) as e:
+            return str(e)
+
+        for operacion, ids in zip((ELIMINAR, ACTUALIZAR, INSERTAR), cambios):
+            if ids:
+                self.bus.publicar("Horarios", operacion, ids)
+        return None
+
+    def _netos(self, posicion, objetivo):
+        """Retorna {id_horario: (fila esperada ahora, fila objetivo)} entre las dos posiciones
+
+        Un horario que cambió en varias acciones se escribe una sola vez: al
+        retroceder vuelve a su valor antes del primer cambio, y al avanzar
+        queda con el valor después del último.
+        """
+        atras = objetivo < posicion
+        query = self._consulta(queries.DIARIO_CAMBIOS, [min(posicion, objetivo), max(posicion, objetivo)])
+        primeros = {}
+        ultimos = {}
+        while query.next():
+            cambio = (_fila(query, 1), _fila(query, 2))
+            primeros.setdefault(query.value(0), cambio)
+            ultimos[query.value(0)] = cambio
+        if atras:
+            return {id_horario: (ultimos[id_horario][1], primero[0]) for id_horario, primero in primeros.items()}
+        return {id_horario: (primero[0], ultimos[id_horario][1]) for id_horario, primero in primeros.items()}
+
+    def _actuales(self, ids):
+        """Retorna {id_horario: fila} de los horarios que existen, con los valores de INSERTAR_HORARIO"""
+        actuales = {}
+        for desde in range(0, len(ids), FILAS_POR_CONSULTA):
+            lote = ids[desde:desde + FILAS_POR_CONSULTA]
+            query = self._consulta(queries.horarios_pagina(len(lote)), lote)
+            while query.next():
+                actuales[query.value(0)] = tuple(query.value(i) for i in range(1, 8))
+        return actuales
+
+    def _verificar(self, netos, motor):
+        actuales = self._actuales(list(netos))
+        for id_horario, (esperada, _) in netos.items():
+            if actuales.get(id_horario) != esperada:
+                raise ErrorDiario("Algunos horarios cambiaron después de esa acción "
+                                  "(p. ej. por una importación); no se puede volver atrás")
+
+        nuevas = [(id_horario, fila) for id_horario, (_, fila) in netos.items() if fila is not None]
+        for _, fila in nuevas:
+            for tabla, id_ in zip(CATALOGOS_FILA, fila):
+                if id_ not in self.referencias.nombres(tabla):
+                    raise ErrorDiario("Algunos horarios usan profesores, asignaturas, secciones o aulas "
+                                      "que ya fueron eliminados")
+
+        # Los horarios que se reescriben no cuentan como ocupados: se verifican con sus valores nuevos
+        propuestas = [Propuesta(id_horario, fila[0], fila[3], fila[2], fila[4], fila[5], fila[6])
+                      for id_horario, fila in nuevas]
+        conflictos = motor.verificar(propuestas, excluir=netos)
+        if conflictos:
+            raise ErrorDiario(f"Conflicto de horario: {describir(conflictos[0])}")
+
+    def _aplicar(self, netos, motor):
+        """Escribe los cambios netos; retorna (ids eliminados, actualizados, insertados)"""
+        netos = {id_horario: (esperada, fila) for id_horario, (esperada, fila) in netos.items()
+                 if esperada != fila}
+        self._verificar(netos, motor)
+
+        eliminados = [id_horario for id_horario, (_, fila) in netos.items() if fila is None]
+        actualizados = [id_horario for id_horario, (esperada, fila) in netos.items()
+                        if esperada is not None and fila is not None]
+        insertados = [id_horario for id_horario, (esperada, _) in netos.items() if esperada is None]
+        # Primero se liberan los lugares, para no chocar con las restricciones UNIQUE
+        for id_horario in eliminados:
+            self._consulta(queries.ELIMINAR_HORARIO, [id_horario])
+        for id_horario in actualizados:
+            self._consulta(queries.ACTUALIZAR_HORARIO, list(netos[id_horario][1]) + [id_horario])
+        for id_horario in insertados:
+            self._consulta(queries.REINSERTAR_HORARIO, [id_horario] + list(netos[id_horario][1]))
+        return eliminados, actualizados, insertados
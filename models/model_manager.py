@@ -1,34 +1,142 @@
-from PyQt5.QtSql import QSqlTableModel
+from PyQt5.QtCore import QTimer
+from PyQt5.QtSql import QSqlTableModel, QSqlQuery
+from database.connection_pool import pool_de
+from models.change_bus import ChangeBus, INSERTAR, ACTUALIZAR, ELIMINAR
+from models.edit_session import EditSession
+from models.journal import ChangeJournal
+from models.reference_cache import ReferenceCache
+from models.versions import ScheduleVersions
+from utils.metrics import medir, MODELO
+
+# Tablas de catálogo con un modelo compartido entre las pestañas
+TABLAS = ["Profesores", "Asignaturas", "Grupos", "Aulas", "DiasSemana"]
+
+class CatalogoModel(QSqlTableModel):
+    """Modelo de una tabla de catálogo que publica sus cambios en el bus"""
+
+    def __init__(self, db, bus):
+        super().__init__(db=db)
+        self.bus = bus
+
+    def select(self):
+        with medir(MODELO, f"{self.tableName()}: select"):
+            return super().select()
+
+    def submitAll(self):
+        """Guarda los cambios pendientes con el acceso exclusivo a la conexión de escritura"""
+        with pool_de(self.database()).escritura():
+            return super().submitAll()
+
+    def _id(self, row):
+        return self.record(row).value(0)
+
+    def insertRowIntoTable(self, values):
+        if not super().insertRowIntoTable(values):
+            return False
+
+        query = QSqlQuery(self.database())
+        if query.exec_("SELECT last_insert_rowid()") and query.next():
+            self.bus.publicar(self.tableName(), INSERTAR, [query.value(0)], self)
+        return True
+
+    def updateRowInTable(self, row, values):
+        id_ = self._id(row)
+        if not super().updateRowInTable(row, values):
+            return False
+
+        self.bus.publicar(self.tableName(), ACTUALIZAR, [id_], self)
+        return True
+
+    def deleteRowFromTable(self, row):
+        id_ = self._id(row)
+        if not super().deleteRowFromTable(row):
+            return False
+
+        self.bus.publicar(self.tableName(), ELIMINAR, [id_], self)
+        return True
 
 class ModelManager:
     def __init__(self, db):
         self.db = db
         self.modelos = {}
+        self.bus = ChangeBus()
+        self.bus.cambio.connect(self.aplicar_cambio)
+        self._pendientes = set()
+        # Se crean la primera vez que se piden, como los modelos
+        self._referencias = None
+        self._diario = None
+        self._versiones = None
 
-    def create_models(self):
-        """Crea los modelos de datos para cada tabla"""
-        self.modelos = {
-            "Profesores": QSqlTableModel(db=self.db),
-            "Asignaturas": QSqlTableModel(db=self.db),
-            "Grupos": QSqlTableModel(db=self.db),
-            "Aulas": QSqlTableModel(db=self.db),
-            "DiasSemana": QSqlTableModel(db=self.db)
-        }
-        
-        for nombre, modelo in self.modelos.items():
-            modelo.setTable(nombre)
-            modelo.select()
+    @property
+    def referencias(self):
+        """ReferenceCache con los nombres e ids de los catálogos para combos y tablas"""
+        if self._referencias is None:
+            self._referencias = ReferenceCache(self.db)
+        return self._referencias
+
+    @property
+    def diario(self):
+        """ChangeJournal de los cambios a los horarios, para deshacerlos"""
+        if self._diario is None:
+            self._diario = ChangeJournal(self.db, self.bus, self.referencias)
+        return self._diario
+
+    @property
+    def versiones(self):
+        """ScheduleVersions: períodos y borradores de los horarios guardados en la base de datos"""
+        if self._versiones is None:
+            self._versiones = ScheduleVersions(self.db, self.diario)
+        return self._versiones
 
     def get_model(self, table_name):
         """Retorna el modelo para una tabla específica"""
-        return self.modelos.get(table_name)
+        if table_name not in TABLAS:
+            return None
+        modelo = self.modelos.get(table_name)
+        if modelo is None:
+            modelo = CatalogoModel(self.db, self.bus)
+            modelo.setTable(table_name)
+            modelo.select()
+            self.modelos[table_name] = modelo
+        return modelo
+
+    def sesion(self, tabla):
+        """Retorna una EditSession para guardar varios cambios del catálogo en una sola transacción"""
+        return EditSession(self.db, self.bus, tabla, self.diario)
+
+    def aplicar_cambio(self, tabla, operacion, ids, origen):
+        """Mantiene al día los modelos ya creados cuando otra parte de la aplicación escribe
+
+        Las altas y cambios hechos desde el propio modelo ya están en él: al
+        guardar una fila QSqlTableModel vuelve a leer sólo esa fila. Las bajas
+        y los cambios externos sí necesitan consultar de nuevo, porque
+        QSqlTableModel no puede quitar ni agregar filas sin hacerlo; los
+        catálogos son pequeños y la consulta se hace una sola vez por ciclo
+        de eventos aunque se eliminen varias filas.
+
+        Primero se pasa el cambio a la ReferenceCache, si ya se creó: este
+        es el primer receptor del bus, así que los modelos y pestañas que
+        reciben el aviso después ya encuentran los nombres al día.
+        """
+        if self._referencias is not None:
+            self._referencias.aplicar_cambio(tabla, operacion, ids, origen)
+        modelo = self.modelos.get(tabla)
+        if modelo is None or (origen is modelo and operacion in (INSERTAR, ACTUALIZAR)):
+            return
+        if tabla not in self._pendientes:
+            self._pendientes.add(tabla)
+            QTimer.singleShot(0, lambda: self._volver_a_consultar(tabla))
+
+    def _volver_a_consultar(self, tabla):
+        self._pendientes.discard(tabla)
+        self.refresh_model(tabla)
 
     def refresh_all(self):
-        """Actualiza todos los modelos"""
+        """Actualiza todos los modelos ya creados"""
         for modelo in self.modelos.values():
             modelo.select()
 
     def refresh_model(self, table_name):
-        """Actualiza un modelo específico"""
+        """Actualiza un modelo específico si ya fue creado"""
         if table_name in self.modelos:
-            self.modelos[table_name].select() 
\ No newline at end of file
+            self.modelos[table_name].select()
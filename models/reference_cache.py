@@ -0,0 +1,259 @@
+from bisect import bisect_left
+from PyQt5.QtCore import Qt, QModelIndex, QAbstractListModel
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from models.change_bus import INSERTAR, ACTUALIZAR, ELIMINAR
+
+class Catalogo:
+    """Filas de un catálogo en el orden de su combo, con los mapas id -> nombre y nombre -> id
+
+    No depende de la interfaz: la importación y la línea de comandos lo
+    leen con Catalogo.leer para resolver nombres sin una consulta por fila.
+    """
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.orden = []      # (clave de orden, id) de cada fila, ordenada como el combo
+        self.claves = {}     # id -> clave de orden
+        self.nombres = {}    # id -> nombre mostrado
+        self.ids = {}        # nombre en minúsculas (casefold) -> id
+
+    @classmethod
+    def leer(cls, db, tabla):
+        catalogo = cls(tabla)
+        catalogo.cargar(db)
+        return catalogo
+
+    def _filas(self, query):
+        """Retorna (id, clave de orden, nombre) de cada fila de la consulta"""
+        _, columnas_nombre, columnas_orden = queries.COMBOS[self.tabla]
+        filas = []
+        while query.next():
+            nombre = " ".join(str(query.value(i)) for i in range(1, columnas_nombre + 1))
+            clave = tuple("" if query.value(i) is None else query.value(i) for i in columnas_orden)
+            filas.append((query.value(0), clave, nombre))
+        return filas
+
+    def cargar(self, db):
+        """Lee el catálogo completo"""
+        self.orden = []
+        self.claves = {}
+        self.nombres = {}
+        self.ids = {}
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        if query.exec_(queries.COMBOS[self.tabla][0]):
+            for id_, clave, nombre in self._filas(query):
+                self._registrar(id_, clave, nombre)
+                self.orden.append((clave, id_))
+        self.orden.sort()
+
+    def leer_filas(self, db, ids):
+        """Retorna {id: (clave de orden, nombre)} de las filas que siguen existiendo"""
+        leidas = {}
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        query.prepare(queries.COMBO_POR_ID[self.tabla])
+        for id_ in ids:
+            query.addBindValue(id_)
+            if query.exec_():
+                for id_leido, clave, nombre in self._filas(query):
+                    leidas[id_leido] = (clave, nombre)
+        return leidas
+
+    def _registrar(self, id_, clave, nombre):
+        self.claves[id_] = clave
+        self.nombres[id_] = nombre
+        self.ids[nombre.casefold()] = id_
+
+    def posicion(self, id_):
+        """Retorna la fila del id en el orden del combo, o None si no está"""
+        clave = self.claves.get(id_)
+        return None if clave is None else bisect_left(self.orden, (clave, id_))
+
+    def posicion_nueva(self, id_, clave):
+        """Retorna la fila que tendría el id con esa clave de orden, contada sin su fila actual"""
+        fila = bisect_left(self.orden, (clave, id_))
+        actual = self.posicion(id_)
+        return fila - 1 if actual is not None and fila > actual else fila
+
+    def quitar(self, id_):
+        fila = self.posicion(id_)
+        if fila is None:
+            return
+        del self.orden[fila]
+        del self.claves[id_]
+        nombre = self.nombres.pop(id_).casefold()
+        if self.ids.get(nombre) == id_:
+            del self.ids[nombre]
+
+    def poner(self, id_, clave, nombre):
+        """Agrega la fila o la reemplaza, en la posición que le corresponde por su clave"""
+        self.quitar(id_)
+        self.orden.insert(bisect_left(self.orden, (clave, id_)), (clave, id_))
+        self._registrar(id_, clave, nombre)
+
+class CatalogoListModel(QAbstractListModel):
+    """Modelo de lista de un catálogo para los QComboBox: el nombre y, en Qt.UserRole, el id
+
+    Con todos la primera fila es una opción sin id, por ejemplo para no
+    filtrar. Varios combos pueden compartir el mismo modelo.
+    """
+
+    def __init__(self, catalogo, todos=None, parent=None):
+        super().__init__(parent)
+        self.catalogo = catalogo
+        self.todos = todos
+        self.desplazamiento = 1 if todos else 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.catalogo.orden) + self.desplazamiento
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row() - self.desplazamiento
+        id_ = None if row < 0 else self.catalogo.orden[row][1]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.todos if id_ is None else self.catalogo.nombres[id_]
+        if role == Qt.UserRole:
+            return id_
+        return None
+
+    # Avisos a las vistas de los cambios que hace ReferenceCache en el catálogo
+
+    def antes_de_quitar(self, fila):
+        fila += self.desplazamiento
+        self.beginRemoveRows(QModelIndex(), fila, fila)
+
+    def despues_de_quitar(self):
+        self.endRemoveRows()
+
+    def antes_de_insertar(self, fila):
+        fila += self.desplazamiento
+        self.beginInsertRows(QModelIndex(), fila, fila)
+
+    def despues_de_insertar(self):
+        self.endInsertRows()
+
+    def antes_de_mover(self, desde, hasta):
+        """hasta es la fila final del elemento, contada sin su fila actual"""
+        destino = hasta if hasta < desde else hasta + 1
+        self.beginMoveRows(QModelIndex(), desde + self.desplazamiento, desde + self.desplazamiento,
+                           QModelIndex(), destino + self.desplazamiento)
+
+    def despues_de_mover(self):
+        self.endMoveRows()
+
+    def fila_cambiada(self, fila):
+        indice = self.index(fila + self.desplazamiento)
+        self.dataChanged.emit(indice, indice)
+
+class ReferenceCache:
+    """Datos de referencia compartidos: profesores, asignaturas, secciones, aulas y días
+
+    Cada catálogo se lee una vez, la primera vez que se pide, y se mantiene
+    al día con los cambios publicados en el bus leyendo sólo las filas
+    afectadas. Los combos de todas las pestañas muestran sus modelos de
+    lista y la tabla de horarios sus mapas id -> nombre.
+
+    Los cambios le deben llegar antes que a los modelos y pestañas que lo
+    usan, para que al recibirlos ellos los nombres ya estén al día: con
+    bus se conecta a él al crearse, y si no ModelManager se los pasa.
+    """
+
+    def __init__(self, db, bus=None):
+        self.db = db
+        self.catalogos = {}    # tabla -> Catalogo
+        self.modelos = {}      # (tabla, todos) -> CatalogoListModel
+        if bus is not None:
+            bus.cambio.connect(self.aplicar_cambio)
+
+    def catalogo(self, tabla):
+        catalogo = self.catalogos.get(tabla)
+        if catalogo is None:
+            catalogo = Catalogo.leer(self.db, tabla)
+            self.catalogos[tabla] = catalogo
+        return catalogo
+
+    def nombres(self, tabla):
+        """Retorna {id: nombre} del catálogo"""
+        return self.catalogo(tabla).nombres
+
+    def ids(self, tabla):
+        """Retorna {nombre en minúsculas: id} del catálogo"""
+        return self.catalogo(tabla).ids
+
+    def modelo(self, tabla, todos=None):
+        """Retorna el modelo de lista del catálogo, compartido por los combos que lo muestran"""
+        modelo = self.modelos.get((tabla, todos))
+        if modelo is None:
+            modelo = CatalogoListModel(self.catalogo(tabla), todos)
+            self.modelos[(tabla, todos)] = modelo
+        return modelo
+
+    def _modelos_de(self, tabla):
+        return [modelo for (t, _), modelo in self.modelos.items() if t == tabla]
+
+    def aplicar_cambio(self, tabla, operacion, ids, origen):
+        """Aplica al catálogo, si ya fue leído, las filas que cambiaron"""
+        catalogo = self.catalogos.get(tabla)
+        if catalogo is None:
+            return
+        if operacion not in (INSERTAR, ACTUALIZAR, ELIMINAR):
+            self.recargar(tabla)
+            return
+
+        leidas = catalogo.leer_filas(self.db, ids) if operacion != ELIMINAR else {}
+        for id_ in ids:
+            if id_ in leidas:
+                self._poner(catalogo, id_, *leidas[id_])
+            else:
+                self._quitar(catalogo, id_)
+
+    def recargar(self, tabla):
+        """Vuelve a leer el catálogo completo y aplica sólo las diferencias
+
+        Las filas se quitan, agregan o mueven una a una, como con los cambios
+        detallados, para que los combos conserven su selección.
+        """
+        catalogo = self.catalogos[tabla]
+        nuevo = Catalogo.leer(self.db, tabla)
+        for id_ in [id_ for id_ in catalogo.claves if id_ not in nuevo.claves]:
+            self._quitar(catalogo, id_)
+        for clave, id_ in nuevo.orden:
+            if catalogo.claves.get(id_) != clave or catalogo.nombres.get(id_) != nuevo.nombres[id_]:
+                self._poner(catalogo, id_, clave, nuevo.nombres[id_])
+
+    def _quitar(self, catalogo, id_):
+        fila = catalogo.posicion(id_)
+        if fila is None:
+            return
+        modelos = self._modelos_de(catalogo.tabla)
+        for modelo in modelos:
+            modelo.antes_de_quitar(fila)
+        catalogo.quitar(id_)
+        for modelo in modelos:
+            modelo.despues_de_quitar()
+
+    def _poner(self, catalogo, id_, clave, nombre):
+        modelos = self._modelos_de(catalogo.tabla)
+        desde = catalogo.posicion(id_)
+        hasta = catalogo.posicion_nueva(id_, clave)
+        if desde is None:
+            for modelo in modelos:
+                modelo.antes_de_insertar(hasta)
+            catalogo.poner(id_, clave, nombre)
+            for modelo in modelos:
+                modelo.despues_de_insertar()
+            return
+
+        if desde != hasta:
+            # Un nombre cambiado mueve la fila; la selección de los combos la sigue
+            for modelo in modelos:
+                modelo.antes_de_mover(desde, hasta)
+        catalogo.poner(id_, clave, nombre)
+        for modelo in modelos:
+            if desde != hasta:
+                modelo.despues_de_mover()
+            modelo.fila_cambiada(hasta)
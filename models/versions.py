@@ -0,0 +1,340 @@
+import time
+from collections import Counter, namedtuple
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from utils.time_utils import minutos_a_texto
+
+PERIODO = "Periodo"
+BORRADOR = "Borrador"
+
+PROFUNDIDAD_MAXIMA = 8       # Versiones encadenadas antes de guardar una copia completa
+FILAS_POR_CONSULTA = 500     # Clases que se leen con cada consulta de una versión
+
+# Catálogo de cada valor de una fila, en el orden de INSERTAR_HORARIO
+CATALOGOS_FILA = ("Profesores", "Asignaturas", "Grupos", "Aulas", "DiasSemana")
+
+# Cómo se nombran en los mensajes las filas de cada catálogo de CATALOGOS_FILA
+NOMBRES_CATALOGO = {"Profesores": "profesores", "Asignaturas": "asignaturas", "Grupos": "secciones",
+                    "Aulas": "aulas", "DiasSemana": "días"}
+IDS_EN_MENSAJE = 5           # Ids faltantes que se nombran por catálogo
+
+# Filas (id_horario, fila) agregadas y eliminadas, y (id antes, fila antes, fila después) movidas
+Diferencias = namedtuple("Diferencias", "agregadas eliminadas movidas")
+
+Version = namedtuple("Version", "id_version nombre tipo id_base momento clases abierta")
+
+class ErrorVersion(Exception):
+    """La versión no se puede leer o guardar; se deshace la transacción"""
+
+def _clase(fila):
+    """Profesor, asignatura y sección: lo que identifica una clase aunque cambie de hora o de aula"""
+    return fila[:3]
+
+def _por_dia(elemento):
+    """Orden por día y hora de la fila (anterior, si es una clase movida)"""
+    return elemento[1][4:]
+
+def _quitar(elementos, iguales):
+    """Retorna los (id_horario, fila) sin tantas filas de cada valor como cuenta iguales"""
+    restantes = Counter(iguales)
+    quedan = []
+    for id_horario, fila in elementos:
+        if restantes[fila]:
+            restantes[fila] -= 1
+        else:
+            quedan.append((id_horario, fila))
+    return quedan
+
+def comparar(antes, despues):
+    """Retorna las Diferencias entre dos contenidos {id_horario: fila}
+
+    Una clase movida conserva su profesor, asignatura y sección (_clase) y
+    cambió de hora, día o aula, con el mismo id o eliminada y agregada con
+    otro; éstas se emparejan en el orden del día y la hora. Si se volvió a
+    agregar igual, con otro id, no cambió y no se lista.
+    """
+    agregadas = []
+    eliminadas = []
+    movidas = []
+    for id_horario, fila in antes.items():
+        nueva = despues.get(id_horario)
+        if nueva is None:
+            eliminadas.append((id_horario, fila))
+        elif nueva != fila:
+            if _clase(fila) == _clase(nueva):
+                movidas.append((id_horario, fila, nueva))
+            else:
+                eliminadas.append((id_horario, fila))
+                agregadas.append((id_horario, nueva))
+    agregadas += [(id_horario, fila) for id_horario, fila in despues.items()
+                  if id_horario not in antes]
+
+    iguales = Counter(fila for _, fila in eliminadas) & Counter(fila for _, fila in agregadas)
+    eliminadas = _quitar(eliminadas, iguales)
+    agregadas = _quitar(agregadas, iguales)
+
+    libres = {}
+    for id_horario, fila in sorted(agregadas, key=_por_dia):
+        libres.setdefault(_clase(fila), []).append((id_horario, fila))
+    sin_pareja = []
+    for id_horario, fila in sorted(eliminadas, key=_por_dia):
+        candidatas = libres.get(_clase(fila))
+        if candidatas:
+            movidas.append((id_horario, fila, candidatas.pop(0)[1]))
+        else:
+            sin_pareja.append((id_horario, fila))
+
+    agregadas = sorted((elemento for lista in libres.values() for elemento in lista), key=_por_dia)
+    movidas.sort(key=_por_dia)
+    return Diferencias(agregadas, sin_pareja, movidas)
+
+def describir_faltantes(faltantes):
+    """Describe {tabla: [id]} de catálogos eliminados, p. ej. profesores #3, #7; aulas #2"""
+    partes = []
+    for tabla in CATALOGOS_FILA:
+        ids = sorted(faltantes.get(tabla, ()))
+        if ids:
+            texto = ", ".join(f"#{id_}" for id_ in ids[:IDS_EN_MENSAJE])
+            if len(ids) > IDS_EN_MENSAJE:
+                texto += f" y {len(ids) - IDS_EN_MENSAJE} más"
+            partes.append(f"{NOMBRES_CATALOGO[tabla]} {texto}")
+    return "; ".join(partes)
+
+def describir_fila(fila, nombres):
+    """Describe una clase; nombres es {tabla: {id: nombre}} de cada catálogo de CATALOGOS_FILA"""
+    profesor, asignatura, grupo, aula, dia = (nombres[tabla].get(id_, f"#{id_}")
+                                              for tabla, id_ in zip(CATALOGOS_FILA, fila))
+    return (f"{asignatura} ({grupo}) con {profesor}, {dia} "
+            f"{minutos_a_texto(fila[5])} - {minutos_a_texto(fila[6])} en {aula}")
+
+class ScheduleVersions:
+    """Versiones con nombre de los horarios: períodos publicados y borradores
+
+    Guardar una versión copia los horarios actuales dentro de la base de
+    datos; si hay una versión abierta (la última guardada o abierta), la
+    nueva se guarda como sus diferencias con ella y las demás clases se
+    leen de esa base, así que un borrador no duplica todas las filas de
+    Horarios. Cuando las diferencias son muchas, o la cadena de bases es
+    larga, se guarda una copia completa.
+
+    Comparar dos versiones que comparten una base lee sólo las clases que
+    cambiaron en alguna de ellas desde esa base.
+    """
+
+    def __init__(self, db, diario=None):
+        self.db = db
+        self.diario = diario    # ChangeJournal, para abrir versiones como un cambio que se puede deshacer
+
+    def _consulta(self, sql, valores=()):
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        query.prepare(sql)
+        for valor in valores:
+            query.addBindValue(valor)
+        if not query.exec_():
+            raise ErrorVersion(query.lastError().text())
+        return query
+
+    def _valor(self, sql, valores=()):
+        query = self._consulta(sql, valores)
+        return query.value(0) if query.next() and not query.isNull(0) else None
+
+    def versiones(self):
+        """Retorna una Version por cada versión guardada, la más nueva primero"""
+        query = self._consulta(queries.VERSIONES)
+        versiones = []
+        while query.next():
+            versiones.append(Version(*(None if query.isNull(i) else query.value(i) for i in range(7))))
+        return versiones
+
+    def buscar(self, nombre):
+        """Retorna el id de la versión con ese nombre, o None"""
+        return self._valor(queries.VERSION_POR_NOMBRE, [nombre])
+
+    def abierta(self):
+        """Retorna el id de la versión de la que salen los horarios actuales, o None"""
+        return self._valor(queries.VERSION_ABIERTA)
+
+    def _cadena(self, id_version):
+        """Retorna [id_version, su base, la base de esa, ...] hasta una copia completa"""
+        cadena = []
+        while id_version is not None and id_version not in cadena:
+            cadena.append(id_version)
+            id_version = self._valor(queries.VERSION_BASE, [id_version])
+        return cadena
+
+    def _filas(self, query):
+        while query.next():
+            fila = None if query.isNull(1) else tuple(query.value(i) for i in range(1, 8))
+            yield query.value(0), fila
+
+    def _leer(self, sql_todas, sql_lote, valores, ids):
+        """Lee (id_horario, fila) de todas las filas, o sólo de las de ids en lotes"""
+        if ids is None:
+            yield from self._filas(self._consulta(sql_todas, valores))
+            return
+        ids = list(ids)
+        for desde in range(0, len(ids), FILAS_POR_CONSULTA):
+            lote = ids[desde:desde + FILAS_POR_CONSULTA]
+            yield from self._filas(self._consulta(sql_lote(len(lote)), valores + lote))
+
+    def contenido(self, id_version, ids=None):
+        """Retorna {id_horario: fila} de la versión, o de los horarios actuales si id_version es None
+
+        Las filas tienen los valores de INSERTAR_HORARIO. Con ids sólo se
+        leen esas clases.
+        """
+        if id_version is None:
+            return dict(self._leer(queries.HORARIOS_VALORES, queries.horarios_pagina, [], ids))
+
+        resueltas = {}
+        for version in self._cadena(id_version):
+            for id_horario, fila in self._leer(queries.VERSION_FILAS, queries.version_filas, [version], ids):
+                resueltas.setdefault(id_horario, fila)
+            if ids is not None and len(resueltas) == len(ids):
+                break
+        return {id_horario: fila for id_horario, fila in resueltas.items() if fila is not None}
+
+    def _cambiadas(self, id_a, id_b):
+        """Retorna los id_horario que pueden diferir entre dos versiones, o None si hay que leerlas completas
+
+        Son las filas guardadas en cada una y en sus bases hasta la primera
+        base que comparten; las de esa base en adelante son iguales en ambas.
+        """
+        if id_a is None or id_b is None:
+            return None
+        cadena_a = self._cadena(id_a)
+        cadena_b = self._cadena(id_b)
+        comunes = [version for version in cadena_a if version in cadena_b]
+        if not comunes:
+            return None
+        ids = set()
+        for cadena in (cadena_a, cadena_b):
+            for version in cadena[:cadena.index(comunes[0])]:
+                query = self._consulta(queries.VERSION_IDS, [version])
+                while query.next():
+                    ids.add(query.value(0))
+        return ids
+
+    def diferencias(self, id_a, id_b):
+        """Retorna las Diferencias de la versión id_a a la id_b (None: los horarios actuales)"""
+        ids = self._cambiadas(id_a, id_b)
+        return comparar(self.contenido(id_a, ids), self.contenido(id_b, ids))
+
+    def guardar(self, nombre, tipo=BORRADOR):
+        """Guarda los horarios actuales como una versión nueva, que queda abierta; retorna el error o None"""
+        try:
+            with pool_de(self.db).transaccion():
+                self._guardar(nombre, tipo)
+        except (ErrorVersion, RuntimeError) as e:
+            return str(e)
+        return None
+
+    def _guardar(self, nombre, tipo):
+        actuales = self.contenido(None)
+        base = self.abierta()
+        filas = None
+        if base is not None and len(self._cadena(base)) < PROFUNDIDAD_MAXIMA:
+            anteriores = self.contenido(base)
+            filas = [(id_horario, fila) for id_horario, fila in actuales.items()
+                     if anteriores.get(id_horario) != fila]
+            filas += [(id_horario, None) for id_horario in anteriores if id_horario not in actuales]
+            if len(filas) > len(actuales) // 2:
+                filas = None
+        if filas is None:
+            base = None
+            filas = list(actuales.items())
+
+        self._consulta(queries.CERRAR_VERSIONES)
+        query = self._consulta(queries.INSERTAR_VERSION, [nombre, tipo, base, time.time(), len(actuales)])
+        self._insertar_filas(query.lastInsertId(), filas)
+
+    def _insertar_filas(self, id_version, filas):
+        if not filas:
+            return
+        query = QSqlQuery(self.db)
+        query.prepare(queries.VERSION_INSERTAR_FILA)
+        query.addBindValue([id_version] * len(filas))
+        query.addBindValue([id_horario for id_horario, _ in filas])
+        for columna in range(7):
+            query.addBindValue([None if fila is None else fila[columna] for _, fila in filas])
+        if not query.execBatch():
+            raise ErrorVersion(query.lastError().text())
+
+    def abrir(self, id_version, motor):
+        """Deja los horarios actuales como la versión; retorna el error o None
+
+        Se escribe en el diario como una sola acción, así que se puede
+        deshacer. Sólo se escriben las clases que difieren. Si la versión
+        usa profesores, secciones o aulas eliminados, el error los nombra.
+        """
+        try:
+            destino = self.contenido(id_version)
+            actuales = self.contenido(None)
+            nombre = next(version.nombre for version in self.versiones() if version.id_version == id_version)
+        except (ErrorVersion, StopIteration):
+            return "No se pudo leer la versión"
+
+        faltantes = self._faltantes(destino.values())
+        if faltantes:
+            return f"La versión {nombre} usa filas eliminadas de los catálogos: {describir_faltantes(faltantes)}"
+
+        filas = {id_horario: destino.get(id_horario) for id_horario in actuales}
+        filas.update(destino)
+        error = self.diario.reemplazar(f"Abrir la versión {nombre}", filas, motor)
+        if error:
+            return error
+        self._marcar_abierta(id_version)
+        return None
+
+    def _faltantes(self, filas):
+        """Retorna {tabla: {id}} de los catálogos que usan las filas y ya no existen"""
+        faltantes = {}
+        for tabla, ids in zip(CATALOGOS_FILA, zip(*filas)):
+            existentes = self.diario.referencias.nombres(tabla)
+            perdidos = {id_ for id_ in ids if id_ not in existentes}
+            if perdidos:
+                faltantes[tabla] = perdidos
+        return faltantes
+
+    def _marcar_abierta(self, id_version):
+        # Sólo indica la base de la próxima versión; si falla, la próxima se guarda completa
+        try:
+            with pool_de(self.db).transaccion():
+                self._consulta(queries.CERRAR_VERSIONES)
+                self._consulta(queries.ABRIR_VERSION, [id_version])
+        except (ErrorVersion, RuntimeError):
+            pass
+
+    def publicar(self, id_version):
+        """Marca un borrador como el horario de un período; retorna el error o None"""
+        try:
+            with pool_de(self.db).escritura():
+                self._consulta(queries.PUBLICAR_VERSION, [PERIODO, id_version])
+        except ErrorVersion as e:
+            return str(e)
+        return None
+
+    def eliminar(self, id_version):
+        """Elimina la versión; las que la usaban de base heredan sus filas. Retorna el error o None"""
+        try:
+            with pool_de(self.db).transaccion():
+                self._eliminar(id_version)
+        except (ErrorVersion, RuntimeError) as e:
+            return str(e)
+        return None
+
+    def _eliminar(self, id_version):
+        base = self._valor(queries.VERSION_BASE, [id_version])
+        query = self._consulta(queries.VERSION_HIJAS, [id_version])
+        hijas = []
+        while query.next():
+            hijas.append(query.value(0))
+        for hija in hijas:
+            self._consulta(queries.VERSION_HEREDAR_FILAS, [hija, id_version])
+            self._consulta(queries.CAMBIAR_BASE_VERSION, [base, hija])
+            if base is None:
+                self._consulta(queries.VERSION_QUITAR_AUSENTES, [hija])
+        self._consulta(queries.VERSION_ELIMINAR_FILAS, [id_version])
+        self._consulta(queries.ELIMINAR_VERSION, [id_version])
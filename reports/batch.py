@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter, landscape
+from reports.calendar_report import GRANULARIDAD, VISTAS, cargar_horarios_agrupados, dibujar_calendario
+from reports.jobs import ReporteCancelado, ReporteVacio
+from utils.metrics import medir, REPORTE
+
+# Archivo y título del PDF que reúne todos los calendarios de una vista
+COMBINADOS = {
+    "grupo": ("Horarios_Secciones.pdf", "Horarios de las Secciones"),
+    "profesor": ("Horarios_Profesores.pdf", "Horarios de los Profesores"),
+    "aula": ("Horarios_Aulas.pdf", "Horarios de las Aulas"),
+}
+CALENDARIOS_POR_TAREA = 8   # Calendarios que dibuja cada proceso por envío
+
+def nombre_archivo(nombre):
+    """Nombre de archivo seguro para el horario de una sección, profesor o aula"""
+    limpio = re.sub(r'[^\w\-]+', '_', str(nombre)).strip('_')
+    return f"Horario_{limpio or 'sin_nombre'}.pdf"
+
+def nombres_archivo(nombres):
+    """Nombre de archivo de cada recurso del lote, sin repetir ninguno
+
+    Si dos nombres quedan iguales al limpiarlos (p. ej. difieren sólo en
+    puntuación o en mayúsculas, que Windows no distingue) el segundo lleva
+    un sufijo _2, _3..., para que ningún PDF reemplace a otro.
+    """
+    usados = set()
+    archivos = []
+    for nombre in nombres:
+        archivo = nombre_archivo(nombre)
+        base, extension = os.path.splitext(archivo)
+        sufijo = 1
+        while archivo.casefold() in usados:
+            sufijo += 1
+            archivo = f"{base}_{sufijo}{extension}"
+        usados.add(archivo.casefold())
+        archivos.append(archivo)
+    return archivos
+
+def _sin_avance(actual, total):
+    pass
+
+def _dibujar_calendarios(vista, tareas, granularidad):
+    """Genera un PDF por recurso, se invoca dentro de un proceso trabajador"""
+    for nombre, horarios_por_dia, ruta in tareas:
+        c = canvas.Canvas(ruta, pagesize=landscape(letter))
+        c.setTitle(VISTAS[vista]["documento"].format(nombre))
+        dibujar_calendario(c, vista, nombre, horarios_por_dia, _sin_avance, granularidad)
+        c.save()
+    return len(tareas)
+
+def exportar_calendarios(db, vista, directorio, avance, combinado=False, trabajadores=None,
+                         granularidad=GRANULARIDAD):
+    """Exporta el horario de todas las secciones, profesores o aulas con una sola consulta
+
+    Por defecto genera un PDF por recurso en el directorio, repartiendo el
+    dibujo entre varios procesos. Con combinado=True genera un solo PDF con
+    una página por recurso. Retorna la lista de archivos generados.
+    """
+    with medir(REPORTE, "lote: consulta"):
+        calendarios = cargar_horarios_agrupados(db, vista)
+    if not calendarios:
+        raise ReporteVacio("No hay horarios asignados")
+    total = len(calendarios)
+
+    if combinado:
+        archivo, titulo = COMBINADOS[vista]
+        ruta = os.path.join(directorio, archivo)
+        c = canvas.Canvas(ruta, pagesize=landscape(letter))
+        c.setTitle(titulo)
+        with medir(REPORTE, "lote: maquetación"):
+            for i, (_, nombre, horarios_por_dia) in enumerate(calendarios):
+                dibujar_calendario(c, vista, nombre, horarios_por_dia, _sin_avance, granularidad)
+                c.showPage()
+                avance(i + 1, total)
+        with medir(REPORTE, "lote: guardado"):
+            c.save()
+        return [ruta]
+
+    archivos = nombres_archivo(nombre for _, nombre, _ in calendarios)
+    tareas = [(nombre, horarios_por_dia, os.path.join(directorio, archivo))
+              for (_, nombre, horarios_por_dia), archivo in zip(calendarios, archivos)]
+    lotes = [tareas[i:i + CALENDARIOS_POR_TAREA] for i in range(0, total, CALENDARIOS_POR_TAREA)]
+    trabajadores = max(1, min(trabajadores or os.cpu_count() or 1, len(lotes)))
+
+    # Un archivo por recurso: cada PDF se maqueta y guarda junto, a veces en otro proceso
+    with medir(REPORTE, "lote: maquetación y guardado"):
+        _dibujar_lotes(vista, lotes, granularidad, trabajadores, avance, total)
+    return [ruta for _, _, ruta in tareas]
+
+def _dibujar_lotes(vista, lotes, granularidad, trabajadores, avance, total):
+    """Dibuja los lotes de calendarios, en varios procesos si hay más de un trabajador"""
+    if trabajadores == 1:
+        hechos = 0
+        for lote in lotes:
+            hechos += _dibujar_calendarios(vista, lote, granularidad)
+            avance(hechos, total)
+        return
+
+    contexto = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=trabajadores, mp_context=contexto)
+    try:
+        hechos = 0
+        for futuro in as_completed([executor.submit(_dibujar_calendarios, vista, lote, granularidad) for lote in lotes]):
+            hechos += futuro.result()
+            avance(hechos, total)
+    except ReporteCancelado:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        executor.shutdown(wait=True)
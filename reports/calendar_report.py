@@ -0,0 +1,218 @@
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter, landscape
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from reports.jobs import ReporteVacio
+from utils.metrics import medir, REPORTE
+from utils.time_utils import minutos_a_texto
+
+GRANULARIDAD = 30  # Minutos por fila de la cuadrícula
+
+# Vistas del calendario: recurso por el que se filtra, consultas y
+# campos que se muestran en cada clase además de la asignatura
+VISTAS = {
+    "grupo": {
+        "titulo": "HORARIO DE LA SECCIÓN: {}",
+        "documento": "Horario de la Sección {}",
+        "consulta": queries.HORARIO_GRUPO,
+        "consulta_todos": queries.HORARIOS_TODOS_GRUPOS,
+        "campos": ("profesor", "aula"),
+        "vacio": "No hay horarios asignados para la sección {}",
+    },
+    "profesor": {
+        "titulo": "HORARIO DEL PROFESOR: {}",
+        "documento": "Horario del Profesor {}",
+        "consulta": queries.HORARIO_PROFESOR,
+        "consulta_todos": queries.HORARIOS_TODOS_PROFESORES,
+        "campos": ("seccion", "aula"),
+        "vacio": "No hay horarios asignados para el profesor {}",
+    },
+    "aula": {
+        "titulo": "HORARIO DEL AULA: {}",
+        "documento": "Horario del Aula {}",
+        "consulta": queries.HORARIO_AULA,
+        "consulta_todos": queries.HORARIOS_TODAS_AULAS,
+        "campos": ("seccion", "profesor"),
+        "vacio": "No hay horarios asignados para el aula {}",
+    },
+}
+
+def _dias_vacios():
+    return {
+        1: [], # Lunes
+        2: [], # Martes
+        3: [], # Miércoles
+        4: [], # Jueves
+        5: []  # Viernes
+    }
+
+def _registro(query):
+    """Convierte la fila actual de una consulta de calendario en un registro"""
+    return {
+        'profesor': query.value(2),
+        'asignatura': query.value(3),
+        'seccion': query.value(4),
+        'aula': query.value(5),
+        'dia': query.value(7),
+        'inicio': query.value(8),  # Minutos desde la medianoche
+        'fin': query.value(9),
+        'hora_inicio': minutos_a_texto(query.value(8)),  # Formato 12h con AM/PM
+        'hora_fin': minutos_a_texto(query.value(9))
+    }
+
+def cargar_horario(db, vista, id_recurso):
+    """Retorna los horarios de una sección, profesor o aula organizados por id de día"""
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    query.prepare(VISTAS[vista]["consulta"])
+    query.addBindValue(id_recurso)
+
+    if not query.exec_():
+        raise RuntimeError(f"Error al ejecutar la consulta: {query.lastError().text()}")
+
+    # Organizar horarios por día
+    horarios_por_dia = _dias_vacios()
+    while query.next():
+        id_dia = query.value(6)
+        if id_dia in horarios_por_dia:
+            horarios_por_dia[id_dia].append(_registro(query))
+
+    return horarios_por_dia
+
+def cargar_horarios_agrupados(db, vista):
+    """Retorna [(id, nombre, horarios_por_dia)] de todos los recursos de la vista con una sola consulta"""
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    if not query.exec_(VISTAS[vista]["consulta_todos"]):
+        raise RuntimeError(f"Error al ejecutar la consulta: {query.lastError().text()}")
+
+    # Las filas llegan ordenadas por recurso, se agrupan en una sola pasada
+    calendarios = []
+    while query.next():
+        id_recurso = query.value(0)
+        if not calendarios or calendarios[-1][0] != id_recurso:
+            calendarios.append((id_recurso, query.value(1), _dias_vacios()))
+        id_dia = query.value(6)
+        if id_dia in calendarios[-1][2]:
+            calendarios[-1][2][id_dia].append(_registro(query))
+    return calendarios
+
+def ubicar_clases(horarios_por_dia, hora_inicio, hora_fin, granularidad):
+    """Asigna a cada clase su rango de filas [fila_inicio, fila_fin) en la cuadrícula
+
+    Se calcula una sola vez por clase: el inicio se ajusta hacia abajo y el
+    fin hacia arriba al múltiplo de la granularidad, y las clases fuera del
+    rango visible se recortan o se descartan.
+    """
+    filas = (hora_fin - hora_inicio) // granularidad
+    bloques = []
+    for dia_id, horarios in horarios_por_dia.items():
+        for horario in horarios:
+            fila_inicio = max(0, (horario['inicio'] - hora_inicio) // granularidad)
+            fila_fin = min(filas, -(-(horario['fin'] - hora_inicio) // granularidad))
+            if fila_inicio < fila_fin:
+                bloques.append((dia_id, fila_inicio, fila_fin, horario))
+    return bloques
+
+def dibujar_calendario(c, vista, nombre, horarios_por_dia, avance, granularidad=GRANULARIDAD):
+    """Dibuja en el canvas la página del calendario semanal de una sección, profesor o aula
+
+    granularidad son los minutos de cada fila de la cuadrícula (15, 30 o 60).
+    Cada clase se dibuja como un solo bloque que ocupa todas sus filas.
+    """
+    campo_1, campo_2 = VISTAS[vista]["campos"]
+
+    # Configuración de página
+    margen_izq = 40
+    margen_der = 40
+    margen_sup = 40
+    ancho_pag = landscape(letter)[0]
+    alto_pag = landscape(letter)[1]
+
+    # Configuración de la cuadrícula
+    dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
+    ancho_columna = (ancho_pag - margen_izq - margen_der) / len(dias)
+    alto_hora = 40
+    hora_inicio = 7 * 60   # 7:00 AM
+    hora_fin = 18 * 60     # 6:00 PM
+    filas = (hora_fin - hora_inicio) // granularidad
+    alto_fila = alto_hora * granularidad / 60
+
+    # Dibujar título
+    y = alto_pag - margen_sup
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(margen_izq, y, VISTAS[vista]["titulo"].format(nombre))
+    y -= 40
+
+    # Dibujar encabezados de días
+    c.setFont("Helvetica-Bold", 12)
+    for i, dia in enumerate(dias):
+        x = margen_izq + (i * ancho_columna)
+        c.drawString(x + 10, y, dia)
+
+    y -= 20
+    y_superior = y
+    y_inferior = y_superior - filas * alto_fila
+
+    # Dibujar líneas horizontales y horas; las horas completas van más marcadas
+    c.setFont("Helvetica", 8)
+    for fila in range(filas + 1):
+        minuto = hora_inicio + fila * granularidad
+        y = y_superior - fila * alto_fila
+        if minuto % 60 == 0:
+            c.setStrokeGray(0)
+            if fila < filas:
+                c.drawString(margen_izq - 35, y + 5, minutos_a_texto(minuto))
+        else:
+            c.setStrokeGray(0.8)
+        c.line(margen_izq, y, ancho_pag - margen_der, y)
+    c.setStrokeGray(0)
+
+    # Dibujar líneas verticales para separar días
+    for i in range(len(dias) + 1):
+        x = margen_izq + (i * ancho_columna)
+        c.line(x, y_superior, x, y_inferior)
+
+    # Dibujar cada clase como un bloque del alto de su duración
+    margen_texto = 5
+    linea_altura = 10
+    bloques = ubicar_clases(horarios_por_dia, hora_inicio, hora_fin, granularidad)
+    for n, (dia_id, fila_inicio, fila_fin, horario) in enumerate(bloques):
+        x = margen_izq + ((dia_id - 1) * ancho_columna)
+        y = y_superior - fila_inicio * alto_fila
+        alto = (fila_fin - fila_inicio) * alto_fila
+
+        # Dibujar fondo de la clase
+        c.setFillColorRGB(0.9, 0.9, 0.9)
+        c.rect(x + 1, y - alto + 1, ancho_columna - 2, alto - 2, fill=1)
+        c.setFillColorRGB(0, 0, 0)
+
+        # Dibujar el contenido que cabe dentro del bloque
+        lineas = [
+            ("Helvetica-Bold", 8, horario['asignatura']),
+            ("Helvetica", 7, horario[campo_1]),
+            ("Helvetica", 7, f"{horario[campo_2]}  {horario['hora_inicio']} - {horario['hora_fin']}"),
+        ]
+        visibles = max(1, int((alto - 5) // linea_altura))
+        for k, (fuente, tamano, texto) in enumerate(lineas[:visibles]):
+            c.setFont(fuente, tamano)
+            c.drawString(x + margen_texto, y - 12 - k * linea_altura, texto)
+
+        avance(n + 1, len(bloques))
+
+def generar_reporte_calendario(db, vista, id_recurso, nombre, filename, avance, granularidad=GRANULARIDAD):
+    """Genera un reporte PDF con el horario de una sección, profesor o aula en formato calendario semanal"""
+    with medir(REPORTE, "calendario: consulta"):
+        horarios_por_dia = cargar_horario(db, vista, id_recurso)
+
+    # Verificar si hay horarios
+    if not any(horarios_por_dia.values()):
+        raise ReporteVacio(VISTAS[vista]["vacio"].format(nombre))
+
+    # Generar PDF
+    c = canvas.Canvas(filename, pagesize=landscape(letter))
+    c.setTitle(VISTAS[vista]["documento"].format(nombre))
+    with medir(REPORTE, "calendario: maquetación"):
+        dibujar_calendario(c, vista, nombre, horarios_por_dia, avance, granularidad)
+    with medir(REPORTE, "calendario: guardado"):
+        c.save()
@@ -0,0 +1,154 @@
+from reportlab.pdfgen import canvas
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Frame, Paragraph, Table, TableStyle
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from reports.jobs import ReporteVacio
+from utils.metrics import medir, REPORTE
+from utils.time_utils import minutos_a_texto
+
+FILAS_POR_BLOQUE = 100  # Filas que se leen del cursor y se maquetan por tabla
+
+# Encabezados y anchos de columna
+ENCABEZADOS = ["Profesor", "Asignatura", "Sección", "Aula", "Día", "Hora Inicio", "Hora Fin"]
+ANCHOS = [150, 150, 90, 90, 70, 81, 81]
+COLUMNAS_TEXTO = 5      # Las primeras columnas pueden ocupar varias líneas
+
+FUENTE = "Helvetica"
+TAMANO = 9
+RELLENO = 4             # Relleno horizontal de cada celda en la tabla
+
+MARGEN = 40
+PAGINA = landscape(letter)
+# Líneas por celda: una fila nunca es más alta que una página vacía (menos el título y el encabezado)
+MAX_LINEAS = int((PAGINA[1] - 2 * MARGEN - 60) // (TAMANO + 2))
+
+ESTILO_TITULO = ParagraphStyle("titulo", fontName="Helvetica-Bold", fontSize=14, leading=18, spaceAfter=10)
+
+ESTILO_ENCABEZADO = TableStyle([
+    ("FONT", (0, 0), (-1, -1), "Helvetica-Bold", 10),
+    ("BACKGROUND", (0, 0), (-1, -1), colors.lightgrey),
+    ("ALIGN", (5, 0), (6, -1), "CENTER"),
+    ("LINEBELOW", (0, 0), (-1, -1), 1, colors.black),
+    ("LEFTPADDING", (0, 0), (-1, -1), RELLENO),
+    ("RIGHTPADDING", (0, 0), (-1, -1), RELLENO),
+])
+
+ESTILO_FILAS = TableStyle([
+    ("FONT", (0, 0), (-1, -1), FUENTE, TAMANO, TAMANO + 2),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("ALIGN", (5, 0), (6, -1), "CENTER"),
+    ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.grey),
+    ("LEFTPADDING", (0, 0), (-1, -1), RELLENO),
+    ("RIGHTPADDING", (0, 0), (-1, -1), RELLENO),
+])
+
+def _celda(texto, ancho):
+    """Parte el texto en las líneas que caben en la columna
+
+    Una celda de texto con saltos de línea es mucho más barata de maquetar
+    que un Paragraph, y la mayoría de las celdas caben en una sola línea.
+    Los textos de más de MAX_LINEAS líneas se recortan para que la fila
+    quepa en una página.
+    """
+    texto = "" if texto is None else str(texto)
+    if stringWidth(texto, FUENTE, TAMANO) <= ancho - 2 * RELLENO:
+        return texto
+    lineas = simpleSplit(texto, FUENTE, TAMANO, ancho - 2 * RELLENO)
+    if len(lineas) > MAX_LINEAS:
+        lineas = lineas[:MAX_LINEAS]
+        lineas[-1] = lineas[-1][:-1] + "…"
+    return "\n".join(lineas)
+
+def _bloques(query, total, avance):
+    """Lee el cursor por bloques y retorna una tabla de platypus por bloque
+
+    Sólo un bloque de filas vive en memoria a la vez, sin diccionarios
+    intermedios: cada fila del cursor pasa directo a una fila de la tabla.
+    """
+    leidas = 0
+    filas = []
+    while query.next():
+        fila = [_celda(query.value(i), ANCHOS[i]) for i in range(COLUMNAS_TEXTO)]
+        fila.append(minutos_a_texto(query.value(5)))  # Formato 12h con AM/PM
+        fila.append(minutos_a_texto(query.value(6)))
+        filas.append(fila)
+        if len(filas) == FILAS_POR_BLOQUE:
+            leidas += len(filas)
+            yield Table(filas, colWidths=ANCHOS, style=ESTILO_FILAS)
+            avance(leidas, total)
+            filas = []
+    if filas:
+        leidas += len(filas)
+        yield Table(filas, colWidths=ANCHOS, style=ESTILO_FILAS)
+        avance(leidas, total)
+
+def _contar_horarios(db):
+    query = QSqlQuery(db)
+    if not query.exec_(queries.CONTAR_HORARIOS) or not query.next():
+        raise RuntimeError(f"Error al ejecutar la consulta: {query.lastError().text()}")
+    return query.value(0)
+
+def generar_reporte_completo(db, filename, avance):
+    """Genera un reporte PDF con todos los horarios
+
+    Las filas se leen del cursor y se maquetan por bloques, página a página:
+    la memoria no crece con el número de horarios y el encabezado de la
+    tabla se repite en cada página.
+    """
+    with medir(REPORTE, "completo: consulta"):
+        total = _contar_horarios(db)
+        if not total:
+            raise ReporteVacio("No hay horarios asignados")
+
+        # Consulta SQL para obtener todos los horarios
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        if not query.exec_(queries.REPORTE_COMPLETO):
+            raise RuntimeError(f"Error al ejecutar la consulta: {query.lastError().text()}")
+
+    # Generar PDF
+    c = canvas.Canvas(filename, pagesize=PAGINA, pageCompression=1)
+    c.setTitle("Reporte de Horarios")
+
+    # Configuración de página
+    margen = MARGEN
+    ancho_pag, alto_pag = PAGINA
+    encabezado = Table([ENCABEZADOS], colWidths=ANCHOS, style=ESTILO_ENCABEZADO)
+
+    def nueva_pagina():
+        marco = Frame(margen, margen, ancho_pag - 2 * margen, alto_pag - 2 * margen,
+                      leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0)
+        marco.addFromList([Paragraph("REPORTE DE HORARIOS", ESTILO_TITULO), encabezado], c)
+        return marco
+
+    # Las filas se leen del cursor a medida que se maquetan, la lectura cuenta en esta fase
+    with medir(REPORTE, "completo: maquetación"):
+        marco = nueva_pagina()
+        vacia = True    # Sin filas en la página: si aun así no cabe nada, otra página no ayudaría
+        for tabla in _bloques(query, total, avance):
+            pendientes = [tabla]
+            while pendientes:
+                parte = pendientes.pop(0)
+                if marco.add(parte, c):
+                    vacia = False
+                    continue
+                # La tabla no cabe: se dibuja lo que entra y el resto pasa a la página siguiente
+                partes = marco.split(parte, c)
+                if partes:
+                    marco.add(partes[0], c)
+                    pendientes[:0] = partes[1:]
+                elif vacia:
+                    raise RuntimeError("Una fila del reporte es más alta que una página")
+                else:
+                    pendientes.insert(0, parte)
+                c.showPage()
+                marco = nueva_pagina()
+                vacia = True
+
+    with medir(REPORTE, "completo: guardado"):
+        c.save()
@@ -0,0 +1,54 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+class ReporteCancelado(Exception):
+    """El usuario canceló la generación del reporte"""
+
+class ReporteVacio(Exception):
+    """No hay datos para generar el reporte"""
+
+class ReportSignals(QObject):
+    """Señales de un trabajo de reporte, se entregan en el hilo de la interfaz"""
+    progreso = pyqtSignal(int, int)     # actual, total
+    terminado = pyqtSignal(str)         # ruta del archivo generado
+    error = pyqtSignal(str)
+    cancelado = pyqtSignal()
+
+class ReportJob(QRunnable):
+    """Genera un reporte en un hilo de QThreadPool con su propia conexión de lectura
+
+    La función recibe (db, ruta, avance) y debe llamar avance(actual, total)
+    periódicamente: además de informar el progreso, es el punto donde se
+    interrumpe el trabajo si se pidió cancelarlo.
+    """
+
+    def __init__(self, pool, funcion, ruta):
+        super().__init__()
+        self.pool = pool
+        self.funcion = funcion
+        self.ruta = ruta
+        self.signals = ReportSignals()
+        self._cancelar = threading.Event()
+
+    def cancelar(self):
+        """Solicita detener el trabajo en el próximo punto de avance"""
+        self._cancelar.set()
+
+    def avance(self, actual, total):
+        if self._cancelar.is_set():
+            raise ReporteCancelado()
+        self.signals.progreso.emit(actual, total)
+
+    def run(self):
+        try:
+            self.funcion(self.pool.lectura(), self.ruta, self.avance)
+        except ReporteCancelado:
+            self.signals.cancelado.emit()
+        except ReporteVacio as e:
+            self.signals.error.emit(str(e))
+        except Exception as e:
+            self.signals.error.emit(f"Error al generar el reporte: {str(e)}")
+        else:
+            self.signals.terminado.emit(self.ruta)
+        finally:
+            self.pool.liberar_hilo()
@@ -0,0 +1,86 @@
+import copy
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scheduler.solver import Solver
+
+# Variantes del solver que se reparten entre los reinicios (portafolio)
+ESTRATEGIAS = [
+    {"max_bloques_dia": None},
+    {"max_bloques_dia": 3},
+]
+
+def derivar_semillas(semilla, cantidad):
+    """Genera de forma reproducible una semilla distinta para cada reinicio"""
+    rng = random.Random(semilla)
+    return [rng.getrandbits(32) for _ in range(cantidad)]
+
+def _resolver(problema, semilla, estrategia, tiempo_limite, max_iteraciones):
+    """Ejecuta un reinicio del solver, se invoca dentro de un proceso trabajador"""
+    max_bloques_dia = estrategia.get("max_bloques_dia")
+    if max_bloques_dia is not None:
+        problema = copy.copy(problema)
+        problema.max_bloques_dia = max_bloques_dia
+    return Solver(problema, semilla, tiempo_limite, max_iteraciones).resolver()
+
+def _sin_avance(actual, total):
+    pass
+
+def resolver_en_paralelo(problema, trabajadores=None, semilla=0, reinicios=None,
+                         tiempo_limite=10.0, max_iteraciones=200000, avance=_sin_avance):
+    """Ejecuta reinicios aleatorios independientes en varios procesos y retorna la mejor Solucion
+
+    Con la misma semilla y el mismo número de reinicios el resultado es
+    reproducible mientras ningún reinicio agote el tiempo límite antes que
+    max_iteraciones. Los empates se resuelven a favor del reinicio de menor
+    índice, sin importar el orden en que terminen los procesos.
+
+    avance(reinicios terminados, total) se llama al terminar cada reinicio;
+    si lanza una excepción se descartan los reinicios pendientes y la
+    excepción se propaga sin esperar a los que están en curso.
+    """
+    trabajadores = max(1, trabajadores or os.cpu_count() or 1)
+    reinicios = max(1, reinicios or trabajadores)
+    semillas = derivar_semillas(semilla, reinicios)
+    tareas = [(problema, semillas[i], ESTRATEGIAS[i % len(ESTRATEGIAS)], tiempo_limite, max_iteraciones)
+              for i in range(reinicios)]
+
+    avance(0, reinicios)
+    if trabajadores == 1:
+        resultados = {}
+        for i, tarea in enumerate(tareas):
+            resultados[i] = _resolver(*tarea)
+            avance(i + 1, reinicios)
+            if resultados[i].puntaje == 0:
+                break
+        return _mejor(resultados)
+
+    resultados = {}
+    contexto = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=trabajadores, mp_context=contexto)
+    try:
+        futuros = {executor.submit(_resolver, *tarea): i for i, tarea in enumerate(tareas)}
+        for futuro in as_completed(futuros):
+            if futuro.cancelled():
+                continue
+            i = futuros[futuro]
+            resultados[i] = futuro.result()
+            avance(len(resultados), reinicios)
+            # Una solución perfecta hace innecesarios los reinicios posteriores,
+            # los anteriores se esperan para conservar el desempate por índice
+            if resultados[i].puntaje == 0:
+                for otro, j in futuros.items():
+                    if j > i:
+                        otro.cancel()
+    except BaseException:
+        # Los procesos en curso terminan solos al agotar su tiempo límite
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    return _mejor(resultados)
+
+def _mejor(resultados):
+    indice = min(resultados, key=lambda i: (resultados[i].puntaje, i))
+    return resultados[indice]
@@ -0,0 +1,83 @@
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.connection_pool import pool_de
+from models.conflict_engine import ConflictEngine, Propuesta, describir
+from models.conflict_index import ConflictIndex
+from scheduler.solver import Problema, Requisito, Aula, Ocupacion
+
+def cargar_problema(db, **opciones):
+    """Construye un Problema con la carga académica pendiente y los horarios ya existentes"""
+    query = QSqlQuery(db)
+
+    aulas = []
+    query.exec_(queries.AULAS_CAPACIDAD)
+    while query.next():
+        capacidad = query.value(1)
+        aulas.append(Aula(query.value(0), capacidad if isinstance(capacidad, int) else None))
+
+    dias = []
+    query.exec_(queries.DIAS_IDS)
+    while query.next():
+        dias.append(query.value(0))
+
+    estudiantes = {}
+    query.exec_(queries.GRUPOS_ESTUDIANTES)
+    while query.next():
+        estudiantes[query.value(0)] = query.value(1) or 0
+
+    # Los horarios existentes se respetan y descuentan horas de la carga
+    ocupados = []
+    minutos_asignados = {}
+    query.exec_(queries.HORARIOS_OCUPADOS)
+    while query.next():
+        ocupado = Ocupacion(query.value(0), query.value(1), query.value(2), query.value(3),
+                            query.value(4), query.value(5))
+        ocupados.append(ocupado)
+        clave = (ocupado.id_grupo, query.value(6), ocupado.id_profesor)
+        minutos_asignados[clave] = minutos_asignados.get(clave, 0) + (ocupado.fin - ocupado.inicio)
+
+    problema = Problema([], aulas, dias, estudiantes, ocupados, **opciones)
+
+    query.exec_(queries.CARGA_ACADEMICA)
+    while query.next():
+        clave = (query.value(0), query.value(1), query.value(2))
+        minutos = query.value(3) * 60 - minutos_asignados.get(clave, 0)
+        pendientes = minutos // problema.duracion_bloque
+        if pendientes > 0:
+            problema.requisitos.append(Requisito(*clave, pendientes))
+
+    return problema
+
+def guardar_solucion(db, solucion):
+    """Inserta en Horarios las asignaciones de la solución en una sola transacción"""
+    if not solucion.asignaciones:
+        return True, ""
+
+    # Los horarios pudieron cambiar mientras se buscaba la solución
+    indice = ConflictIndex()
+    if not indice.cargar(db):
+        return False, "No se pudieron leer los horarios existentes"
+    motor = ConflictEngine(indice)
+    motor.cargar_capacidades(db)
+    conflictos = motor.verificar([Propuesta(n, a.id_profesor, a.id_aula, a.id_grupo, a.id_dia, a.inicio, a.fin)
+                                  for n, a in enumerate(solucion.asignaciones)])
+    if conflictos:
+        return False, f"{len(conflictos)} conflictos con los horarios actuales, p. ej.: {describir(conflictos[0])}"
+
+    query = QSqlQuery(db)
+    query.prepare(queries.INSERTAR_HORARIO)
+    try:
+        with pool_de(db).transaccion():
+            for asignacion in solucion.asignaciones:
+                query.addBindValue(asignacion.id_profesor)
+                query.addBindValue(asignacion.id_asignatura)
+                query.addBindValue(asignacion.id_grupo)
+                query.addBindValue(asignacion.id_aula)
+                query.addBindValue(asignacion.id_dia)
+                query.addBindValue(asignacion.inicio)
+                query.addBindValue(asignacion.fin)
+                if not query.exec_():
+                    raise RuntimeError(query.lastError().text())
+    except RuntimeError as e:
+        return False, str(e)
+    return True, ""
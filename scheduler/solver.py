@@ -0,0 +1,275 @@
+import random
+import time
+from collections import namedtuple
+
+Requisito = namedtuple("Requisito", "id_grupo id_asignatura id_profesor horas")
+Aula = namedtuple("Aula", "id_aula capacidad")
+Ocupacion = namedtuple("Ocupacion", "id_profesor id_aula id_grupo id_dia inicio fin")
+Asignacion = namedtuple("Asignacion", "id_grupo id_asignatura id_profesor id_aula id_dia inicio fin")
+
+# Marca de las celdas ocupadas por horarios existentes, que el solver no puede mover
+FIJO = -1
+
+class Problema:
+    """Datos de entrada del generador automático de horarios"""
+
+    def __init__(self, requisitos, aulas, dias, estudiantes=None, ocupados=None,
+                 hora_inicio=7 * 60, hora_fin=18 * 60, duracion_bloque=60, max_bloques_dia=2):
+        self.requisitos = list(requisitos)
+        self.aulas = list(aulas)
+        self.dias = list(dias)
+        self.estudiantes = dict(estudiantes or {})
+        self.ocupados = list(ocupados or [])
+        self.duracion_bloque = duracion_bloque
+        self.max_bloques_dia = max_bloques_dia
+        self.bloques = [(inicio, inicio + duracion_bloque)
+                        for inicio in range(hora_inicio, hora_fin - duracion_bloque + 1, duracion_bloque)]
+
+class Solucion:
+    """Resultado de una ejecución del solver"""
+
+    def __init__(self, asignaciones, sin_asignar, puntaje, iteraciones, segundos, semilla=None):
+        self.asignaciones = asignaciones
+        self.sin_asignar = sin_asignar      # Requisito -> horas que no se pudieron ubicar
+        self.puntaje = puntaje              # Menor es mejor, 0 es una solución perfecta
+        self.iteraciones = iteraciones
+        self.segundos = segundos
+        self.semilla = semilla
+
+    @property
+    def completa(self):
+        return not self.sin_asignar
+
+class Solver:
+    """Generador de horarios por construcción voraz y búsqueda local con cadenas de expulsión
+
+    Cada hora semanal de un requisito es una sesión de un bloque que debe ocupar
+    una celda (día, bloque) y un aula. Un profesor, una sección o un aula nunca
+    comparten celda, lo que garantiza las restricciones unique_horario_profesor y
+    unique_horario_aula de la tabla Horarios.
+    """
+
+    PENALIZACION_SIN_ASIGNAR = 1000
+
+    def __init__(self, problema, semilla=None, tiempo_limite=10.0, max_iteraciones=200000):
+        self.problema = problema
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.tiempo_limite = tiempo_limite
+        self.max_iteraciones = max_iteraciones
+
+    def resolver(self):
+        """Busca una asignación completa y retorna la mejor Solucion encontrada"""
+        comienzo = time.perf_counter()
+        self._preparar()
+
+        pendientes = self._ordenar_sesiones()
+        for sesion in pendientes:
+            self._ubicar_voraz(sesion)
+
+        iteraciones = self._busqueda_local(comienzo)
+        return self._construir_solucion(iteraciones, time.perf_counter() - comienzo)
+
+    # Preparación del estado
+
+    def _preparar(self):
+        problema = self.problema
+        self.celdas = [(d, b) for d in range(len(problema.dias)) for b in range(len(problema.bloques))]
+
+        # Una sesión por cada hora requerida
+        self.sesiones = []
+        for indice, requisito in enumerate(problema.requisitos):
+            self.sesiones.extend([indice] * max(0, requisito.horas))
+
+        # Aulas con capacidad suficiente, de menor a mayor (mejor ajuste)
+        aulas = sorted(problema.aulas, key=lambda a: (a.capacidad is None, a.capacidad or 0, a.id_aula))
+        self.aulas_por_grupo = {}
+        for requisito in problema.requisitos:
+            if requisito.id_grupo not in self.aulas_por_grupo:
+                necesarios = problema.estudiantes.get(requisito.id_grupo) or 0
+                self.aulas_por_grupo[requisito.id_grupo] = [
+                    a.id_aula for a in aulas if a.capacidad is None or a.capacidad >= necesarios]
+
+        self.asignacion = [None] * len(self.sesiones)
+        self.profesor = {}      # (id_profesor, d, b) -> sesión
+        self.grupo = {}         # (id_grupo, d, b) -> sesión
+        self.aula = {}          # (id_aula, d, b) -> sesión
+        self.por_dia = {}       # (requisito, d) -> bloques asignados
+
+        posicion_dia = {id_dia: d for d, id_dia in enumerate(problema.dias)}
+        for ocupado in problema.ocupados:
+            d = posicion_dia.get(ocupado.id_dia)
+            if d is None:
+                continue
+            for b, (inicio, fin) in enumerate(problema.bloques):
+                if inicio < ocupado.fin and fin > ocupado.inicio:
+                    self.profesor[(ocupado.id_profesor, d, b)] = FIJO
+                    self.grupo[(ocupado.id_grupo, d, b)] = FIJO
+                    self.aula[(ocupado.id_aula, d, b)] = FIJO
+
+    def _ordenar_sesiones(self):
+        """Ordena las sesiones de la más restringida a la menos restringida"""
+        carga_profesor = {}
+        carga_grupo = {}
+        for requisito in self.problema.requisitos:
+            carga_profesor[requisito.id_profesor] = carga_profesor.get(requisito.id_profesor, 0) + requisito.horas
+            carga_grupo[requisito.id_grupo] = carga_grupo.get(requisito.id_grupo, 0) + requisito.horas
+
+        def prioridad(sesion):
+            requisito = self.problema.requisitos[self.sesiones[sesion]]
+            return (-carga_profesor[requisito.id_profesor] - carga_grupo[requisito.id_grupo],
+                    len(self.aulas_por_grupo[requisito.id_grupo]),
+                    self.rng.random())
+
+        return sorted(range(len(self.sesiones)), key=prioridad)
+
+    # Operaciones sobre el estado
+
+    def _asignar(self, sesion, d, b, id_aula):
+        indice = self.sesiones[sesion]
+        requisito = self.problema.requisitos[indice]
+        self.asignacion[sesion] = (d, b, id_aula)
+        self.profesor[(requisito.id_profesor, d, b)] = sesion
+        self.grupo[(requisito.id_grupo, d, b)] = sesion
+        self.aula[(id_aula, d, b)] = sesion
+        self.por_dia[(indice, d)] = self.por_dia.get((indice, d), 0) + 1
+
+    def _liberar(self, sesion):
+        d, b, id_aula = self.asignacion[sesion]
+        indice = self.sesiones[sesion]
+        requisito = self.problema.requisitos[indice]
+        self.asignacion[sesion] = None
+        del self.profesor[(requisito.id_profesor, d, b)]
+        del self.grupo[(requisito.id_grupo, d, b)]
+        del self.aula[(id_aula, d, b)]
+        self.por_dia[(indice, d)] -= 1
+
+    def _aula_libre(self, requisito, d, b):
+        for id_aula in self.aulas_por_grupo[requisito.id_grupo]:
+            if (id_aula, d, b) not in self.aula:
+                return id_aula
+        return None
+
+    def _ubicar_voraz(self, sesion):
+        """Ubica la sesión en la celda libre que mejor reparte la carga semanal"""
+        indice = self.sesiones[sesion]
+        requisito = self.problema.requisitos[indice]
+        mejor = None
+        mejor_costo = None
+
+        for d, b in self.celdas:
+            if (requisito.id_profesor, d, b) in self.profesor or (requisito.id_grupo, d, b) in self.grupo:
+                continue
+            en_dia = self.por_dia.get((indice, d), 0)
+            if en_dia >= self.problema.max_bloques_dia:
+                continue
+            id_aula = self._aula_libre(requisito, d, b)
+            if id_aula is None:
+                continue
+
+            costo = (en_dia, self.rng.random())
+            if mejor_costo is None or costo < mejor_costo:
+                mejor, mejor_costo = (d, b, id_aula), costo
+
+        if mejor is not None:
+            self._asignar(sesion, *mejor)
+
+    def _bloqueadores(self, sesion, d, b):
+        """Retorna (aula, sesiones a expulsar) para ocupar la celda, o None si es imposible"""
+        indice = self.sesiones[sesion]
+        requisito = self.problema.requisitos[indice]
+        if self.por_dia.get((indice, d), 0) >= self.problema.max_bloques_dia:
+            return None
+
+        expulsar = set()
+        for ocupante in (self.profesor.get((requisito.id_profesor, d, b)),
+                         self.grupo.get((requisito.id_grupo, d, b))):
+            if ocupante == FIJO:
+                return None
+            if ocupante is not None:
+                expulsar.add(ocupante)
+
+        # Se prefiere un aula libre o la que ya ocupa alguna sesión expulsada
+        mejor_aula = None
+        for id_aula in self.aulas_por_grupo[requisito.id_grupo]:
+            ocupante = self.aula.get((id_aula, d, b))
+            if ocupante is None or ocupante in expulsar:
+                return id_aula, expulsar
+            if ocupante != FIJO and mejor_aula is None:
+                mejor_aula = (id_aula, ocupante)
+
+        if mejor_aula is None:
+            return None
+        expulsar.add(mejor_aula[1])
+        return mejor_aula[0], expulsar
+
+    # Búsqueda local
+
+    def _busqueda_local(self, comienzo):
+        sin_asignar = [s for s, valor in enumerate(self.asignacion) if valor is None]
+        mejor_faltantes = len(sin_asignar)
+        self.mejor_asignacion = list(self.asignacion)
+        tabu = {}
+        iteracion = 0
+
+        while sin_asignar and iteracion < self.max_iteraciones:
+            if iteracion % 256 == 0 and time.perf_counter() - comienzo > self.tiempo_limite:
+                break
+            iteracion += 1
+
+            sesion = sin_asignar.pop(self.rng.randrange(len(sin_asignar)))
+            candidatos = []
+            menor = None
+            for d, b in self.celdas:
+                resultado = self._bloqueadores(sesion, d, b)
+                if resultado is None:
+                    continue
+                id_aula, expulsar = resultado
+                if any(tabu.get(s, 0) > iteracion for s in expulsar):
+                    continue
+                if menor is None or len(expulsar) < menor:
+                    menor, candidatos = len(expulsar), []
+                if len(expulsar) == menor:
+                    candidatos.append((d, b, id_aula, expulsar))
+
+            if not candidatos:
+                sin_asignar.append(sesion)
+                continue
+
+            d, b, id_aula, expulsar = self.rng.choice(candidatos)
+            for otra in expulsar:
+                self._liberar(otra)
+                sin_asignar.append(otra)
+            self._asignar(sesion, d, b, id_aula)
+            tabu[sesion] = iteracion + 10 + self.rng.randrange(10)
+
+            if len(sin_asignar) < mejor_faltantes:
+                mejor_faltantes = len(sin_asignar)
+                self.mejor_asignacion = list(self.asignacion)
+
+        if not sin_asignar:
+            self.mejor_asignacion = list(self.asignacion)
+        return iteracion
+
+    def _construir_solucion(self, iteraciones, segundos):
+        problema = self.problema
+        asignaciones = []
+        sin_asignar = {}
+        repetidas = {}
+
+        for sesion, valor in enumerate(self.mejor_asignacion):
+            requisito = problema.requisitos[self.sesiones[sesion]]
+            if valor is None:
+                sin_asignar[requisito] = sin_asignar.get(requisito, 0) + 1
+                continue
+            d, b, id_aula = valor
+            inicio, fin = problema.bloques[b]
+            asignaciones.append(Asignacion(requisito.id_grupo, requisito.id_asignatura,
+                                           requisito.id_profesor, id_aula, problema.dias[d], inicio, fin))
+            repetidas[(requisito, d)] = repetidas.get((requisito, d), 0) + 1
+
+        # Penalización suave: más de un bloque de la misma asignatura en el día
+        penalizacion = sum(n - 1 for n in repetidas.values() if n > 1)
+        puntaje = sum(sin_asignar.values()) * self.PENALIZACION_SIN_ASIGNAR + penalizacion
+        asignaciones.sort(key=lambda a: (a.id_grupo, a.id_dia, a.inicio))
+        return Solucion(asignaciones, sin_asignar, puntaje, iteraciones, segundos, self.semilla)
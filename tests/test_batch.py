@@ -0,0 +1,40 @@
+import os
+import sys
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtSql import QSqlQuery
+from database import queries
+from database.db_manager import DatabaseManager
+from reports.batch import exportar_calendarios, nombres_archivo
+
+def test_nombres_que_se_limpian_igual_no_se_repiten():
+    assert nombres_archivo(["6to A", "6to A.", "6TO_A", "Otra"]) == [
+        "Horario_6to_A.pdf", "Horario_6to_A_2.pdf", "Horario_6TO_A_3.pdf", "Horario_Otra.pdf"]
+
+def test_sufijo_no_choca_con_otro_nombre():
+    assert nombres_archivo(["A", "A.", "A 2"]) == ["Horario_A.pdf", "Horario_A_2.pdf", "Horario_A_2_2.pdf"]
+
+def _ejecutar(db, sql, valores):
+    query = QSqlQuery(db)
+    query.prepare(sql)
+    for valor in valores:
+        query.addBindValue(valor)
+    assert query.exec_(), query.lastError().text()
+
+def test_exportar_secciones_con_nombres_parecidos(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager = DatabaseManager(str(tmp_path / "horarios.db"))
+    assert db_manager.init_db()
+    db = db_manager.get_connection()
+    _ejecutar(db, queries.INSERTAR_PROFESOR, ["Ana", "Pérez"])
+    _ejecutar(db, queries.INSERTAR_ASIGNATURA, ["Matemática", ""])
+    _ejecutar(db, queries.INSERTAR_AULA, ["Aula 1", 30])
+    _ejecutar(db, queries.INSERTAR_GRUPO, ["6to A", "", 25])
+    _ejecutar(db, queries.INSERTAR_GRUPO, ["6to A.", "", 25])
+    _ejecutar(db, queries.INSERTAR_HORARIO, [1, 1, 1, 1, 1, 480, 540])
+    _ejecutar(db, queries.INSERTAR_HORARIO, [1, 1, 2, 1, 2, 480, 540])
+
+    rutas = exportar_calendarios(db, "grupo", str(tmp_path), lambda actual, total: None, trabajadores=1)
+    db_manager.close()
+
+    assert len(set(rutas)) == 2
+    assert all(os.path.getsize(ruta) > 0 for ruta in rutas)
@@ -0,0 +1,29 @@
+import sys
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtSql import QSqlQuery
+from database.db_manager import DatabaseManager
+from database.query_plans import consultas_registradas, verificar_planes
+
+def _base_nueva():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager = DatabaseManager(":memory:")
+    assert db_manager.init_db()
+    return app, db_manager
+
+def test_consultas_filtradas_registradas():
+    filtradas = [nombre for nombre, _ in consultas_registradas() if nombre.startswith("HORARIOS_IDS_FILTRADOS[")]
+    assert {nombre.split("[")[1].split(",")[0] for nombre in filtradas} == {
+        "id_profesor", "id_grupo", "id_aula", "id_dia"}
+
+def test_todas_las_consultas_usan_indices():
+    app, db_manager = _base_nueva()
+    assert verificar_planes(db_manager.get_connection()) == []
+    db_manager.close()
+
+def test_filtro_sin_indice_se_detecta():
+    app, db_manager = _base_nueva()
+    db = db_manager.get_connection()
+    assert QSqlQuery(db).exec_("DROP INDEX idx_horarios_grupo_dia")
+    problemas = {nombre for nombre, _ in verificar_planes(db)}
+    assert "HORARIOS_IDS_FILTRADOS[id_grupo, 0]" in problemas
+    db_manager.close()
@@ -0,0 +1,32 @@
+from models.versions import comparar, describir_faltantes
+
+LUNES_8 = (1, 2, 3, 4, 1, 480, 540)
+LUNES_10 = (1, 2, 3, 4, 1, 600, 660)
+MARTES_8 = (1, 2, 3, 5, 2, 480, 540)
+
+def test_clase_agregada_igual_con_otro_id_no_cambia():
+    diferencias = comparar({1: LUNES_8}, {9: LUNES_8})
+    assert diferencias.agregadas == []
+    assert diferencias.eliminadas == []
+    assert diferencias.movidas == []
+
+def test_clase_agregada_igual_no_se_empareja_con_otra_movida():
+    diferencias = comparar({1: LUNES_8, 2: LUNES_10}, {9: LUNES_10, 8: MARTES_8})
+    assert diferencias.agregadas == []
+    assert diferencias.eliminadas == []
+    assert diferencias.movidas == [(1, LUNES_8, MARTES_8)]
+
+def test_clase_agregada_con_otro_id_y_otra_hora_se_mueve():
+    diferencias = comparar({1: LUNES_8}, {9: MARTES_8})
+    assert diferencias.movidas == [(1, LUNES_8, MARTES_8)]
+
+def test_cambio_de_profesor_no_es_movida():
+    otro_profesor = (7,) + LUNES_8[1:]
+    diferencias = comparar({1: LUNES_8}, {1: otro_profesor})
+    assert diferencias.agregadas == [(1, otro_profesor)]
+    assert diferencias.eliminadas == [(1, LUNES_8)]
+    assert diferencias.movidas == []
+
+def test_describir_faltantes_nombra_los_ids_por_catalogo():
+    assert describir_faltantes({"Aulas": {2}, "Profesores": {7, 3}}) == "profesores #3, #7; aulas #2"
+    assert describir_faltantes({"Grupos": set(range(1, 8))}) == "secciones #1, #2, #3, #4, #5 y 2 más"
@@ -0,0 +1,111 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QProgressDialog)
+from models.conflict_engine import auditar, exportar_auditoria, filas_auditoria
+from utils.dialog_utils import show_error
+
+# Trabajos en curso; se conserva la referencia hasta que terminan
+_trabajos = set()
+
+class AuditoriaSignals(QObject):
+    terminado = pyqtSignal(list)    # Filas (conflicto, horario, otro horario)
+    error = pyqtSignal(str)
+
+class AuditoriaJob(QRunnable):
+    """Audita todos los horarios en un hilo de QThreadPool con su propia conexión de lectura"""
+
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+        self.signals = AuditoriaSignals()
+
+    def _auditar(self):
+        db = self.pool.lectura()
+        return filas_auditoria(db, auditar(db))
+
+    def run(self):
+        try:
+            filas = self._auditar()
+        except RuntimeError as e:
+            self.signals.error.emit(str(e))
+        except Exception as e:
+            self.signals.error.emit(f"Error al auditar los horarios: {str(e)}")
+        else:
+            self.signals.terminado.emit(filas)
+        finally:
+            self.pool.liberar_hilo()
+
+def auditar_horarios(parent, pool):
+    """Busca en segundo plano los conflictos de toda la base de datos y los muestra al terminar"""
+    job = AuditoriaJob(pool)
+    job.setAutoDelete(False)
+
+    dialogo = QProgressDialog("Buscando conflictos en todos los horarios...", None, 0, 0, parent)
+    dialogo.setMinimumDuration(500)
+
+    def finalizar():
+        dialogo.close()
+        dialogo.deleteLater()
+        _trabajos.discard(job)
+
+    def terminado(filas):
+        finalizar()
+        if not filas:
+            QMessageBox.information(parent, "Auditoría", "No se encontraron conflictos")
+            return
+        AuditDialog(filas, parent).exec_()
+
+    def error(mensaje):
+        finalizar()
+        show_error(parent, mensaje)
+
+    job.signals.terminado.connect(terminado)
+    job.signals.error.connect(error)
+
+    _trabajos.add(job)
+    QThreadPool.globalInstance().start(job)
+    return job
+
+class AuditDialog(QDialog):
+    """Lista los conflictos encontrados por la auditoría"""
+
+    def __init__(self, filas, parent=None):
+        super().__init__(parent)
+        self.filas = filas
+        self.setWindowTitle("Conflictos de Horario")
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{len(filas)} conflictos encontrados"))
+
+        tabla = QTableWidget(len(filas), 3)
+        tabla.setHorizontalHeaderLabels(["Conflicto", "Horario", "Otro Horario"])
+        tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tabla.horizontalHeader().setStretchLastSection(True)
+        for row, fila in enumerate(filas):
+            for col, valor in enumerate(fila):
+                tabla.setItem(row, col, QTableWidgetItem(valor))
+        layout.addWidget(tabla)
+
+        botones = QHBoxLayout()
+        exportar_btn = QPushButton("Exportar CSV...")
+        exportar_btn.clicked.connect(self.exportar)
+        cerrar_btn = QPushButton("Cerrar")
+        cerrar_btn.clicked.connect(self.close)
+        botones.addWidget(exportar_btn)
+        botones.addStretch()
+        botones.addWidget(cerrar_btn)
+        layout.addLayout(botones)
+
+    def exportar(self):
+        ruta, _ = QFileDialog.getSaveFileName(self, "Exportar Conflictos", "conflictos.csv", "CSV (*.csv)")
+        if not ruta:
+            return
+        try:
+            exportar_auditoria(ruta, self.filas)
+        except OSError as e:
+            show_error(self, f"No se pudo guardar el archivo: {e}")
+            return
+        QMessageBox.information(self, "Éxito", f"Conflictos guardados en: {ruta}")
@@ -0,0 +1,38 @@
+from models.edit_session import ErrorEdicion
+from utils.dialog_utils import show_error, confirm_action
+
+def ids_seleccionados(table):
+    """Retorna el id (columna 0) de cada fila seleccionada en la tabla de un catálogo"""
+    model = table.model()
+    filas = sorted({index.row() for index in table.selectedIndexes()})
+    return [model.index(row, 0).data() for row in filas]
+
+def eliminar_seleccionados(parent, model_manager, table, tabla, descripcion):
+    """Elimina en una sola transacción las filas seleccionadas en la tabla del catálogo
+
+    descripcion nombra las filas en plural, p. ej. "los profesores
+    seleccionados". Si tienen horarios o cargas académicas asignados se pide
+    confirmar que se eliminen también; si no, no se elimina nada. Retorna
+    True si se eliminaron.
+    """
+    sesion = model_manager.sesion(tabla)
+    sesion.eliminar(ids_seleccionados(table))
+    try:
+        dependencias = sesion.dependencias()
+    except ErrorEdicion as e:
+        show_error(parent, f"Error al buscar los horarios asignados: {e}")
+        return False
+
+    horarios = sum(len(ids) for ids in dependencias.horarios.values())
+    cargas = sum(len(ids) for ids in dependencias.cargas.values())
+    asignadas = [texto for cantidad, texto in ((horarios, f"{horarios} clases en el horario"),
+                                               (cargas, f"{cargas} cargas académicas")) if cantidad]
+    if asignadas and not confirm_action(parent, f"{descripcion.capitalize()} tienen {' y '.join(asignadas)}."
+                                                "\n¿Desea eliminarlas también?"):
+        return False
+
+    error = sesion.confirmar(cascada=bool(asignadas))
+    if error:
+        show_error(parent, f"Error al eliminar {descripcion}: {error}")
+        return False
+    return True
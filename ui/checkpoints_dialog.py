@@ -0,0 +1,80 @@
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
+                             QListWidgetItem, QInputDialog, QMessageBox)
+from utils.dialog_utils import show_error, confirm_action
+
+class CheckpointsDialog(QDialog):
+    """Puntos de control de una sesión de planificación: se crean y se vuelve a ellos"""
+
+    def __init__(self, diario, motor, parent=None):
+        super().__init__(parent)
+        self.diario = diario
+        self.motor = motor      # ConflictEngine para verificar los horarios que se restauran
+        self.setWindowTitle("Puntos de Control")
+        self.resize(500, 400)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Volver a un punto de control deshace todos los cambios posteriores;\n"
+                                "los cambios deshechos se pueden rehacer."))
+        self.lista = QListWidget()
+        layout.addWidget(self.lista)
+
+        botones = QHBoxLayout()
+        crear_btn = QPushButton("Crear...")
+        crear_btn.clicked.connect(self.crear)
+        volver_btn = QPushButton("Volver a este punto")
+        volver_btn.clicked.connect(self.volver)
+        eliminar_btn = QPushButton("Eliminar")
+        eliminar_btn.clicked.connect(self.eliminar)
+        cerrar_btn = QPushButton("Cerrar")
+        cerrar_btn.clicked.connect(self.close)
+        for boton in (crear_btn, volver_btn, eliminar_btn):
+            botones.addWidget(boton)
+        botones.addStretch()
+        botones.addWidget(cerrar_btn)
+        layout.addLayout(botones)
+
+        self.actualizar()
+
+    def actualizar(self):
+        self.lista.clear()
+        for id_punto, nombre, momento, _ in self.diario.puntos():
+            item = QListWidgetItem(f"{nombre} ({time.strftime('%d/%m/%Y %H:%M', time.localtime(momento))})")
+            item.setData(Qt.UserRole, id_punto)
+            self.lista.addItem(item)
+
+    def _seleccionado(self):
+        item = self.lista.currentItem()
+        if item is None:
+            show_error(self, "Por favor seleccione un punto de control")
+            return None
+        return item.data(Qt.UserRole)
+
+    def crear(self):
+        nombre, ok = QInputDialog.getText(self, "Crear Punto de Control", "Nombre:")
+        if not ok or not nombre.strip():
+            return
+        error = self.diario.crear_punto(nombre.strip())
+        if error:
+            show_error(self, f"Error al crear el punto de control: {error}")
+        self.actualizar()
+
+    def volver(self):
+        id_punto = self._seleccionado()
+        if id_punto is None or not confirm_action(self, "¿Desea volver los horarios a este punto de control?"):
+            return
+        error = self.diario.volver_a_punto(id_punto, self.motor)
+        if error:
+            show_error(self, error)
+            return
+        QMessageBox.information(self, "Éxito", "Los horarios volvieron al punto de control")
+
+    def eliminar(self):
+        id_punto = self._seleccionado()
+        if id_punto is None:
+            return
+        error = self.diario.eliminar_punto(id_punto)
+        if error:
+            show_error(self, f"Error al eliminar el punto de control: {error}")
+        self.actualizar()
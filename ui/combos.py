@@ -0,0 +1,31 @@
+from PyQt5.QtCore import QObject
+
+class _VolverAlPrimero(QObject):
+    """Si se va a quitar el elemento elegido en el combo, elige antes el primero
+
+    Es lo que hacía el combo al volver a llenarse, y con una opción "Todos"
+    deja de filtrar en lugar de pasar al elemento vecino. Vive como hijo
+    del combo, así que la conexión con el modelo compartido termina con él.
+    """
+
+    def __init__(self, combo):
+        super().__init__(combo)
+        self.combo = combo
+
+    def antes_de_quitar(self, parent, inicio, fin):
+        if inicio > 0 and inicio <= self.combo.currentIndex() <= fin:
+            self.combo.setCurrentIndex(0)
+
+def mostrar_catalogo(combo, referencias, tabla, todos=None):
+    """Muestra en el combo el catálogo compartido de la ReferenceCache
+
+    El modelo se mantiene al día con los cambios publicados en el bus, así
+    que el combo no se vuelve a llenar. Con todos se agrega primero una
+    opción sin id, por ejemplo para no filtrar.
+    """
+    modelo = referencias.modelo(tabla, todos)
+    combo.blockSignals(True)
+    combo.setModel(modelo)
+    combo.setCurrentIndex(0 if combo.count() else -1)
+    combo.blockSignals(False)
+    modelo.rowsAboutToBeRemoved.connect(_VolverAlPrimero(combo).antes_de_quitar)
@@ -0,0 +1,96 @@
+import time
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox)
+from utils.dialog_utils import show_error
+from utils.metrics import metricas, CONSULTA
+
+CONSULTAS_LENTAS = 20
+
+def _ms(segundos):
+    return f"{segundos * 1000:.1f}"
+
+class DiagnosticsDialog(QDialog):
+    """Panel oculto de rendimiento (Ctrl+Shift+D): latencias por operación y consultas más lentas"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de rendimiento")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+        self.estado = QLabel()
+        layout.addWidget(self.estado)
+
+        layout.addWidget(QLabel("Latencias por operación (ms):"))
+        self.tabla_resumen = self._tabla(["Categoría", "Operación", "Cantidad", "p50", "p95", "Máximo"])
+        layout.addWidget(self.tabla_resumen)
+
+        layout.addWidget(QLabel(f"Las {CONSULTAS_LENTAS} consultas más lentas:"))
+        self.tabla_lentas = self._tabla(["Hora", "ms", "Consulta"])
+        layout.addWidget(self.tabla_lentas)
+
+        botones = QHBoxLayout()
+        actualizar_btn = QPushButton("Actualizar")
+        actualizar_btn.clicked.connect(self.actualizar)
+        exportar_btn = QPushButton("Exportar...")
+        exportar_btn.clicked.connect(self.exportar)
+        limpiar_btn = QPushButton("Limpiar")
+        limpiar_btn.clicked.connect(self.limpiar)
+        cerrar_btn = QPushButton("Cerrar")
+        cerrar_btn.clicked.connect(self.close)
+        for boton in (actualizar_btn, exportar_btn, limpiar_btn):
+            botones.addWidget(boton)
+        botones.addStretch()
+        botones.addWidget(cerrar_btn)
+        layout.addLayout(botones)
+
+        self.actualizar()
+
+    def _tabla(self, encabezados):
+        tabla = QTableWidget(0, len(encabezados))
+        tabla.setHorizontalHeaderLabels(encabezados)
+        tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        tabla.verticalHeader().setVisible(False)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tabla.horizontalHeader().setStretchLastSection(True)
+        return tabla
+
+    def _llenar(self, tabla, filas):
+        tabla.setRowCount(len(filas))
+        for row, fila in enumerate(filas):
+            for col, valor in enumerate(fila):
+                item = QTableWidgetItem(valor)
+                item.setToolTip(valor)
+                tabla.setItem(row, col, item)
+
+    def actualizar(self):
+        """Vuelve a leer las mediciones registradas"""
+        resumen = metricas.resumen()
+        self._llenar(self.tabla_resumen, [
+            (categoria, nombre, str(cantidad), _ms(p50), _ms(p95), _ms(maximo))
+            for categoria, nombre, cantidad, p50, p95, maximo in resumen
+        ])
+        self._llenar(self.tabla_lentas, [
+            (time.strftime("%H:%M:%S", time.localtime(momento)), _ms(segundos), nombre)
+            for momento, nombre, segundos in metricas.mas_lentas(CONSULTAS_LENTAS, CONSULTA)
+        ])
+        self.estado.setText(f"{len(metricas.mediciones)} mediciones registradas "
+                            f"(se conservan las últimas {metricas.mediciones.maxlen})")
+
+    def exportar(self):
+        """Guarda las mediciones en un archivo, una línea JSON por medición"""
+        ruta, _ = QFileDialog.getSaveFileName(self, "Exportar Métricas", "metricas.jsonl",
+                                              "JSON Lines (*.jsonl);;Todos (*)")
+        if not ruta:
+            return
+        try:
+            metricas.exportar(ruta)
+        except OSError as e:
+            show_error(self, f"No se pudo guardar el archivo: {e}")
+            return
+        QMessageBox.information(self, "Éxito", f"Métricas guardadas en: {ruta}")
+
+    def limpiar(self):
+        metricas.limpiar()
+        self.actualizar()
@@ -0,0 +1,89 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QProgressDialog
+from utils.dialog_utils import show_error
+
+# Trabajos en curso; se conserva la referencia hasta que terminan
+_trabajos = set()
+
+class GeneracionCancelada(Exception):
+    """El usuario canceló la generación de horarios"""
+
+class GeneracionSignals(QObject):
+    progreso = pyqtSignal(int, int)     # reinicios terminados, total
+    terminado = pyqtSignal(object)      # Solucion
+    error = pyqtSignal(str)
+    cancelado = pyqtSignal()
+
+class GeneracionJob(QRunnable):
+    """Resuelve el problema de la carga académica en un hilo de QThreadPool
+
+    Los reinicios del solver corren en procesos aparte; el hilo sólo los
+    espera, así que la interfaz sigue respondiendo. No usa la base de datos:
+    el problema se lee antes y la solución se guarda al terminar, en el
+    hilo de la interfaz.
+    """
+
+    def __init__(self, problema, opciones):
+        super().__init__()
+        self.problema = problema
+        self.opciones = opciones    # Argumentos de resolver_en_paralelo
+        self.signals = GeneracionSignals()
+        self._cancelar = threading.Event()
+
+    def cancelar(self):
+        """Solicita detener la generación al terminar el próximo reinicio"""
+        self._cancelar.set()
+
+    def avance(self, actual, total):
+        if self._cancelar.is_set():
+            raise GeneracionCancelada()
+        self.signals.progreso.emit(actual, total)
+
+    def run(self):
+        from scheduler.parallel import resolver_en_paralelo
+        try:
+            solucion = resolver_en_paralelo(self.problema, avance=self.avance, **self.opciones)
+        except GeneracionCancelada:
+            self.signals.cancelado.emit()
+        except Exception as e:
+            self.signals.error.emit(f"Error al generar los horarios: {e}")
+        else:
+            self.signals.terminado.emit(solucion)
+
+def generar_en_segundo_plano(parent, problema, opciones, al_terminar):
+    """Genera los horarios sin bloquear la interfaz y llama al_terminar(solucion) al acabar"""
+    job = GeneracionJob(problema, opciones)
+    job.setAutoDelete(False)
+
+    dialogo = QProgressDialog("Generando horarios...", "Cancelar", 0, 0, parent)
+    dialogo.setMinimumDuration(500)
+    dialogo.setAutoReset(False)
+    dialogo.canceled.connect(job.cancelar)
+
+    def progreso(actual, total):
+        dialogo.setMaximum(total)
+        dialogo.setValue(actual)
+
+    def finalizar():
+        dialogo.canceled.disconnect(job.cancelar)
+        dialogo.close()
+        dialogo.deleteLater()
+        _trabajos.discard(job)
+
+    def terminado(solucion):
+        finalizar()
+        al_terminar(solucion)
+
+    def error(mensaje):
+        finalizar()
+        show_error(parent, mensaje)
+
+    job.signals.progreso.connect(progreso)
+    job.signals.terminado.connect(terminado)
+    job.signals.error.connect(error)
+    job.signals.cancelado.connect(finalizar)
+
+    _trabajos.add(job)
+    QThreadPool.globalInstance().start(job)
+    return job
@@ -0,0 +1,33 @@
+from PyQt5.QtWidgets import QFileDialog, QMessageBox
+from database.importer import COLUMNAS, importar_archivo
+from utils.dialog_utils import show_error
+
+def importar_desde_archivo(parent, db, tabla):
+    """Importa un archivo CSV o XLSX a la tabla; retorna True si se insertó alguna fila"""
+    ruta, _ = QFileDialog.getOpenFileName(
+        parent,
+        f"Importar {tabla.capitalize()}",
+        "",
+        "Datos (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)"
+    )
+    if not ruta:
+        return False
+
+    try:
+        insertadas, errores = importar_archivo(db, tabla, ruta)
+        if errores:
+            caja = QMessageBox(QMessageBox.Warning, "Importar Datos",
+                               f"{len(errores)} filas tienen errores y no se importó nada.\n"
+                               f"¿Desea importar sólo las filas válidas?",
+                               QMessageBox.Yes | QMessageBox.No, parent)
+            caja.setDetailedText("\n".join(f"Línea {linea}: {mensaje}" for linea, mensaje in errores))
+            if caja.exec_() != QMessageBox.Yes:
+                return False
+            insertadas, errores = importar_archivo(db, tabla, ruta, parcial=True)
+    except (ValueError, OSError, RuntimeError) as e:
+        show_error(parent, f"Error al importar el archivo: {e}\n"
+                           f"Columnas requeridas: {', '.join(COLUMNAS[tabla])}")
+        return False
+
+    QMessageBox.information(parent, "Éxito", f"Se importaron {insertadas} filas")
+    return insertadas > 0
@@ -0,0 +1,19 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+
+class LazyTab(QWidget):
+    """Contenedor de una pestaña que construye su contenido la primera vez que se muestra"""
+
+    def __init__(self, fabrica):
+        super().__init__()
+        self.fabrica = fabrica
+        self.contenido = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def crear(self):
+        """Retorna el contenido de la pestaña, creándolo si todavía no existe"""
+        if self.contenido is None:
+            self.contenido = self.fabrica()
+            self.layout().addWidget(self.contenido)
+        return self.contenido
@@ -0,0 +1,89 @@
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtWidgets import QProgressDialog, QMessageBox, QFileDialog
+from reports.jobs import ReportJob
+from utils.dialog_utils import show_error
+
+# Trabajos en curso; se conserva la referencia hasta que terminan
+_trabajos = set()
+
+def ejecutar_reporte(parent, pool, funcion, ruta, titulo="Generando reporte..."):
+    """Genera un reporte en segundo plano mostrando su progreso, sin bloquear la interfaz"""
+    job = ReportJob(pool, funcion, ruta)
+    job.setAutoDelete(False)
+
+    dialogo = QProgressDialog(titulo, "Cancelar", 0, 0, parent)
+    dialogo.setMinimumDuration(500)
+    dialogo.setAutoReset(False)
+    dialogo.canceled.connect(job.cancelar)
+
+    def progreso(actual, total):
+        dialogo.setMaximum(total)
+        dialogo.setValue(actual)
+
+    def finalizar():
+        dialogo.canceled.disconnect(job.cancelar)
+        dialogo.close()
+        dialogo.deleteLater()
+        _trabajos.discard(job)
+
+    def terminado(ruta):
+        finalizar()
+        QMessageBox.information(parent, "Éxito", f"Reporte guardado en: {ruta}")
+
+    def error(mensaje):
+        finalizar()
+        show_error(parent, mensaje)
+
+    job.signals.progreso.connect(progreso)
+    job.signals.terminado.connect(terminado)
+    job.signals.error.connect(error)
+    job.signals.cancelado.connect(finalizar)
+
+    _trabajos.add(job)
+    QThreadPool.globalInstance().start(job)
+    return job
+
+def generar_calendario(parent, pool, vista, id_recurso, nombre):
+    """Pide el archivo destino y genera el calendario semanal de una sección, profesor o aula"""
+    # reportlab se importa al pedir el primer reporte, no al abrir la aplicación
+    from reports.batch import nombre_archivo
+    from reports.calendar_report import VISTAS, generar_reporte_calendario
+
+    filename, _ = QFileDialog.getSaveFileName(
+        parent,
+        "Guardar Reporte PDF",
+        nombre_archivo(nombre),
+        "PDF Files (*.pdf)"
+    )
+    if not filename:
+        return None
+
+    return ejecutar_reporte(
+        parent, pool,
+        lambda db, ruta, avance: generar_reporte_calendario(db, vista, id_recurso, nombre, ruta, avance),
+        filename, f"Generando {VISTAS[vista]['documento'].format(nombre).lower()}..."
+    )
+
+def exportar_todos(parent, pool, vista):
+    """Exporta en segundo plano los calendarios de todas las secciones, profesores o aulas"""
+    from reports.batch import exportar_calendarios
+
+    directorio = QFileDialog.getExistingDirectory(parent, "Seleccionar Carpeta de Destino")
+    if not directorio:
+        return None
+
+    respuesta = QMessageBox.question(
+        parent, "Exportar Horarios",
+        "¿Desea generar un solo PDF con todos los horarios?\n"
+        "Seleccione «No» para generar un archivo por cada uno.",
+        QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+    )
+    if respuesta == QMessageBox.Cancel:
+        return None
+    combinado = respuesta == QMessageBox.Yes
+
+    return ejecutar_reporte(
+        parent, pool,
+        lambda db, ruta, avance: exportar_calendarios(db, vista, ruta, avance, combinado),
+        directorio, "Exportando horarios..."
+    )
@@ -2,6 +2,9 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QTableView, QMessageBox)
 from PyQt5.QtCore import Qt
 from utils.dialog_utils import show_error, confirm_action
+from ui.catalog_actions import eliminar_seleccionados
+from models.change_bus import RECARGAR
+from ui.import_dialog import importar_desde_archivo
 
 class AsignaturasTab(QWidget):
     def __init__(self, model_manager, db):
@@ -22,6 +25,8 @@ class AsignaturasTab(QWidget):
         btn_add.clicked.connect(self.add_asignatura)
         btn_del = QPushButton("Eliminar")
         btn_del.clicked.connect(self.delete_asignatura)
+        btn_importar = QPushButton("Importar")
+        btn_importar.clicked.connect(self.importar)
 
         form.addWidget(QLabel("Nombre:"))
         form.addWidget(self.asig_nombre)
@@ -29,6 +34,7 @@ class AsignaturasTab(QWidget):
         form.addWidget(self.asig_desc)
         form.addWidget(btn_add)
         form.addWidget(btn_del)
+        form.addWidget(btn_importar)
 
         # Tabla
         self.table = QTableView()
@@ -61,7 +67,6 @@ class AsignaturasTab(QWidget):
         else:
             self.asig_nombre.clear()
             self.asig_desc.clear()
-            self.model_manager.refresh_model("Asignaturas")
 
     def delete_asignatura(self):
         """Elimina la asignatura seleccionada"""
@@ -71,13 +76,11 @@ class AsignaturasTab(QWidget):
             return
 
         if confirm_action(self, "¿Está seguro de eliminar esta asignatura?"):
-            model = self.model_manager.get_model("Asignaturas")
-            for index in indexes:
-                if index.column() == 0:  # Solo eliminar una vez por fila
-                    model.removeRow(index.row())
-            
-            if not model.submitAll():
-                show_error(self, "Error al eliminar asignatura")
-                model.revertAll()
-            else:
-                self.model_manager.refresh_model("Asignaturas") 
\ No newline at end of file
+            # Una sola transacción para todas las filas; los modelos se actualizan con el bus
+            eliminar_seleccionados(self, self.model_manager, self.table, "Asignaturas",
+                                   "las asignaturas seleccionadas")
+
+    def importar(self):
+        """Importa asignaturas desde un archivo CSV o XLSX"""
+        if importar_desde_archivo(self, self.db, "asignaturas"):
+            self.model_manager.bus.publicar("Asignaturas", RECARGAR)
@@ -3,12 +3,17 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QSpinBox)
 from PyQt5.QtCore import Qt
 from utils.dialog_utils import show_error, confirm_action
+from ui.catalog_actions import eliminar_seleccionados
+from ui.report_runner import generar_calendario, exportar_todos
+from models.change_bus import RECARGAR
+from ui.import_dialog import importar_desde_archivo
 
 class AulasTab(QWidget):
-    def __init__(self, model_manager, db):
+    def __init__(self, model_manager, db, pool=None):
         super().__init__()
         self.model_manager = model_manager
         self.db = db
+        self.pool = pool
         self.setup_ui()
 
     def setup_ui(self):
@@ -25,6 +30,12 @@ class AulasTab(QWidget):
         btn_add.clicked.connect(self.add_aula)
         btn_del = QPushButton("Eliminar")
         btn_del.clicked.connect(self.delete_aula)
+        btn_importar = QPushButton("Importar")
+        btn_importar.clicked.connect(self.importar)
+        btn_reporte = QPushButton("Generar Reporte de Horario")
+        btn_reporte.clicked.connect(self.generar_reporte)
+        btn_exportar = QPushButton("Exportar Todos")
+        btn_exportar.clicked.connect(self.exportar_todos)
 
         form.addWidget(QLabel("Nombre:"))
         form.addWidget(self.aula_nombre)
@@ -32,6 +43,9 @@ class AulasTab(QWidget):
         form.addWidget(self.aula_capacidad)
         form.addWidget(btn_add)
         form.addWidget(btn_del)
+        form.addWidget(btn_importar)
+        form.addWidget(btn_reporte)
+        form.addWidget(btn_exportar)
 
         # Tabla
         self.table = QTableView()
@@ -64,7 +78,6 @@ class AulasTab(QWidget):
         else:
             self.aula_nombre.clear()
             self.aula_capacidad.setValue(1)
-            self.model_manager.refresh_model("Aulas")
 
     def delete_aula(self):
         """Elimina el aula seleccionada"""
@@ -74,13 +87,27 @@ class AulasTab(QWidget):
             return
 
         if confirm_action(self, "¿Está seguro de eliminar este aula?"):
-            model = self.model_manager.get_model("Aulas")
-            for index in indexes:
-                if index.column() == 0:  # Solo eliminar una vez por fila
-                    model.removeRow(index.row())
-            
-            if not model.submitAll():
-                show_error(self, "Error al eliminar aula")
-                model.revertAll()
-            else:
-                self.model_manager.refresh_model("Aulas") 
\ No newline at end of file
+            # Una sola transacción para todas las filas; los modelos se actualizan con el bus
+            eliminar_seleccionados(self, self.model_manager, self.table, "Aulas",
+                                   "las aulas seleccionadas")
+
+    def generar_reporte(self):
+        """Genera en segundo plano el calendario semanal del aula seleccionada"""
+        indexes = self.table.selectedIndexes()
+        if not indexes:
+            show_error(self, "Por favor seleccione un aula")
+            return
+
+        model = self.table.model()
+        row = indexes[0].row()
+        generar_calendario(self, self.pool, "aula", model.data(model.index(row, 0)),
+                           model.data(model.index(row, 1)))
+
+    def exportar_todos(self):
+        """Exporta en segundo plano el calendario de todas las aulas"""
+        exportar_todos(self, self.pool, "aula")
+
+    def importar(self):
+        """Importa aulas desde un archivo CSV o XLSX"""
+        if importar_desde_archivo(self, self.db, "aulas"):
+            self.model_manager.bus.publicar("Aulas", RECARGAR)
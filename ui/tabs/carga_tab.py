@@ -0,0 +1,218 @@
+import os
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QTableView, QMessageBox, QComboBox,
+                             QSpinBox, QDoubleSpinBox)
+from PyQt5.QtCore import Qt
+from PyQt5.QtSql import QSqlRelationalTableModel, QSqlRelation
+from models.change_bus import INSERTAR, RECARGAR, CATALOGOS
+from database.connection_pool import pool_de
+from ui.combos import mostrar_catalogo
+from utils.dialog_utils import show_error, confirm_action
+from ui.import_dialog import importar_desde_archivo
+from ui.generation_runner import generar_en_segundo_plano
+
+class CargaTab(QWidget):
+    def __init__(self, model_manager, db):
+        super().__init__()
+        self.model_manager = model_manager
+        self.db = db
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura la interfaz de la pestaña de carga académica"""
+        layout = QVBoxLayout()
+
+        # Formulario
+        form = QHBoxLayout()
+        self.carga_seccion = QComboBox()
+        self.carga_asig = QComboBox()
+        self.carga_prof = QComboBox()
+        self.carga_horas = QSpinBox()
+        self.carga_horas.setMinimum(1)
+        self.carga_horas.setMaximum(40)
+        btn_add = QPushButton("Agregar")
+        btn_add.clicked.connect(self.add_carga)
+        btn_del = QPushButton("Eliminar")
+        btn_del.clicked.connect(self.delete_carga)
+        btn_importar = QPushButton("Importar")
+        btn_importar.clicked.connect(self.importar)
+
+        form.addWidget(QLabel("Sección:"))
+        form.addWidget(self.carga_seccion)
+        form.addWidget(QLabel("Asignatura:"))
+        form.addWidget(self.carga_asig)
+        form.addWidget(QLabel("Profesor:"))
+        form.addWidget(self.carga_prof)
+        form.addWidget(QLabel("Horas semanales:"))
+        form.addWidget(self.carga_horas)
+        form.addWidget(btn_add)
+        form.addWidget(btn_del)
+        form.addWidget(btn_importar)
+
+        # Opciones del generador automático
+        generador = QHBoxLayout()
+        self.tiempo_limite = QDoubleSpinBox()
+        self.tiempo_limite.setMinimum(1)
+        self.tiempo_limite.setMaximum(600)
+        self.tiempo_limite.setValue(10)
+        self.tiempo_limite.setSuffix(" s")
+        self.trabajadores = QSpinBox()
+        self.trabajadores.setMinimum(1)
+        self.trabajadores.setMaximum(os.cpu_count() or 1)
+        self.trabajadores.setValue(os.cpu_count() or 1)
+        self.semilla = QSpinBox()
+        self.semilla.setMinimum(0)
+        self.semilla.setMaximum(999999)
+        self.btn_generar = QPushButton("Generar Horario Automático")
+        self.btn_generar.clicked.connect(self.generar_horario)
+
+        generador.addWidget(QLabel("Tiempo límite:"))
+        generador.addWidget(self.tiempo_limite)
+        generador.addWidget(QLabel("Procesos:"))
+        generador.addWidget(self.trabajadores)
+        generador.addWidget(QLabel("Semilla:"))
+        generador.addWidget(self.semilla)
+        generador.addWidget(self.btn_generar)
+        generador.addStretch()
+
+        # Configurar modelo relacional
+        self.carga_model = QSqlRelationalTableModel(db=self.db)
+        self.carga_model.setTable("CargaAcademica")
+        self.carga_model.setRelation(
+            self.carga_model.fieldIndex("id_grupo"),
+            QSqlRelation("Grupos", "id_grupo", "nombre")
+        )
+        self.carga_model.setRelation(
+            self.carga_model.fieldIndex("id_asignatura"),
+            QSqlRelation("Asignaturas", "id_asignatura", "nombre")
+        )
+        self.carga_model.setRelation(
+            self.carga_model.fieldIndex("id_profesor"),
+            QSqlRelation("Profesores", "id_profesor", "nombre || ' ' || apellido AS nombre_completo")
+        )
+        self.carga_model.select()
+
+        self.carga_model.setHeaderData(1, Qt.Horizontal, "Sección")
+        self.carga_model.setHeaderData(2, Qt.Horizontal, "Asignatura")
+        self.carga_model.setHeaderData(3, Qt.Horizontal, "Profesor")
+        self.carga_model.setHeaderData(4, Qt.Horizontal, "Horas Semanales")
+
+        # Tabla
+        self.table = QTableView()
+        self.table.setModel(self.carga_model)
+        self.table.setEditTriggers(QTableView.DoubleClicked | QTableView.EditKeyPressed)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+
+        # Cargar datos en los combos y mantenerlos al día con los cambios de los catálogos
+        self.load_combos()
+        self.model_manager.bus.cambio.connect(self.catalogo_cambiado)
+
+        layout.addLayout(form)
+        layout.addLayout(generador)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def combos(self):
+        """Retorna {tabla de catálogo: combo que la muestra}"""
+        return {
+            "Grupos": self.carga_seccion,
+            "Asignaturas": self.carga_asig,
+            "Profesores": self.carga_prof,
+        }
+
+    def load_combos(self):
+        """Muestra en los comboboxes los catálogos compartidos, que se mantienen al día solos"""
+        for tabla, combo in self.combos().items():
+            mostrar_catalogo(combo, self.model_manager.referencias, tabla)
+
+    def catalogo_cambiado(self, tabla, operacion, ids, origen):
+        """Si cambiaron nombres de un catálogo, recarga la tabla; los combos ya están al día"""
+        if tabla not in CATALOGOS or tabla not in self.combos():
+            return
+        if operacion != INSERTAR:
+            self.carga_model.select()
+
+    def add_carga(self):
+        """Agrega una nueva carga académica"""
+        if self.carga_seccion.currentIndex() < 0:
+            show_error(self, "Seleccione una sección")
+            return
+        if self.carga_asig.currentIndex() < 0:
+            show_error(self, "Seleccione una asignatura")
+            return
+        if self.carga_prof.currentIndex() < 0:
+            show_error(self, "Seleccione un profesor")
+            return
+
+        row = self.carga_model.rowCount()
+        self.carga_model.insertRow(row)
+        self.carga_model.setData(self.carga_model.index(row, 1), self.carga_seccion.currentData())
+        self.carga_model.setData(self.carga_model.index(row, 2), self.carga_asig.currentData())
+        self.carga_model.setData(self.carga_model.index(row, 3), self.carga_prof.currentData())
+        self.carga_model.setData(self.carga_model.index(row, 4), self.carga_horas.value())
+
+        # Al guardar, el modelo vuelve a leer sólo la fila agregada
+        if not self._guardar():
+            show_error(self, "Error al agregar carga académica (¿la asignatura ya está cargada para la sección?)")
+            self.carga_model.revertAll()
+
+    def _guardar(self):
+        with pool_de(self.db).escritura():
+            return self.carga_model.submitAll()
+
+    def delete_carga(self):
+        """Elimina la carga académica seleccionada"""
+        indexes = self.table.selectedIndexes()
+        if not indexes:
+            show_error(self, "Por favor seleccione una carga académica")
+            return
+
+        if confirm_action(self, "¿Está seguro de eliminar esta carga académica?"):
+            for index in indexes:
+                if index.column() == 0:  # Solo eliminar una vez por fila
+                    self.carga_model.removeRow(index.row())
+
+            if not self._guardar():
+                show_error(self, "Error al eliminar carga académica")
+                self.carga_model.revertAll()
+            else:
+                self.carga_model.select()
+
+    def generar_horario(self):
+        """Genera en segundo plano los horarios pendientes de la carga académica"""
+        from scheduler.repository import cargar_problema
+
+        problema = cargar_problema(self.db)
+        if not problema.requisitos:
+            show_error(self, "No hay horas pendientes por asignar en la carga académica")
+            return
+
+        opciones = {"trabajadores": self.trabajadores.value(), "semilla": self.semilla.value(),
+                    "tiempo_limite": self.tiempo_limite.value()}
+        self.btn_generar.setEnabled(False)
+        job = generar_en_segundo_plano(self, problema, opciones, self.guardar_generados)
+        for senal in (job.signals.terminado, job.signals.error, job.signals.cancelado):
+            senal.connect(lambda *_: self.btn_generar.setEnabled(True))
+
+    def guardar_generados(self, solucion):
+        """Muestra el resultado de la generación y guarda los horarios si el usuario lo confirma"""
+        from scheduler.repository import guardar_solucion
+
+        mensaje = (f"Se asignaron {len(solucion.asignaciones)} horas en {solucion.segundos:.1f} s.")
+        if not solucion.completa:
+            mensaje += f"\nQuedaron {sum(solucion.sin_asignar.values())} horas sin asignar."
+        if not confirm_action(self, f"{mensaje}\n¿Desea guardar los horarios generados?"):
+            return
+
+        ok, error = guardar_solucion(self.db, solucion)
+        if not ok:
+            show_error(self, f"Error al guardar los horarios: {error}")
+            return
+
+        self.model_manager.bus.publicar("Horarios", RECARGAR)
+        QMessageBox.information(self, "Éxito", "Horarios generados correctamente")
+
+    def importar(self):
+        """Importa la carga académica desde un archivo CSV o XLSX"""
+        if importar_desde_archivo(self, self.db, "carga"):
+            self.carga_model.select()
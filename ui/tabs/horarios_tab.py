@@ -1,17 +1,39 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QTableView, QMessageBox, QComboBox,
-                             QTimeEdit, QFileDialog)
+                             QPushButton, QTableView, QComboBox,
+                             QTimeEdit, QFileDialog, QHeaderView, QListWidget, QListWidgetItem,
+                             QShortcut)
 from PyQt5.QtCore import Qt, QTime
-from PyQt5.QtSql import QSqlRelationalTableModel, QSqlRelation, QSqlQuery
+from PyQt5.QtGui import QKeySequence
+from models.change_bus import RECARGAR, CATALOGOS
+from models.conflict_engine import ConflictEngine, Propuesta, describir
+from models.conflict_index import ConflictIndex
+from models.free_slots import FreeSlotFinder
+from models.horario_model import HorarioModel, FILAS_POR_PAGINA
+from models.journal import ErrorDiario
+from ui.combos import mostrar_catalogo
 from utils.dialog_utils import show_error, confirm_action
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, landscape
+from ui.report_runner import ejecutar_reporte
+from ui.import_dialog import importar_desde_archivo
+from utils.time_utils import minutos_a_texto
+
+# Catálogo de cada combo de filtro y la columna de Horarios que filtra
+CATALOGOS_FILTRO = {
+    "Profesores": "id_profesor",
+    "Grupos": "id_grupo",
+    "Aulas": "id_aula",
+    "DiasSemana": "id_dia",
+}
+
+def _minutos(editor):
+    """Hora de un QTimeEdit en minutos desde la medianoche"""
+    return editor.time().hour() * 60 + editor.time().minute()
 
 class HorariosTab(QWidget):
-    def __init__(self, model_manager, db):
+    def __init__(self, model_manager, db, pool=None):
         super().__init__()
         self.model_manager = model_manager
         self.db = db
+        self.pool = pool
         self.setup_ui()
 
     def setup_ui(self):
@@ -36,6 +58,11 @@ class HorariosTab(QWidget):
         self.hora_fin.setDisplayFormat("hh:mm AP")  # Formato 12 horas con AM/PM
         self.hora_fin.setTime(QTime(9, 0))
         
+        # Horarios libres del profesor, la sección y el aula elegidos; un clic los usa
+        self.sugerencias = QListWidget()
+        self.sugerencias.setMaximumHeight(110)
+        self.sugerencias.itemClicked.connect(self.usar_sugerencia)
+        
         # Botones
         btn_add = QPushButton("Agregar Horario")
         btn_add.clicked.connect(self.add_horario)
@@ -43,6 +70,20 @@ class HorariosTab(QWidget):
         btn_del.clicked.connect(self.delete_horario)
         btn_reporte = QPushButton("Generar Reporte Completo")
         btn_reporte.clicked.connect(self.generar_reporte_completo)
+        btn_importar = QPushButton("Importar Horarios")
+        btn_importar.clicked.connect(self.importar)
+        btn_auditar = QPushButton("Buscar Conflictos")
+        btn_auditar.clicked.connect(self.auditar)
+        self.btn_deshacer = QPushButton("Deshacer")
+        self.btn_deshacer.clicked.connect(self.deshacer)
+        self.btn_rehacer = QPushButton("Rehacer")
+        self.btn_rehacer.clicked.connect(self.rehacer)
+        btn_puntos = QPushButton("Puntos de Control...")
+        btn_puntos.clicked.connect(self.puntos_de_control)
+        btn_versiones = QPushButton("Versiones...")
+        btn_versiones.clicked.connect(self.mostrar_versiones)
+        for secuencia, slot in ((QKeySequence.Undo, self.deshacer), (QKeySequence.Redo, self.rehacer)):
+            QShortcut(secuencia, self, slot, context=Qt.WidgetWithChildrenShortcut)
         
         # Agregar widgets al formulario
         form.addWidget(QLabel("Profesor:"))
@@ -59,97 +100,153 @@ class HorariosTab(QWidget):
         form.addWidget(self.hora_inicio)
         form.addWidget(QLabel("Hora Fin:"))
         form.addWidget(self.hora_fin)
+        form.addWidget(QLabel("Horarios libres con esa duración:"))
+        form.addWidget(self.sugerencias)
         form.addWidget(btn_add)
         form.addWidget(btn_del)
         form.addWidget(btn_reporte)
+        form.addWidget(btn_importar)
+        form.addWidget(btn_auditar)
+        form.addWidget(self.btn_deshacer)
+        form.addWidget(self.btn_rehacer)
+        form.addWidget(btn_puntos)
+        form.addWidget(btn_versiones)
         
-        # Configurar modelo relacional
-        self.horario_model = QSqlRelationalTableModel(db=self.db)
-        self.horario_model.setTable("Horarios")
+        # Índice de conflictos, se construye una sola vez y lo mantiene el modelo
+        self.conflict_index = ConflictIndex()
+        self.conflict_index.cargar(self.db)
+        self.conflict_engine = ConflictEngine(self.conflict_index)
+        self.conflict_engine.cargar_capacidades(self.db)
+        self.free_slots = FreeSlotFinder(self.conflict_index)
         
-        # Establecer relaciones
-        self.horario_model.setRelation(
-            self.horario_model.fieldIndex("id_profesor"),
-            QSqlRelation("Profesores", "id_profesor", "nombre || ' ' || apellido AS nombre_completo")
-        )
-        self.horario_model.setRelation(
-            self.horario_model.fieldIndex("id_asignatura"),
-            QSqlRelation("Asignaturas", "id_asignatura", "nombre")
-        )
-        self.horario_model.setRelation(
-            self.horario_model.fieldIndex("id_grupo"),
-            QSqlRelation("Grupos", "id_grupo", "nombre")
-        )
-        self.horario_model.setRelation(
-            self.horario_model.fieldIndex("id_aula"),
-            QSqlRelation("Aulas", "id_aula", "nombre")
-        )
-        self.horario_model.setRelation(
-            self.horario_model.fieldIndex("id_dia"),
-            QSqlRelation("DiasSemana", "id_dia", "nombre")
-        )
-        
-        self.horario_model.select()
+        # Modelo virtual de la tabla: lee por páginas y aplica los cambios publicados en el bus
+        self.horario_model = HorarioModel(self.db, self.conflict_index, self.model_manager.bus,
+                                          self.model_manager.referencias, self.model_manager.diario)
         
-        # Configurar encabezados
-        self.horario_model.setHeaderData(1, Qt.Horizontal, "Profesor")
-        self.horario_model.setHeaderData(2, Qt.Horizontal, "Asignatura")
-        self.horario_model.setHeaderData(3, Qt.Horizontal, "Sección")
-        self.horario_model.setHeaderData(4, Qt.Horizontal, "Aula")
-        self.horario_model.setHeaderData(5, Qt.Horizontal, "Día")
-        self.horario_model.setHeaderData(6, Qt.Horizontal, "Hora Inicio")
-        self.horario_model.setHeaderData(7, Qt.Horizontal, "Hora Fin")
+        # Filtros de la tabla, se resuelven en la consulta
+        filtros = QHBoxLayout()
+        self.filtro_prof = QComboBox()
+        self.filtro_seccion = QComboBox()
+        self.filtro_aula = QComboBox()
+        self.filtro_dia = QComboBox()
+        filtros.addWidget(QLabel("Filtrar por profesor:"))
+        filtros.addWidget(self.filtro_prof)
+        filtros.addWidget(QLabel("Sección:"))
+        filtros.addWidget(self.filtro_seccion)
+        filtros.addWidget(QLabel("Aula:"))
+        filtros.addWidget(self.filtro_aula)
+        filtros.addWidget(QLabel("Día:"))
+        filtros.addWidget(self.filtro_dia)
+        filtros.addStretch()
         
-        # Tabla
+        # Tabla; al activar el orden la vista pide al modelo la primera consulta
         self.table = QTableView()
         self.table.setModel(self.horario_model)
         self.table.setEditTriggers(QTableView.DoubleClicked | QTableView.EditKeyPressed)
         self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        # Ajustar las columnas midiendo sólo la primera página, no todas las filas
+        self.table.horizontalHeader().setResizeContentsPrecision(FILAS_POR_PAGINA)
         self.table.resizeColumnsToContents()
         
-        # Cargar datos en los combos
+        # Cargar datos en los combos y mantenerlos al día con los cambios de los catálogos
         self.load_combos()
+        self.model_manager.bus.cambio.connect(self.catalogo_cambiado)
+        for combo in self.filtros().values():
+            combo.currentIndexChanged.connect(self.filtrar)
+        for combo in (self.hor_prof, self.hor_seccion, self.hor_aula):
+            combo.currentIndexChanged.connect(self.actualizar_sugerencias)
+        self.hora_inicio.timeChanged.connect(self.actualizar_sugerencias)
+        self.hora_fin.timeChanged.connect(self.actualizar_sugerencias)
+        self.actualizar_sugerencias()
+        self.actualizar_deshacer()
         
         # Agregar widgets al layout principal
         layout.addLayout(form)
+        layout.addLayout(filtros)
         layout.addWidget(self.table)
         self.setLayout(layout)
 
+    def combos(self):
+        """Retorna {tabla de catálogo: combo que la muestra}"""
+        return {
+            "Profesores": self.hor_prof,
+            "Asignaturas": self.hor_asig,
+            "Grupos": self.hor_seccion,
+            "Aulas": self.hor_aula,
+            "DiasSemana": self.hor_dia,
+        }
+
+    def filtros(self):
+        """Retorna {columna de Horarios: combo que la filtra}"""
+        return {
+            "id_profesor": self.filtro_prof,
+            "id_grupo": self.filtro_seccion,
+            "id_aula": self.filtro_aula,
+            "id_dia": self.filtro_dia,
+        }
+
     def load_combos(self):
-        """Carga los datos en los comboboxes"""
-        # Limpiar combos
-        self.hor_prof.clear()
-        self.hor_asig.clear()
-        self.hor_seccion.clear()
-        self.hor_aula.clear()
-        self.hor_dia.clear()
-        
-        # Cargar profesores
-        query = QSqlQuery(self.db)
-        if query.exec_("SELECT id_profesor, nombre, apellido FROM Profesores ORDER BY apellido, nombre"):
-            while query.next():
-                nombre_completo = f"{query.value(1)} {query.value(2)}"
-                self.hor_prof.addItem(nombre_completo, query.value(0))
-        
-        # Cargar asignaturas
-        if query.exec_("SELECT id_asignatura, nombre FROM Asignaturas ORDER BY nombre"):
-            while query.next():
-                self.hor_asig.addItem(query.value(1), query.value(0))
-        
-        # Cargar secciones
-        if query.exec_("SELECT id_grupo, nombre FROM Grupos ORDER BY nombre"):
-            while query.next():
-                self.hor_seccion.addItem(query.value(1), query.value(0))
-        
-        # Cargar aulas
-        if query.exec_("SELECT id_aula, nombre FROM Aulas ORDER BY nombre"):
-            while query.next():
-                self.hor_aula.addItem(query.value(1), query.value(0))
-        
-        # Cargar días
-        if query.exec_("SELECT id_dia, nombre FROM DiasSemana ORDER BY id_dia"):
-            while query.next():
-                self.hor_dia.addItem(query.value(1), query.value(0))
+        """Muestra en los comboboxes los catálogos compartidos, que se mantienen al día solos"""
+        referencias = self.model_manager.referencias
+        for tabla, combo in self.combos().items():
+            mostrar_catalogo(combo, referencias, tabla)
+        # Si desaparece el elemento filtrado, el combo vuelve a "Todos" y avisa con currentIndexChanged
+        for tabla, columna in CATALOGOS_FILTRO.items():
+            mostrar_catalogo(self.filtros()[columna], referencias, tabla, todos="Todos")
+
+    def catalogo_cambiado(self, tabla, operacion, ids, origen):
+        """Actualiza lo que depende de los catálogos y de los horarios; los combos ya están al día"""
+        if tabla in ("Aulas", "Grupos"):
+            self.conflict_engine.cargar_capacidades(self.db)
+        # El modelo ya aplicó el cambio al índice de conflictos: se recalculan los horarios libres
+        if tabla in CATALOGOS or tabla == "Horarios":
+            self.actualizar_sugerencias()
+        if tabla == "Horarios":
+            self.actualizar_deshacer()
+
+    def duracion(self):
+        """Minutos entre la hora de inicio y la de fin del formulario"""
+        return _minutos(self.hora_fin) - _minutos(self.hora_inicio)
+
+    def actualizar_sugerencias(self):
+        """Muestra los intervalos libres del profesor, la sección y el aula en cada día"""
+        self.sugerencias.clear()
+        id_prof = self.hor_prof.currentData()
+        id_seccion = self.hor_seccion.currentData()
+        if id_prof is None or id_seccion is None or self.duracion() <= 0:
+            return
+
+        dias = [(self.hor_dia.itemData(i), self.hor_dia.itemText(i)) for i in range(self.hor_dia.count())]
+        libres = self.free_slots.buscar([id_dia for id_dia, _ in dias], self.duracion(),
+                                        id_prof, id_seccion, self.hor_aula.currentData())
+        for id_dia, nombre in dias:
+            for inicio, fin in libres[id_dia]:
+                item = QListWidgetItem(f"{nombre}: {minutos_a_texto(inicio)} - {minutos_a_texto(fin)}")
+                item.setData(Qt.UserRole, (id_dia, inicio))
+                self.sugerencias.addItem(item)
+        if not self.sugerencias.count():
+            self.sugerencias.addItem("No hay horarios libres con esa duración")
+
+    def usar_sugerencia(self, item):
+        """Pone en el formulario el día y el comienzo del intervalo libre elegido"""
+        sugerencia = item.data(Qt.UserRole)
+        if sugerencia is None:
+            return
+        id_dia, inicio = sugerencia
+        duracion = self.duracion()
+        self.hor_dia.setCurrentIndex(self.hor_dia.findData(id_dia))
+        for editor, minutos in ((self.hora_inicio, inicio), (self.hora_fin, inicio + duracion)):
+            editor.blockSignals(True)
+            editor.setTime(QTime(minutos // 60, minutos % 60))
+            editor.blockSignals(False)
+
+    def filtrar(self):
+        """Muestra sólo los horarios que cumplen los filtros elegidos"""
+        self.horario_model.filtrar({columna: combo.currentData()
+                                    for columna, combo in self.filtros().items()})
 
     def add_horario(self):
         """Agrega un nuevo horario"""
@@ -176,30 +273,19 @@ class HorariosTab(QWidget):
         id_seccion = self.hor_seccion.currentData()
         id_aula = self.hor_aula.currentData()
         id_dia = self.hor_dia.currentData()
-        hora_inicio = self.hora_inicio.time().toString("HH:mm")  # Guardamos en formato 24h
-        hora_fin = self.hora_fin.time().toString("HH:mm")  # Guardamos en formato 24h
+        hora_inicio = _minutos(self.hora_inicio)  # Guardamos en minutos
+        hora_fin = _minutos(self.hora_fin)
         
-        # Verificar solapamiento
-        if self.hay_solapamiento(id_prof, id_aula, id_dia, hora_inicio, hora_fin):
-            show_error(self, "Conflicto de horario (profesor o aula ocupada)")
+        # Verificar solapamientos y capacidad del aula
+        conflictos = self.buscar_conflictos(id_prof, id_aula, id_seccion, id_dia, hora_inicio, hora_fin)
+        if conflictos:
+            show_error(self, "Conflicto de horario:\n" + "\n".join(conflictos))
             return
         
-        # Insertar horario
-        row = self.horario_model.rowCount()
-        self.horario_model.insertRow(row)
-        self.horario_model.setData(self.horario_model.index(row, 1), id_prof)
-        self.horario_model.setData(self.horario_model.index(row, 2), id_asig)
-        self.horario_model.setData(self.horario_model.index(row, 3), id_seccion)
-        self.horario_model.setData(self.horario_model.index(row, 4), id_aula)
-        self.horario_model.setData(self.horario_model.index(row, 5), id_dia)
-        self.horario_model.setData(self.horario_model.index(row, 6), hora_inicio)
-        self.horario_model.setData(self.horario_model.index(row, 7), hora_fin)
-        
-        if not self.horario_model.submitAll():
+        # Insertar horario; el modelo agrega la fila al recibir el aviso del bus
+        if self.horario_model.agregar(id_prof, id_asig, id_seccion, id_aula, id_dia,
+                                      hora_inicio, hora_fin) is not None:
             show_error(self, "Error al agregar horario")
-            self.horario_model.revertAll()
-        else:
-            self.horario_model.select()
 
     def delete_horario(self):
         """Elimina el horario seleccionado"""
@@ -209,194 +295,75 @@ class HorariosTab(QWidget):
             return
         
         if confirm_action(self, "¿Está seguro de eliminar este horario?"):
-            for index in indexes:
-                if index.column() == 0:  # Solo eliminar una vez por fila
-                    self.horario_model.removeRow(index.row())
-            
-            if not self.horario_model.submitAll():
+            ids = sorted({self.horario_model.id_horario(index.row()) for index in indexes})
+            if self.horario_model.eliminar(ids) is not None:
                 show_error(self, "Error al eliminar horario")
-                self.horario_model.revertAll()
-            else:
-                self.horario_model.select()
 
-    def hay_solapamiento(self, id_profesor, id_aula, id_dia, hora_inicio, hora_fin):
-        """Verifica si hay solapamiento de horarios"""
-        query = QSqlQuery(self.db)
-        query.prepare("""
-            SELECT COUNT(*) FROM Horarios
-            WHERE id_dia = ? AND (
-                (hora_inicio < ? AND hora_fin > ?) OR
-                (hora_inicio < ? AND hora_fin > ?) OR
-                (hora_inicio >= ? AND hora_fin <= ?)
-            ) AND (id_profesor = ? OR id_aula = ?)
-        """)
-        
-        query.addBindValue(id_dia)
-        query.addBindValue(hora_inicio)
-        query.addBindValue(hora_inicio)
-        query.addBindValue(hora_fin)
-        query.addBindValue(hora_inicio)
-        query.addBindValue(hora_inicio)
-        query.addBindValue(hora_fin)
-        query.addBindValue(id_profesor)
-        query.addBindValue(id_aula)
-        
-        if not query.exec_():
-            show_error(self, f"Error al verificar solapamiento: {query.lastError().text()}")
-            return True
-        
-        if query.next():
-            return query.value(0) > 0
-        return True
+    def actualizar_deshacer(self):
+        """Habilita Deshacer y Rehacer según el diario, con la acción en el texto de ayuda"""
+        try:
+            acciones = (self.model_manager.diario.ultima(), self.model_manager.diario.siguiente())
+        except ErrorDiario:
+            acciones = (None, None)
+        for boton, accion in zip((self.btn_deshacer, self.btn_rehacer), acciones):
+            boton.setEnabled(accion is not None)
+            boton.setToolTip(accion[1] if accion else "")
+
+    def deshacer(self):
+        """Deshace el último cambio a los horarios; el modelo lo aplica al recibir el aviso del bus"""
+        error = self.model_manager.diario.deshacer(self.conflict_engine)
+        if error:
+            show_error(self, f"No se pudo deshacer: {error}")
+
+    def rehacer(self):
+        """Vuelve a aplicar el último cambio deshecho a los horarios"""
+        error = self.model_manager.diario.rehacer(self.conflict_engine)
+        if error:
+            show_error(self, f"No se pudo rehacer: {error}")
+
+    def puntos_de_control(self):
+        """Abre el diálogo para crear puntos de control y volver a ellos"""
+        from ui.checkpoints_dialog import CheckpointsDialog
+        CheckpointsDialog(self.model_manager.diario, self.conflict_engine, self).exec_()
+
+    def mostrar_versiones(self):
+        """Abre el diálogo de las versiones guardadas de los horarios"""
+        from ui.versions_dialog import VersionsDialog
+        VersionsDialog(self.model_manager.versiones, self.model_manager.referencias,
+                       self.conflict_engine, self).exec_()
+
+    def buscar_conflictos(self, id_profesor, id_aula, id_grupo, id_dia, hora_inicio, hora_fin):
+        """Retorna la descripción de cada conflicto del horario: profesor, aula o sección ocupados y capacidad"""
+        propuesta = Propuesta(None, id_profesor, id_aula, id_grupo, id_dia, hora_inicio, hora_fin)
+        descripciones = []
+        for conflicto in self.conflict_engine.verificar([propuesta]):
+            if describir(conflicto) not in descripciones:
+                descripciones.append(describir(conflicto))
+        return descripciones
 
     def generar_reporte_completo(self):
-        """Genera un reporte PDF con todos los horarios"""
-        try:
-            # Consulta SQL para obtener todos los horarios
-            query = QSqlQuery(self.db)
-            query.prepare("""
-                SELECT 
-                    p.nombre || ' ' || p.apellido AS profesor,
-                    a.nombre AS asignatura,
-                    g.nombre AS seccion,
-                    au.nombre AS aula,
-                    d.nombre AS dia,
-                    h.hora_inicio,
-                    h.hora_fin
-                FROM Horarios h
-                JOIN Profesores p ON h.id_profesor = p.id_profesor
-                JOIN Asignaturas a ON h.id_asignatura = a.id_asignatura
-                JOIN Grupos g ON h.id_grupo = g.id_grupo
-                JOIN Aulas au ON h.id_aula = au.id_aula
-                JOIN DiasSemana d ON h.id_dia = d.id_dia
-                ORDER BY p.apellido, p.nombre, d.id_dia, h.hora_inicio
-            """)
-            
-            if not query.exec_():
-                show_error(self, f"Error al ejecutar la consulta: {query.lastError().text()}")
-                return
-            
-            registros = []
-            while query.next():
-                # Convertir horas a formato 12h con AM/PM
-                hora_inicio = QTime.fromString(query.value(5), "HH:mm")
-                hora_fin = QTime.fromString(query.value(6), "HH:mm")
-                
-                registros.append({
-                    'profesor': query.value(0),
-                    'asignatura': query.value(1),
-                    'seccion': query.value(2),
-                    'aula': query.value(3),
-                    'dia': query.value(4),
-                    'hora_inicio': hora_inicio.toString("hh:mm AP"),
-                    'hora_fin': hora_fin.toString("hh:mm AP")
-                })
-            
-            if not registros:
-                show_error(self, "No hay horarios asignados")
-                return
-            
-            # Diálogo para guardar archivo
-            filename, _ = QFileDialog.getSaveFileName(
-                self,
-                "Guardar Reporte PDF",
-                "Reporte_Horarios.pdf",
-                "PDF Files (*.pdf)"
-            )
-            if not filename:
-                return
-            
-            # Generar PDF
-            c = canvas.Canvas(filename, pagesize=landscape(letter))
-            c.setTitle("Reporte de Horarios")
-            
-            # Configuración de página
-            margen_izq = 40
-            margen_der = 40
-            ancho_pag = landscape(letter)[0]
-            
-            # Encabezados y anchos de columna
-            encabezados = ["Profesor", "Asignatura", "Sección", "Aula", "Día", "Hora Inicio", "Hora Fin"]
-            anchos = {
-                'profesor': 140,    # Reducido para dar más espacio a las horas
-                'asignatura': 140,  # Reducido para dar más espacio a las horas
-                'seccion': 80,      # Reducido para dar más espacio a las horas
-                'aula': 80,         # Reducido para dar más espacio a las horas
-                'dia': 60,          # Reducido para dar más espacio a las horas
-                'hora_inicio': 100, # Aumentado para mostrar la hora completa
-                'hora_fin': 100     # Aumentado para mostrar la hora completa
-            }
-            
-            # Calcular posiciones
-            x_pos = [margen_izq]
-            for i in range(1, len(encabezados)):
-                x_pos.append(x_pos[i-1] + anchos[list(anchos.keys())[i-1]] + 10)  # Reducido el espacio entre columnas
-            
-            # Título
-            y = 550
-            c.setFont("Helvetica-Bold", 14)
-            c.drawString(margen_izq, y, "REPORTE DE HORARIOS")
-            y -= 30
-            
-            # Encabezados
-            c.setFont("Helvetica-Bold", 10)
-            for i, (x, enc) in enumerate(zip(x_pos, encabezados)):
-                if enc in ["Hora Inicio", "Hora Fin"]:
-                    # Centrar los encabezados de hora
-                    c.drawCentredString(x + anchos[list(anchos.keys())[i]]/2, y, enc)
-                else:
-                    c.drawString(x, y, enc)
-            y -= 20
-            
-            # Línea separadora
-            c.line(margen_izq, y, ancho_pag - margen_der, y)
-            y -= 20
-            
-            # Contenido
-            c.setFont("Helvetica", 9)
-            for reg in registros:
-                if y < 50:  # Nueva página
-                    c.showPage()
-                    y = 550
-                    c.setFont("Helvetica-Bold", 14)
-                    c.drawString(margen_izq, y, "REPORTE DE HORARIOS")
-                    y -= 30
-                    c.setFont("Helvetica-Bold", 10)
-                    for i, (x, enc) in enumerate(zip(x_pos, encabezados)):
-                        if enc in ["Hora Inicio", "Hora Fin"]:
-                            c.drawCentredString(x + anchos[list(anchos.keys())[i]]/2, y, enc)
-                        else:
-                            c.drawString(x, y, enc)
-                    y -= 20
-                    c.line(margen_izq, y, ancho_pag - margen_der, y)
-                    y -= 20
-                    c.setFont("Helvetica", 9)
-                
-                # Truncar textos largos solo para campos de texto
-                max_chars = {
-                    'profesor': 25,
-                    'asignatura': 25,
-                    'seccion': 15,
-                    'aula': 15,
-                    'dia': 12
-                }
-                
-                # Dibujar cada campo
-                for i, (key, val) in enumerate(reg.items()):
-                    if key in ['hora_inicio', 'hora_fin']:
-                        # Para las horas, centrar y no truncar
-                        c.drawCentredString(x_pos[i] + anchos[key]/2, y, str(val))
-                    else:
-                        # Para los demás campos, truncar si es necesario
-                        if len(str(val)) > max_chars[key]:
-                            val = str(val)[:max_chars[key]-3] + "..."
-                        c.drawString(x_pos[i], y, str(val))
-                
-                y -= 20
-            
-            c.save()
-            QMessageBox.information(self, "Éxito", f"Reporte guardado en: {filename}")
-            
-        except Exception as e:
-            show_error(self, f"Error al generar el reporte: {str(e)}")
-            print(f"Error detallado: {str(e)}")  # Para depuración 
\ No newline at end of file
+        """Genera en segundo plano un reporte PDF con todos los horarios"""
+        from reports.full_report import generar_reporte_completo
+
+        # Diálogo para guardar archivo
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Guardar Reporte PDF",
+            "Reporte_Horarios.pdf",
+            "PDF Files (*.pdf)"
+        )
+        if not filename:
+            return
+        
+        ejecutar_reporte(self, self.pool, generar_reporte_completo, filename,
+                         "Generando reporte de horarios...")
+
+    def importar(self):
+        """Importa horarios desde un archivo CSV o XLSX, rechazando los que se solapan"""
+        if importar_desde_archivo(self, self.db, "horarios"):
+            self.model_manager.bus.publicar("Horarios", RECARGAR)
+
+    def auditar(self):
+        """Busca en segundo plano los conflictos entre todos los horarios guardados"""
+        from ui.audit_dialog import auditar_horarios
+        auditar_horarios(self, self.pool)
@@ -1,12 +1,17 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QLineEdit, QPushButton, QTableView, QMessageBox)
 from PyQt5.QtCore import Qt
+from ui.report_runner import generar_calendario, exportar_todos
+from models.change_bus import RECARGAR
+from ui.import_dialog import importar_desde_archivo
+from ui.catalog_actions import eliminar_seleccionados
 
 class ProfesoresTab(QWidget):
-    def __init__(self, model_manager, db):
+    def __init__(self, model_manager, db, pool=None):
         super().__init__()
         self.model_manager = model_manager
         self.db = db
+        self.pool = pool
         self.setup_ui()
 
     def setup_ui(self):
@@ -21,6 +26,12 @@ class ProfesoresTab(QWidget):
         btn_add.clicked.connect(self.add_profesor)
         btn_del = QPushButton("Eliminar")
         btn_del.clicked.connect(self.delete_profesor)
+        btn_importar = QPushButton("Importar")
+        btn_importar.clicked.connect(self.importar)
+        btn_reporte = QPushButton("Generar Reporte de Horario")
+        btn_reporte.clicked.connect(self.generar_reporte)
+        btn_exportar = QPushButton("Exportar Todos")
+        btn_exportar.clicked.connect(self.exportar_todos)
 
         form.addWidget(QLabel("Nombre:"))
         form.addWidget(self.prof_nombre)
@@ -28,6 +39,9 @@ class ProfesoresTab(QWidget):
         form.addWidget(self.prof_apellido)
         form.addWidget(btn_add)
         form.addWidget(btn_del)
+        form.addWidget(btn_importar)
+        form.addWidget(btn_reporte)
+        form.addWidget(btn_exportar)
 
         # Tabla
         self.table = QTableView()
@@ -60,7 +74,6 @@ class ProfesoresTab(QWidget):
         else:
             self.prof_nombre.clear()
             self.prof_apellido.clear()
-            self.model_manager.refresh_model("Profesores")
 
     def delete_profesor(self):
         """Elimina el profesor seleccionado"""
@@ -70,13 +83,27 @@ class ProfesoresTab(QWidget):
             return
 
         if QMessageBox.question(self, "Confirmar", "¿Está seguro de eliminar este profesor?") == QMessageBox.Yes:
-            model = self.model_manager.get_model("Profesores")
-            for index in indexes:
-                if index.column() == 0:  # Solo eliminar una vez por fila
-                    model.removeRow(index.row())
-            
-            if not model.submitAll():
-                QMessageBox.critical(self, "Error", "Error al eliminar profesor")
-                model.revertAll()
-            else:
-                self.model_manager.refresh_model("Profesores") 
\ No newline at end of file
+            # Una sola transacción para todas las filas; los modelos se actualizan con el bus
+            eliminar_seleccionados(self, self.model_manager, self.table, "Profesores",
+                                   "los profesores seleccionados")
+
+    def generar_reporte(self):
+        """Genera en segundo plano el calendario semanal del profesor seleccionado"""
+        indexes = self.table.selectedIndexes()
+        if not indexes:
+            QMessageBox.warning(self, "Error", "Por favor seleccione un profesor")
+            return
+
+        model = self.table.model()
+        row = indexes[0].row()
+        generar_calendario(self, self.pool, "profesor", model.data(model.index(row, 0)),
+                           f"{model.data(model.index(row, 1))} {model.data(model.index(row, 2))}")
+
+    def exportar_todos(self):
+        """Exporta en segundo plano el calendario de todos los profesores"""
+        exportar_todos(self, self.pool, "profesor")
+
+    def importar(self):
+        """Importa profesores desde un archivo CSV o XLSX"""
+        if importar_desde_archivo(self, self.db, "profesores"):
+            self.model_manager.bus.publicar("Profesores", RECARGAR)
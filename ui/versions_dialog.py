@@ -0,0 +1,160 @@
+import time
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QInputDialog, QMessageBox)
+from models.versions import PERIODO, BORRADOR, CATALOGOS_FILA, ErrorVersion, describir_fila
+from utils.dialog_utils import show_error, confirm_action
+
+ACTUALES = "Horarios actuales"
+
+class VersionsDialog(QDialog):
+    """Versiones guardadas de los horarios: guardar, abrir, comparar y publicar"""
+
+    def __init__(self, versiones, referencias, motor, parent=None):
+        super().__init__(parent)
+        self.versiones = versiones
+        self.referencias = referencias
+        self.motor = motor      # ConflictEngine para verificar los horarios de la versión que se abre
+        self.lista = []
+        self.setWindowTitle("Versiones de los Horarios")
+        self.resize(700, 400)
+
+        layout = QVBoxLayout(self)
+        self.tabla = QTableWidget(0, 4)
+        self.tabla.setHorizontalHeaderLabels(["Nombre", "Tipo", "Guardada", "Clases"])
+        self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabla.setSelectionMode(QTableWidget.SingleSelection)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.tabla)
+
+        botones = QHBoxLayout()
+        for texto, slot in (("Guardar actuales...", self.guardar), ("Abrir", self.abrir),
+                            ("Comparar con...", self.comparar), ("Publicar", self.publicar),
+                            ("Eliminar", self.eliminar)):
+            boton = QPushButton(texto)
+            boton.clicked.connect(slot)
+            botones.addWidget(boton)
+        botones.addStretch()
+        cerrar_btn = QPushButton("Cerrar")
+        cerrar_btn.clicked.connect(self.close)
+        botones.addWidget(cerrar_btn)
+        layout.addLayout(botones)
+
+        self.actualizar()
+
+    def actualizar(self):
+        try:
+            self.lista = self.versiones.versiones()
+        except ErrorVersion as e:
+            show_error(self, f"Error al leer las versiones: {e}")
+            self.lista = []
+        self.tabla.setRowCount(len(self.lista))
+        for row, version in enumerate(self.lista):
+            nombre = f"{version.nombre} (abierta)" if version.abierta else version.nombre
+            guardada = time.strftime("%d/%m/%Y %H:%M", time.localtime(version.momento))
+            for col, valor in enumerate((nombre, version.tipo, guardada, str(version.clases))):
+                self.tabla.setItem(row, col, QTableWidgetItem(valor))
+
+    def _seleccionada(self):
+        row = self.tabla.currentRow()
+        if row < 0 or row >= len(self.lista):
+            show_error(self, "Por favor seleccione una versión")
+            return None
+        return self.lista[row]
+
+    def guardar(self):
+        nombre, ok = QInputDialog.getText(self, "Guardar Versión", "Nombre (p. ej. Período 2026-2):")
+        if not ok or not nombre.strip():
+            return
+        tipo, ok = QInputDialog.getItem(self, "Guardar Versión", "Tipo:", [BORRADOR, PERIODO], 0, False)
+        if not ok:
+            return
+        error = self.versiones.guardar(nombre.strip(), tipo)
+        if error:
+            show_error(self, f"Error al guardar la versión: {error}")
+        self.actualizar()
+
+    def abrir(self):
+        version = self._seleccionada()
+        if version is None or not confirm_action(
+                self, f"Los horarios actuales se reemplazarán por la versión {version.nombre}.\n"
+                      "Puede volver atrás con Deshacer. ¿Desea continuar?"):
+            return
+        error = self.versiones.abrir(version.id_version, self.motor)
+        if error:
+            show_error(self, f"No se pudo abrir la versión: {error}")
+            return
+        self.actualizar()
+        QMessageBox.information(self, "Éxito", f"Se abrió la versión {version.nombre}")
+
+    def comparar(self):
+        version = self._seleccionada()
+        if version is None:
+            return
+        otras = [ACTUALES] + [otra.nombre for otra in self.lista if otra.id_version != version.id_version]
+        nombre, ok = QInputDialog.getItem(self, "Comparar Versiones",
+                                          f"Cambios de {version.nombre} a:", otras, 0, False)
+        if not ok:
+            return
+        despues = next((otra.id_version for otra in self.lista if otra.nombre == nombre), None)
+        try:
+            diferencias = self.versiones.diferencias(version.id_version, despues)
+        except ErrorVersion as e:
+            show_error(self, f"Error al comparar las versiones: {e}")
+            return
+        nombres = {tabla: self.referencias.nombres(tabla) for tabla in CATALOGOS_FILA}
+        DiffDialog(f"Cambios de {version.nombre} a {nombre}", diferencias, nombres, self).exec_()
+
+    def publicar(self):
+        version = self._seleccionada()
+        if version is None or version.tipo == PERIODO:
+            return
+        error = self.versiones.publicar(version.id_version)
+        if error:
+            show_error(self, f"Error al publicar la versión: {error}")
+        self.actualizar()
+
+    def eliminar(self):
+        version = self._seleccionada()
+        if version is None or not confirm_action(self, f"¿Desea eliminar la versión {version.nombre}?"):
+            return
+        error = self.versiones.eliminar(version.id_version)
+        if error:
+            show_error(self, f"Error al eliminar la versión: {error}")
+        self.actualizar()
+
+class DiffDialog(QDialog):
+    """Lista las clases agregadas, eliminadas y movidas entre dos versiones, para revisarlas"""
+
+    def __init__(self, titulo, diferencias, nombres, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(titulo)
+        self.resize(1000, 500)
+
+        filas = ([("Agregada", "", describir_fila(fila, nombres)) for _, fila in diferencias.agregadas]
+                 + [("Eliminada", describir_fila(fila, nombres), "") for _, fila in diferencias.eliminadas]
+                 + [("Movida", describir_fila(antes, nombres), describir_fila(despues, nombres))
+                    for _, antes, despues in diferencias.movidas])
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{len(diferencias.agregadas)} agregadas, {len(diferencias.eliminadas)} "
+                                f"eliminadas, {len(diferencias.movidas)} movidas"))
+
+        tabla = QTableWidget(len(filas), 3)
+        tabla.setHorizontalHeaderLabels(["Cambio", "Antes", "Después"])
+        tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tabla.horizontalHeader().setStretchLastSection(True)
+        for row, fila in enumerate(filas):
+            for col, valor in enumerate(fila):
+                tabla.setItem(row, col, QTableWidgetItem(valor))
+        layout.addWidget(tabla)
+
+        botones = QHBoxLayout()
+        cerrar_btn = QPushButton("Cerrar")
+        cerrar_btn.clicked.connect(self.close)
+        botones.addStretch()
+        botones.addWidget(cerrar_btn)
+        layout.addLayout(botones)
@@ -0,0 +1,144 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from PyQt5.QtSql import QSqlQuery
+
+# Categorías de las mediciones
+CONSULTA = "consulta"   # QSqlQuery.exec_ y execBatch
+MODELO = "modelo"       # select() y recargas de los modelos de las tablas
+REPORTE = "reporte"     # Fases de los reportes PDF: consulta, maquetación y guardado
+
+CAPACIDAD = 5000        # Mediciones que se conservan; las más antiguas se descartan
+
+# Si se configura un archivo (ver registrar_en_archivo), cada medición se escribe como una línea JSON
+_registro = logging.getLogger("horarios.metricas")
+_registro.propagate = False
+
+def _compactar(texto):
+    return " ".join(str(texto).split())
+
+def percentil(ordenados, p):
+    """Retorna el percentil p (0-100) de una lista ordenada, por rango más cercano"""
+    if not ordenados:
+        return 0.0
+    posicion = max(0, min(len(ordenados) - 1, -(-len(ordenados) * p // 100) - 1))
+    return ordenados[int(posicion)]
+
+class Metricas:
+    """Registro circular de los tiempos de las operaciones críticas
+
+    Guarda las últimas CAPACIDAD mediciones como (momento, categoría,
+    nombre, segundos); registrar una medición sólo agrega una tupla a un
+    deque, así que puede quedar activo siempre. Los hilos de los reportes
+    también registran, por eso las lecturas se hacen bajo un candado.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD):
+        self.mediciones = deque(maxlen=capacidad)
+        self._candado = threading.Lock()
+
+    def agregar(self, categoria, nombre, segundos):
+        medicion = (time.time(), categoria, nombre, segundos)
+        with self._candado:
+            self.mediciones.append(medicion)
+        if _registro.handlers:
+            _registro.info(json.dumps(self._como_dict(medicion), ensure_ascii=False))
+
+    def _como_dict(self, medicion):
+        momento, categoria, nombre, segundos = medicion
+        return {"momento": momento, "categoria": categoria, "nombre": _compactar(nombre),
+                "ms": round(segundos * 1000, 3)}
+
+    def copia(self):
+        with self._candado:
+            return list(self.mediciones)
+
+    def limpiar(self):
+        with self._candado:
+            self.mediciones.clear()
+
+    def resumen(self):
+        """Retorna (categoría, nombre, cantidad, p50, p95, máximo) por operación, las más lentas primero"""
+        grupos = {}
+        for _, categoria, nombre, segundos in self.copia():
+            grupos.setdefault((categoria, _compactar(nombre)), []).append(segundos)
+        filas = []
+        for (categoria, nombre), tiempos in grupos.items():
+            tiempos.sort()
+            filas.append((categoria, nombre, len(tiempos), percentil(tiempos, 50),
+                          percentil(tiempos, 95), tiempos[-1]))
+        filas.sort(key=lambda fila: -fila[4])
+        return filas
+
+    def mas_lentas(self, cantidad=20, categoria=CONSULTA):
+        """Retorna las mediciones más lentas de la categoría como (momento, nombre, segundos)"""
+        mediciones = [(momento, _compactar(nombre), segundos)
+                      for momento, cat, nombre, segundos in self.copia() if cat == categoria]
+        mediciones.sort(key=lambda medicion: -medicion[2])
+        return mediciones[:cantidad]
+
+    def exportar(self, ruta):
+        """Escribe las mediciones en el archivo, una línea JSON por medición"""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for medicion in self.copia():
+                archivo.write(json.dumps(self._como_dict(medicion), ensure_ascii=False) + "\n")
+
+# Registro global de la aplicación
+metricas = Metricas()
+
+@contextmanager
+def medir(categoria, nombre):
+    """Mide el bloque y lo registra en las métricas, aunque termine con una excepción"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        metricas.agregar(categoria, nombre, time.perf_counter() - inicio)
+
+def medido(categoria, nombre=None):
+    """Decorador que mide cada llamada a la función; por defecto con su nombre calificado"""
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with medir(categoria, etiqueta):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+def instrumentar_consultas():
+    """Mide todas las llamadas a QSqlQuery.exec_ y execBatch, con el texto SQL como nombre
+
+    Reemplaza los métodos en la clase, como hace startup_timing con las
+    importaciones, para no tener que envolver cada consulta del código.
+    """
+    if getattr(QSqlQuery.exec_, "_medido", False):
+        return
+
+    def envolver(original):
+        @wraps(original)
+        def envoltura(self, *args):
+            inicio = time.perf_counter()
+            try:
+                return original(self, *args)
+            finally:
+                # Sin argumentos es una consulta preparada, su texto queda en lastQuery()
+                sql = args[0] if args and isinstance(args[0], str) else self.lastQuery()
+                metricas.agregar(CONSULTA, sql, time.perf_counter() - inicio)
+        envoltura._medido = True
+        return envoltura
+
+    QSqlQuery.exec_ = envolver(QSqlQuery.exec_)
+    QSqlQuery.execBatch = envolver(QSqlQuery.execBatch)
+
+def registrar_en_archivo(ruta):
+    """Escribe además cada medición en el archivo indicado, a medida que ocurren"""
+    manejador = logging.FileHandler(ruta, encoding="utf-8")
+    manejador.setFormatter(logging.Formatter("%(message)s"))
+    _registro.addHandler(manejador)
+    _registro.setLevel(logging.INFO)
@@ -0,0 +1,99 @@
+import builtins
+import importlib.util
+import sys
+import time
+
+class StartupTimer:
+    """Mide el arranque de la aplicación: cada importación y cada etapa
+
+    Reemplaza builtins.__import__ para registrar cuánto tarda cargar cada
+    módulo, con el mismo desglose que `python -X importtime` (tiempo propio
+    y acumulado en microsegundos), lo que también funciona dentro del
+    ejecutable de PyInstaller, donde no se pueden pasar opciones -X.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.importaciones = []   # (nivel, módulo, propio_us, acumulado_us) en orden de término
+        self.etapas = []          # (etapa, segundos desde el inicio)
+        self._pila = []           # Tiempo acumulado por los hijos de cada importación en curso
+        self._original = None
+
+    def activar(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._importar
+
+    def desactivar(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _nombre_absoluto(self, name, globals, level):
+        if not level:
+            return name
+        try:
+            return importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+        except (ImportError, ValueError):
+            return None
+
+    def _importar(self, name, globals=None, locals=None, fromlist=(), level=0):
+        nombre = self._nombre_absoluto(name, globals, level)
+        if nombre is None or nombre in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        nivel = len(self._pila)
+        self._pila.append(0.0)
+        t = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            acumulado = time.perf_counter() - t
+            hijos = self._pila.pop()
+            if self._pila:
+                self._pila[-1] += acumulado
+            self.importaciones.append((nivel, nombre, (acumulado - hijos) * 1e6, acumulado * 1e6))
+
+    def marcar(self, etapa):
+        """Registra el momento en que termina una etapa del arranque"""
+        self.etapas.append((etapa, time.perf_counter() - self.inicio))
+
+    def reporte(self, mas_lentas=15):
+        """Retorna el desglose como texto"""
+        lineas = ["import time: self [us] | cumulative | imported package"]
+        for nivel, nombre, propio, acumulado in self.importaciones:
+            lineas.append(f"import time: {propio:9.0f} | {acumulado:10.0f} | {'  ' * nivel}{nombre}")
+
+        lineas.append("")
+        lineas.append("Importaciones más lentas (acumulado):")
+        for nivel, nombre, propio, acumulado in sorted(self.importaciones, key=lambda i: -i[3])[:mas_lentas]:
+            lineas.append(f"  {acumulado / 1000:8.1f} ms  {nombre}")
+
+        lineas.append("")
+        lineas.append("Etapas del arranque:")
+        anterior = 0.0
+        for etapa, segundos in self.etapas:
+            lineas.append(f"  {segundos * 1000:8.1f} ms  (+{(segundos - anterior) * 1000:7.1f} ms)  {etapa}")
+            anterior = segundos
+        return "\n".join(lineas)
+
+# Medidor global; sólo existe cuando se pide con --tiempos-inicio
+medidor = None
+
+def iniciar():
+    """Activa la medición del arranque, debe llamarse antes de las demás importaciones"""
+    global medidor
+    medidor = StartupTimer()
+    medidor.activar()
+    return medidor
+
+def marcar(etapa):
+    if medidor is not None:
+        medidor.marcar(etapa)
+
+def terminar():
+    """Detiene la medición y escribe el reporte en stderr"""
+    if medidor is None:
+        return
+    medidor.marcar("ventana visible")
+    medidor.desactivar()
+    print(medidor.reporte(), file=sys.stderr)
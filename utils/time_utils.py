@@ -0,0 +1,14 @@
+def hora_a_minutos(hora):
+    """Convierte una hora en formato 'HH:mm' a minutos desde la medianoche"""
+    horas, minutos = str(hora).split(":")[:2]
+    return int(horas) * 60 + int(minutos)
+
+def minutos_a_hora(minutos):
+    """Convierte minutos desde la medianoche a una hora en formato 'HH:mm'"""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def minutos_a_texto(minutos):
+    """Convierte minutos desde la medianoche a una hora en formato 12h 'hh:mm AM/PM'"""
+    horas, minutos = divmod(minutos, 60)
+    sufijo = "AM" if horas < 12 else "PM"
+    return f"{(horas % 12) or 12:02d}:{minutos:02d} {sufijo}"